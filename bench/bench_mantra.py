@@ -0,0 +1,48 @@
+# bench/bench_mantra.py
+"""
+Benchmark: construye un mantra de 10 MB concatenando dentro de un ritual.
+
+Uso: python bench/bench_mantra.py [megabytes]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from nahual.interpreter import NahualInterpreter  # noqa: E402
+
+TAMANO_TROZO = 1024
+
+PROGRAMA = '''
+mantra trozo := "{trozo}";
+mantra texto := "";
+espiritu i := 0;
+ritual (i menor {repeticiones}) {{
+    texto := texto unir trozo;
+    i := i unir 1;
+}}
+'''
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repeticiones = megabytes * 1024 * 1024 // TAMANO_TROZO
+    codigo = PROGRAMA.format(trozo='x' * TAMANO_TROZO, repeticiones=repeticiones)
+
+    interprete = NahualInterpreter()
+    inicio = time.perf_counter()
+    interprete.run(codigo)
+    texto = interprete.entorno_global.obtener_variable('texto').valor
+    longitud = len(str(texto))
+    transcurrido = time.perf_counter() - inicio
+
+    esperado = repeticiones * TAMANO_TROZO
+    assert longitud == esperado, f"longitud {longitud} != {esperado}"
+    print(f"mantra de {longitud / 2 ** 20:.1f} MB en {transcurrido:.3f}s "
+          f"({repeticiones} concatenaciones, {repeticiones / transcurrido:,.0f} ops/s)")
+
+
+if __name__ == '__main__':
+    main()
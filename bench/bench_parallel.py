@@ -0,0 +1,69 @@
+# bench/bench_parallel.py
+"""
+Benchmark: escalamiento de mapear_paralelo con la cantidad de procesos.
+
+Aplica una sabiduría costosa a cada elemento de una ofrenda de espiritus con
+1, 2, 4... procesos (hasta os.cpu_count()) y muestra la aceleración respecto a
+un solo proceso. Con trabajo suficiente por elemento debe ser casi lineal.
+
+Uso: python bench/bench_parallel.py [elementos] [vueltas_por_elemento]
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from nahual.interpreter import NahualInterpreter  # noqa: E402
+
+PROGRAMA = '''
+sabiduria trabajo(espiritu x) {{
+    espiritu total := 0;
+    para i desde 0 hasta {vueltas} {{
+        total := total unir (x multiplicar i) residuo 7;
+    }}
+    retornar total;
+}}
+
+ofrenda xs := [];
+para i desde 0 hasta {elementos} {{
+    agregar(xs, i);
+}}
+ofrenda resultados := mapear_paralelo("trabajo", xs);
+'''
+
+
+def medir(codigo: str, procesos: int) -> float:
+    interprete = NahualInterpreter(procesos=procesos)
+    inicio = time.perf_counter()
+    interprete.run(codigo)
+    transcurrido = time.perf_counter() - inicio
+    resultados = interprete.entorno_global.obtener_variable('resultados').valor
+    assert resultados.longitud() > 0
+    return transcurrido
+
+
+def main():
+    elementos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    vueltas = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    codigo = PROGRAMA.format(elementos=elementos, vueltas=vueltas)
+    nucleos = os.cpu_count() or 1
+
+    cantidades = [1]
+    while cantidades[-1] * 2 <= nucleos:
+        cantidades.append(cantidades[-1] * 2)
+    if cantidades[-1] != nucleos:
+        cantidades.append(nucleos)
+
+    base = None
+    for procesos in cantidades:
+        transcurrido = medir(codigo, procesos)
+        base = base or transcurrido
+        print(f"{procesos:>3} procesos: {transcurrido:7.3f}s  "
+              f"aceleración {base / transcurrido:5.2f}x  (ideal {procesos}x)")
+
+
+if __name__ == '__main__':
+    main()
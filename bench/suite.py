@@ -0,0 +1,277 @@
+# bench/suite.py
+"""
+Suite de benchmarks de NahualScript con comparación contra una línea base.
+
+Mide cargas representativas (recursión, rituales anidados, ofrendas con
+agregar, mantras, llamadas a sabidurías y parseo de grimorios grandes) y, por
+cada una, las operaciones por segundo, el tiempo de reloj (el mejor de varias
+repeticiones, tras una de calentamiento), su ruido y la memoria pico
+medida con tracemalloc en una ejecución aparte, para no distorsionar los
+tiempos. El recolector de basura se desactiva mientras se cronometra y se
+ejecuta entre repeticiones, para que sus pausas no caigan al azar en una u
+otra.
+
+Los resultados se escriben como JSON junto con la implementación y versión de
+Python que los produjo, así que cualquier resultado puede usarse como base de
+otro: la línea base guardada, una rama anterior u otro motor (p. ej. PyPy).
+Si alguna carga pierde más que el umbral de operaciones por segundo respecto
+a la base, más el ruido de ambas mediciones, el proceso termina con código 1.
+Una base medida con otra escala no se compara: el proceso termina con
+código 2.
+
+Uso: python bench/suite.py [opciones]
+  --solo=<a,b>         Sólo esas cargas
+  --escala=<x>         Multiplica el tamaño de las cargas (por defecto 1)
+  --repeticiones=<n>   Repeticiones por carga; cuenta la más rápida (por defecto 15)
+  --salida=<arch>      Escribe los resultados como JSON
+  --base=<arch>        Resultados contra los que comparar (por defecto bench/linea_base.json)
+  --umbral=<x>         Pérdida de ops/s tolerada, p. ej. 0.15 = 15% (por defecto 0.15)
+  --guardar-base       Escribe los resultados en la línea base en vez de comparar
+
+La línea base depende de la máquina: regenérala con --guardar-base antes de
+comparar en otra.
+"""
+
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from nahual.generator import Forma, generar_programa  # noqa: E402
+from nahual.interpreter import NahualInterpreter  # noqa: E402
+from nahual.parser import NahualParser  # noqa: E402
+
+LINEA_BASE = Path(__file__).resolve().parent / 'linea_base.json'
+UMBRAL = 0.15
+
+
+class Sumidero:
+    """Descarta lo que el programa invoca."""
+
+    def write(self, texto: str) -> int:
+        return len(texto)
+
+    def flush(self) -> None:
+        pass
+
+
+# Parser compartido: construir las tablas no es parte de ninguna carga
+_parser = NahualParser()
+
+
+def _programa(codigo: str) -> Callable[[], None]:
+    def correr() -> None:
+        interprete = NahualInterpreter(salida=Sumidero(), parser=_parser)
+        interprete.run(codigo)
+        if interprete.manejador_errores.tiene_errores():
+            raise RuntimeError(f"La carga falló: {interprete.manejador_errores.errores[0]}")
+    return correr
+
+
+def fib(escala: float) -> Tuple[Callable[[], None], int]:
+    n = max(5, round(20 + 2 * (escala - 1)))
+    llamadas = [1, 1]
+    while len(llamadas) <= n:
+        llamadas.append(llamadas[-1] + llamadas[-2] + 1)
+    return _programa(f"""
+    sabiduria fib(espiritu n) {{
+        vision (n menor 2) {{
+            retornar n;
+        }}
+        retornar fib(n separar 1) unir fib(n separar 2);
+    }}
+    espiritu r := fib({n});
+    """), llamadas[n]
+
+
+def rituales_anidados(escala: float) -> Tuple[Callable[[], None], int]:
+    n = max(10, int(200 * escala ** 0.5))
+    return _programa(f"""
+    espiritu total := 0;
+    espiritu i := 0;
+    ritual (i menor {n}) {{
+        espiritu j := 0;
+        ritual (j menor {n}) {{
+            total := total unir j;
+            j := j unir 1;
+        }}
+        i := i unir 1;
+    }}
+    """), n * n
+
+
+def agregar_ofrenda(escala: float) -> Tuple[Callable[[], None], int]:
+    n = max(100, int(50000 * escala))
+    return _programa(f"""
+    ofrenda xs := [];
+    para i desde 0 hasta {n} {{
+        agregar(xs, i multiplicar 2);
+    }}
+    """), n
+
+
+def construir_mantra(escala: float) -> Tuple[Callable[[], None], int]:
+    n = max(100, int(50000 * escala))
+    return _programa(f"""
+    mantra texto := "";
+    para i desde 0 hasta {n} {{
+        texto := texto unir "ab";
+    }}
+    espiritu largo := longitud(texto);
+    """), n
+
+
+def llamadas(escala: float) -> Tuple[Callable[[], None], int]:
+    n = max(100, int(30000 * escala))
+    return _programa(f"""
+    sabiduria sumar(espiritu a, espiritu b) {{
+        retornar a unir b;
+    }}
+    sabiduria identidad(espiritu x) {{
+        retornar x;
+    }}
+    espiritu total := 0;
+    para i desde 0 hasta {n} {{
+        total := sumar(total, identidad(i));
+    }}
+    """), 2 * n
+
+
+def parseo(escala: float) -> Tuple[Callable[[], None], int]:
+    codigo = generar_programa(0, Forma().escalada(escala * 4))
+    lineas = codigo.count("\n")
+
+    def correr() -> None:
+        if _parser.parse(codigo) is None:
+            raise RuntimeError("No se pudo parsear el grimorio generado")
+    return correr, lineas
+
+
+CARGAS: Dict[str, Callable[[float], Tuple[Callable[[], None], int]]] = {
+    'fib': fib,
+    'rituales_anidados': rituales_anidados,
+    'agregar_ofrenda': agregar_ofrenda,
+    'construir_mantra': construir_mantra,
+    'llamadas': llamadas,
+    'parseo': parseo,
+}
+
+
+def cronometrar(correr: Callable[[], None]) -> float:
+    """Tiempo de una ejecución, sin el recolector de basura y tras vaciarlo."""
+    gc.collect()
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        correr()
+        return time.perf_counter() - inicio
+    finally:
+        if activo:
+            gc.enable()
+
+
+def medir(nombre: str, escala: float, repeticiones: int) -> Dict[str, Any]:
+    correr, operaciones = CARGAS[nombre](escala)
+    correr()  # Calentamiento, fuera de la medición
+    tiempos = [cronometrar(correr) for _ in range(repeticiones)]
+    tracemalloc.start()
+    try:
+        correr()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # El ruido sólo suma tiempo: la más rápida es la estimación más estable, y
+    # la distancia del primer cuartil a ella mide cuánto cuesta alcanzarla
+    tiempos.sort()
+    tiempo = tiempos[0]
+    ruido = tiempos[len(tiempos) // 4] / tiempo - 1
+    return {
+        'operaciones': operaciones,
+        'tiempo': round(tiempo, 6),
+        'ops_por_segundo': round(operaciones / tiempo, 1),
+        'ruido': round(ruido, 4),
+        'memoria_pico': pico,
+    }
+
+
+def comparar(resultados: Dict[str, Any], base: Dict[str, Any], umbral: float) -> Tuple[list, list]:
+    """
+    Retorna los renglones de la comparación y las cargas que perdieron más que
+    `umbral` más el ruido de la medición actual y el de la base.
+    """
+    renglones, regresiones = [], []
+    for nombre, actual in resultados['cargas'].items():
+        anterior = base['cargas'].get(nombre)
+        if anterior is None:
+            continue
+        cambio = actual['ops_por_segundo'] / anterior['ops_por_segundo'] - 1
+        memoria = actual['memoria_pico'] / max(anterior['memoria_pico'], 1) - 1
+        banda = umbral + actual.get('ruido', 0) + anterior.get('ruido', 0)
+        marca = '❌' if cambio < -banda else '✅'
+        renglones.append(f"{marca} {nombre:<18} {cambio:+7.1%} ops/s (±{banda:.1%})  {memoria:+7.1%} memoria")
+        if cambio < -banda:
+            regresiones.append(nombre)
+    return renglones, regresiones
+
+
+def opcion(nombre: str, defecto: Any = None) -> Any:
+    prefijo = f'--{nombre}='
+    return next((arg[len(prefijo):] for arg in sys.argv[1:] if arg.startswith(prefijo)), defecto)
+
+
+def main():
+    escala = float(opcion('escala', 1))
+    repeticiones = int(opcion('repeticiones', 15))
+    umbral = float(opcion('umbral', UMBRAL))
+    nombres = opcion('solo', ','.join(CARGAS)).split(',')
+    desconocidas = [nombre for nombre in nombres if nombre not in CARGAS]
+    if desconocidas:
+        print(f"Cargas desconocidas: {', '.join(desconocidas)} (hay {', '.join(CARGAS)})")
+        sys.exit(2)
+
+    resultados = {
+        'python': f"{platform.python_implementation()} {platform.python_version()}",
+        'plataforma': platform.platform(),
+        'escala': escala,
+        'cargas': {},
+    }
+    for nombre in nombres:
+        resultado = resultados['cargas'][nombre] = medir(nombre, escala, repeticiones)
+        print(f"{nombre:<18} {resultado['ops_por_segundo']:>14,.0f} ops/s  "
+              f"{resultado['tiempo']:8.3f}s ±{resultado['ruido']:5.1%}  "
+              f"{resultado['memoria_pico'] / 2 ** 20:8.2f} MB pico")
+
+    salida = opcion('salida')
+    if salida is not None:
+        Path(salida).write_text(json.dumps(resultados, indent=2) + "\n", encoding='utf-8')
+
+    if '--guardar-base' in sys.argv:
+        LINEA_BASE.write_text(json.dumps(resultados, indent=2) + "\n", encoding='utf-8')
+        print(f"Línea base guardada en {LINEA_BASE}")
+        return
+
+    ruta_base = Path(opcion('base', LINEA_BASE))
+    if not ruta_base.exists():
+        print(f"Sin línea base en {ruta_base}; guárdala con --guardar-base")
+        return
+    base = json.loads(ruta_base.read_text(encoding='utf-8'))
+    if base.get('escala') != escala:
+        print(f"❌ La base se midió con escala {base.get('escala')}, no {escala}; no se compara")
+        sys.exit(2)
+    print(f"\nContra {ruta_base} ({base.get('python')}), umbral {umbral:.0%}:")
+    renglones, regresiones = comparar(resultados, base, umbral)
+    print("\n".join(renglones))
+    if regresiones:
+        print(f"Regresiones: {', '.join(regresiones)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,9 +8,13 @@ setup(
     install_requires=[
         "ply>=3.11",
     ],
+    extras_require={
+        "numpy": ["numpy>=1.20"],
+    },
     entry_points={
         "console_scripts": [
             "nahual=nahual.__main__:main",
+            "nahual-cliente=nahual.client:main",
         ],
     },
     python_requires=">=3.8",
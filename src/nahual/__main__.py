@@ -6,18 +6,155 @@ def mensaje_ayuda():
     print('''🔮 NahualScript - Lenguaje de Programación Místico 🔮
 
 Uso: python -m nahual <archivo.nhl> [opciones]
+     python -m nahual --batch <directorio|patrón|manifiesto> [opciones]
+     python -m nahual --servidor [--socket=<ruta>]
 Opciones:
-  --debug    Muestra información detallada de la ejecución
-  --help     Muestra este mensaje de ayuda
+  --debug              Muestra información detallada de la ejecución
+  --solo-lectura       Prohíbe abrir pergaminos para escribir
+  --pergaminos=<dir>   Sólo permite acceder a archivos dentro de <dir>
+  --limites=<lista>    Límites de recursos, p. ej. instrucciones=1000000,tiempo=2.5
+                       (también profundidad, elementos_ofrenda, longitud_mantra)
+  --instantanea=<arch> Restaura el entorno global guardado antes de ejecutar; sólo
+                       reconstruye tipos del intérprete, pero úsala sólo con
+                       instantáneas de confianza
+  --guardar-instantanea=<arch>
+                       Guarda el entorno global al terminar el grimorio
+  --log-json=<arch>    Anexa el registro a <arch> como líneas JSON
+  --profile[=<arch>]   Perfila el grimorio: muestra el tiempo por sabiduría y por
+                       línea al terminar y lo guarda como JSON (perfil.json)
+  --muestreo[=<arch>]  Perfila por muestreo y guarda pilas colapsadas para
+                       flame graphs (perfil.folded)
+  --frecuencia=<hz>    Muestras por segundo de --muestreo (por defecto 1000)
+  --stats              Muestra contadores internos del intérprete al terminar
+  --debug-interactive  Depura el grimorio: se detiene en su primera declaración
+                       y acepta órdenes (paso, siguiente, romper, imprimir...)
+  --help               Muestra este mensaje de ayuda
+
+Opciones del modo por lotes:
+  --procesos=<n>       Procesos trabajadores (por defecto, uno por núcleo)
+  --salidas=<dir>      Guarda la salida de cada grimorio en <dir>
+  --resumen=<archivo>  Escribe el resumen del lote como JSON
+
+Modo servidor (los grimorios se envían con nahual-cliente):
+  --socket=<ruta>      Socket Unix donde escuchar, en un directorio sólo del
+                       usuario (por defecto $NAHUAL_SOCKET o
+                       nahual-<uid>/servidor.sock en $XDG_RUNTIME_DIR o /tmp)
     ''')
 
 
-def main():
+def opcion(nombre, defecto=None):
+    """Retorna el valor de una opción --nombre=valor de la línea de comandos."""
+    prefijo = f'--{nombre}='
+    return next((arg[len(prefijo):] for arg in sys.argv if arg.startswith(prefijo)), defecto)
+
+
+def leer_limites():
+    """Retorna los Limites de la opción --limites, o None si no se indicó."""
+    texto = opcion('limites')
+    if texto is None:
+        return None
+    from nahual.limits import Limites
+    try:
+        return Limites.desde_texto(texto)
+    except ValueError as e:
+        print(f'❌ Error: --limites inválido: {e}')
+        sys.exit(1)
+
+
+def reportar_perfil(perfilador):
+    """Muestra el perfil del grimorio en stderr y lo guarda como JSON."""
+    perfilador.desinstalar()
+    print(perfilador.informe(), file=sys.stderr)
+    destino = opcion('profile', 'perfil.json')
+    try:
+        perfilador.guardar(destino)
+    except OSError as e:
+        print(f'⚠️ No se pudo guardar el perfil en {destino}: {e}', file=sys.stderr)
+
+
+def reportar_muestreo(muestreador):
+    """Guarda las pilas colapsadas del muestreo."""
+    muestreador.desinstalar()
+    destino = opcion('muestreo', 'perfil.folded')
+    try:
+        muestreador.guardar(destino)
+        print(f'🔥 {muestreador.total} muestras en {destino} '
+              f'(flamegraph.pl {destino} > perfil.svg)', file=sys.stderr)
+    except OSError as e:
+        print(f'⚠️ No se pudo guardar el muestreo en {destino}: {e}', file=sys.stderr)
+
+
+def depurar(interprete, codigo):
+    """Ejecuta el grimorio con el depurador interactivo, detenido en su primera declaración."""
+    from nahual.debugger import ConsolaDepuracion, Depurador, DepuracionTerminada
+    depurador = Depurador(interprete, al_detenerse=ConsolaDepuracion())
+    depurador.cargar(codigo)
+    print("🐞 Depuración interactiva; escribe 'ayuda' para ver las órdenes")
+    try:
+        depurador.ejecutar(detenerse_al_inicio=True)
+    except DepuracionTerminada:
+        print('🛑 Ritual detenido desde el depurador')
+        sys.exit(1)
+
+
+def main_lote(objetivo, solo_lectura, directorio, limites=None):
+    """Ejecuta muchos grimorios en procesos trabajadores y resume el resultado."""
+    import time
+    from nahual.batch import recolectar_grimorios, ejecutar_lote, escribir_resumen
+    from nahual.error_handler import ErrorNahual
+
+    try:
+        rutas = recolectar_grimorios(objetivo)
+    except (ErrorNahual, OSError) as e:
+        print(f'❌ Error: {e}')
+        sys.exit(1)
+
+    procesos = opcion('procesos')
+    inicio = time.perf_counter()
+    resultados = []
+    for resultado in ejecutar_lote(rutas, int(procesos) if procesos else None,
+                                   {'solo_lectura': solo_lectura, 'directorio': directorio,
+                                    'limites': limites, 'instantanea': opcion('instantanea'),
+                                    'log_json': opcion('log-json')}):
+        marca = '✨' if resultado.estado == 0 else '💫'
+        print(f'{marca} {resultado.tiempo:8.3f}s  {resultado.ruta}')
+        resultados.append(resultado)
+    transcurrido = time.perf_counter() - inicio
+
+    resumen = escribir_resumen(resultados, transcurrido, opcion('resumen'), opcion('salidas'))
+    print(f"🌟 {resumen['total']} grimorios en {transcurrido:.3f}s, {resumen['fallidos']} con errores")
+    sys.exit(1 if resumen['fallidos'] else 0)
+
+
+def main(parser=None):
+    """
+    Args:
+        parser: NahualParser ya construido; el servidor pasa el suyo para no
+            reconstruir las tablas en cada grimorio
+    """
     if len(sys.argv) < 2 or '--help' in sys.argv:
         mensaje_ayuda()
         sys.exit(0)
 
     debug = '--debug' in sys.argv
+    solo_lectura = '--solo-lectura' in sys.argv
+    directorio = opcion('pergaminos')
+    limites = leer_limites()
+    if debug or opcion('log-json') is not None:
+        from nahual.logger import configurar_registro
+        configurar_registro(debug=debug, json_ruta=opcion('log-json'))
+
+    if '--servidor' in sys.argv:
+        from nahual.server import servir
+        return servir(opcion('socket'))
+
+    if '--batch' in sys.argv:
+        posicion = sys.argv.index('--batch') + 1
+        if posicion >= len(sys.argv):
+            mensaje_ayuda()
+            sys.exit(1)
+        return main_lote(sys.argv[posicion], solo_lectura, directorio, limites)
+
     archivo = sys.argv[1]
 
     try:
@@ -25,9 +162,37 @@ def main():
             codigo = f.read()
 
         from nahual.interpreter import NahualInterpreter
+        from nahual.files import GestorPergaminos
         print('🌟 Iniciando ritual de compilación...')
-        interprete = NahualInterpreter(debug=debug)
-        resultado = interprete.run(codigo)
+        pergaminos = GestorPergaminos(solo_lectura=solo_lectura, directorio_permitido=directorio)
+        interprete = NahualInterpreter(debug=debug, pergaminos=pergaminos, parser=parser,
+                                       limites=limites, estadisticas='--stats' in sys.argv)
+        instantanea = opcion('instantanea')
+        if instantanea is not None:
+            interprete.restaurar_instantanea(instantanea)
+        perfilador = muestreador = None
+        if '--profile' in sys.argv or opcion('profile') is not None:
+            from nahual.profiler import Perfilador
+            perfilador = Perfilador().instalar(interprete)
+        if '--muestreo' in sys.argv or opcion('muestreo') is not None:
+            from nahual.profiler import Muestreador
+            muestreador = Muestreador(float(opcion('frecuencia', Muestreador.FRECUENCIA)))
+            muestreador.instalar(interprete)
+        try:
+            if '--debug-interactive' in sys.argv:
+                resultado = depurar(interprete, codigo)
+            else:
+                resultado = interprete.run(codigo)
+        finally:
+            if muestreador is not None:
+                reportar_muestreo(muestreador)
+            if perfilador is not None:
+                reportar_perfil(perfilador)
+            if interprete.estadisticas is not None:
+                print(interprete.estadisticas.informe(), file=sys.stderr)
+        destino = opcion('guardar-instantanea')
+        if destino is not None:
+            interprete.guardar_instantanea(destino)
         print('✨ Ritual completado exitosamente')
         return resultado
 
@@ -0,0 +1,151 @@
+# src/nahual/batch.py
+
+import contextlib
+import glob
+import io
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from .error_handler import ErrorEjecucion
+from .logger import NOMBRE, configurar_registro
+
+
+# Grimorios enviados juntos a un trabajador; amortiza la comunicación entre procesos
+GRIMORIOS_POR_ENVIO = 8
+
+EXTENSION_GRIMORIO = '.nhl'
+
+# Parser de cada proceso trabajador, construido una sola vez por el inicializador
+_parser_trabajador = None
+
+_registro = logging.getLogger(NOMBRE)
+
+
+@dataclass
+class ResultadoGrimorio:
+    """Resultado de ejecutar un grimorio en modo por lotes."""
+    ruta: str
+    estado: int  # 0 si terminó sin errores, 1 si reportó errores, 2 si no pudo ejecutarse
+    tiempo: float  # Segundos de reloj, incluyendo lectura y parseo
+    salida: str
+    errores: List[str]
+
+
+def recolectar_grimorios(objetivo: str) -> List[str]:
+    """
+    Retorna las rutas de los grimorios indicados por un directorio (se recorre
+    recursivamente buscando .nhl), un patrón glob o un manifiesto (archivo con
+    una ruta por línea, relativas al manifiesto; '#' inicia un comentario).
+    """
+    if os.path.isdir(objetivo):
+        return sorted(glob.glob(os.path.join(objetivo, '**', '*' + EXTENSION_GRIMORIO), recursive=True))
+    if os.path.isfile(objetivo) and not objetivo.endswith(EXTENSION_GRIMORIO):
+        base = os.path.dirname(objetivo)
+        with open(objetivo, 'r', encoding='utf-8') as manifiesto:
+            lineas = (linea.split('#', 1)[0].strip() for linea in manifiesto)
+            return [os.path.join(base, linea) for linea in lineas if linea]
+    rutas = sorted(glob.glob(objetivo, recursive=True))
+    if not rutas:
+        raise ErrorEjecucion(
+            f"No se encontraron grimorios en '{objetivo}'",
+            sugerencia="Indica un directorio, un patrón como 'rituales/*.nhl' o un manifiesto"
+        )
+    return rutas
+
+
+def _preparar_trabajador(log_json: Optional[str] = None) -> None:
+    """Inicializador de los procesos: construye el parser y sus tablas una sola vez."""
+    global _parser_trabajador
+    from .parser import NahualParser
+    if log_json is not None:
+        configurar_registro(json_ruta=log_json)
+    _parser_trabajador = NahualParser()
+
+
+def ejecutar_grimorio(ruta: str, opciones: Optional[Dict[str, Any]] = None,
+                      parser: Optional[Any] = None) -> ResultadoGrimorio:
+    """Ejecuta un grimorio con un intérprete nuevo, capturando su salida."""
+    from .interpreter import NahualInterpreter
+    from .files import GestorPergaminos
+    from .output import SalidaNahual
+
+    opciones = opciones or {}
+    captura = io.StringIO()
+    inicio = time.perf_counter()
+    try:
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            codigo = archivo.read()
+        interprete = NahualInterpreter(
+            salida=SalidaNahual(captura, por_lineas=True),
+            entrada=io.StringIO(''),
+            pergaminos=GestorPergaminos(opciones.get('solo_lectura', False),
+                                        opciones.get('directorio')),
+            procesos=1,
+            parser=parser if parser is not None else _parser_trabajador,
+            limites=opciones.get('limites'),
+        )
+        if opciones.get('instantanea') is not None:
+            interprete.restaurar_instantanea(opciones['instantanea'])
+        with contextlib.redirect_stdout(captura):
+            interprete.run(codigo)
+        errores = interprete.manejador_errores.obtener_errores()
+        estado = 1 if errores else 0
+    except Exception as e:
+        errores = [f"{type(e).__name__}: {e}"]
+        estado = 2
+    tiempo = time.perf_counter() - inicio
+    if _registro.isEnabledFor(logging.INFO):
+        _registro.info("Grimorio %s terminado con estado %d", ruta, estado,
+                       extra={'ruta': ruta, 'estado': estado, 'tiempo': tiempo, 'errores': errores})
+    return ResultadoGrimorio(ruta, estado, tiempo, captura.getvalue(), errores)
+
+
+def ejecutar_lote(rutas: List[str], procesos: Optional[int] = None,
+                  opciones: Optional[Dict[str, Any]] = None) -> Iterable[ResultadoGrimorio]:
+    """
+    Ejecuta los grimorios en un grupo de procesos de larga vida, cada uno con
+    su parser ya construido, y produce los resultados en el orden de `rutas`.
+    """
+    opciones = opciones or {}
+    procesos = procesos or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_preparar_trabajador,
+                             initargs=(opciones.get('log_json'),)) as grupo:
+        yield from grupo.map(ejecutar_grimorio, rutas, [opciones] * len(rutas),
+                             chunksize=GRIMORIOS_POR_ENVIO)
+
+
+def escribir_resumen(resultados: List[ResultadoGrimorio], tiempo_total: float,
+                     destino: Optional[str] = None, salidas: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Arma el resumen del lote y lo escribe como JSON en `destino`, si se indica.
+
+    Si se indica el directorio `salidas`, la salida de cada grimorio se guarda
+    en <salidas>/<n>_<nombre>.out y el resumen sólo incluye esa ruta.
+    """
+    grimorios = []
+    for numero, resultado in enumerate(resultados):
+        entrada = asdict(resultado)
+        if salidas is not None:
+            os.makedirs(salidas, exist_ok=True)
+            nombre = os.path.splitext(os.path.basename(resultado.ruta))[0]
+            archivo_salida = os.path.join(salidas, f"{numero:05d}_{nombre}.out")
+            with open(archivo_salida, 'w', encoding='utf-8') as archivo:
+                archivo.write(resultado.salida)
+            entrada['salida'] = archivo_salida
+        grimorios.append(entrada)
+
+    resumen = {
+        'total': len(resultados),
+        'fallidos': sum(1 for resultado in resultados if resultado.estado != 0),
+        'tiempo_total': tiempo_total,
+        'grimorios': grimorios,
+    }
+    if destino is not None:
+        with open(destino, 'w', encoding='utf-8') as archivo:
+            json.dump(resumen, archivo, ensure_ascii=False, indent=2)
+    return resumen
@@ -0,0 +1,75 @@
+# src/nahual/client.py
+"""
+Cliente ligero del servidor de NahualScript.
+
+Uso: nahual-cliente <archivo.nhl> [opciones]
+
+Acepta las mismas opciones que `python -m nahual`, envía la petición al
+servidor iniciado con `python -m nahual --servidor` y reproduce su salida y su
+código de salida. Si no hay servidor escuchando, ejecuta el grimorio
+directamente. La entrada estándar sólo se envía cuando no es una terminal.
+"""
+
+import os
+import socket
+import sys
+
+from .protocol import (
+    SALIDA, ERRORES, FIN, ruta_socket_predeterminada, es_privado, enviar_peticion, recibir_marco,
+    codigo_de_fin
+)
+
+
+def _es_terminal(flujo) -> bool:
+    try:
+        return flujo is not None and flujo.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def _ejecutar_directamente():
+    from .__main__ import main as main_directo
+    return main_directo()
+
+
+def main():
+    ruta = ruta_socket_predeterminada()
+    # Sólo se envían grimorios y entrada a un servidor del mismo usuario
+    if not es_privado(ruta):
+        if os.path.exists(ruta):
+            sys.stderr.write(f'⚠️ El socket {ruta} no es del usuario actual; se ejecuta sin servidor\n')
+        return _ejecutar_directamente()
+
+    conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conexion.connect(ruta)
+    except OSError:
+        conexion.close()
+        return _ejecutar_directamente()
+
+    with conexion:
+        entrada = b'' if sys.stdin is None or _es_terminal(sys.stdin) else sys.stdin.buffer.read()
+        enviar_peticion(conexion, {
+            'argumentos': sys.argv[1:],
+            'cwd': os.getcwd(),
+            'terminal': _es_terminal(sys.stdout),
+        }, entrada)
+
+        destinos = {SALIDA: sys.stdout.buffer, ERRORES: sys.stderr.buffer}
+        while True:
+            marco = recibir_marco(conexion)
+            if marco is None:
+                sys.stderr.write('💫 Error: el servidor de NahualScript cerró la conexión\n')
+                sys.exit(1)
+            canal, datos = marco
+            if canal == FIN:
+                sys.stdout.flush()
+                sys.exit(codigo_de_fin(datos))
+            destino = destinos.get(canal)
+            if destino is not None:
+                destino.write(datos)
+                destino.flush()
+
+
+if __name__ == '__main__':
+    main()
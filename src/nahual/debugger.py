@@ -0,0 +1,332 @@
+# src/nahual/debugger.py
+"""
+Depurador de NahualScript: puntos de ruptura por línea, paso a paso e
+inspección de variables.
+
+Un intérprete con el depurador cargado pero sin puntos de ruptura ejecuta
+exactamente el mismo código que uno sin depurador. Poner un punto de ruptura
+reemplaza, en la lista de declaraciones de su bloque, sólo la declaración de
+esa línea por un nodo ('punto_ruptura', declaracion, ubicacion); quitarlo la
+devuelve a su lugar. Mientras se avanza paso a paso se reemplazan así todas
+las declaraciones del programa, de modo que también los ciclos, que guardan
+sus métodos en variables locales, se detienen; al continuar vuelven a su
+lugar todas las que no tienen un punto de ruptura.
+
+    depurador = Depurador(interprete, al_detenerse=ConsolaDepuracion())
+    depurador.cargar(codigo)
+    depurador.poner_punto(12)
+    depurador.ejecutar()
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .error_handler import ErrorEjecucion
+from .type_checker import verificar_programa
+from .types import Valor
+
+# Modos de avance después de una pausa
+CONTINUAR = 'continuar'
+PASO = 'paso'
+SIGUIENTE = 'siguiente'
+TERMINAR = 'terminar'
+
+
+class DepuracionTerminada(ErrorEjecucion):
+    """
+    Quien depuraba pidió terminar el programa. Como ErrorLimiteExcedido, es
+    fatal: llega a quien llamó a ejecutar().
+    """
+    fatal = True
+
+    def __init__(self, **kwargs):
+        super().__init__("Depuración terminada antes de completar el ritual", **kwargs)
+
+
+@dataclass
+class Pausa:
+    linea: int
+    declaracion: Any  # Nodo que está por ejecutarse
+    motivo: str  # 'punto_ruptura' o el modo de avance que la produjo
+    profundidad: int  # Sabidurías en curso
+
+
+def _linea(nodo: Any) -> Optional[int]:
+    if isinstance(nodo, tuple) and nodo and isinstance(nodo[-1], dict):
+        return nodo[-1].get('linea') or None
+    return None
+
+
+def _reemplazar(lista: list, indice: int, declaracion: Any) -> None:
+    """Pone en el lugar de la declaración un nodo que pasa por ejecutar_punto_ruptura."""
+    ubicacion = declaracion[-1] if isinstance(declaracion[-1], dict) else None
+    lista[indice] = ('punto_ruptura', declaracion, ubicacion)
+
+
+class Depurador:
+    """
+    Args:
+        interprete: NahualInterpreter a depurar
+        al_detenerse: Se llama como al_detenerse(depurador, pausa) en cada
+            pausa; elige cómo seguir llamando a continuar(), paso(),
+            siguiente() o terminar(). Si no elige, el programa continúa
+    """
+
+    def __init__(self, interprete: Any, al_detenerse: Optional[Callable[['Depurador', Pausa], None]] = None):
+        self.interprete = interprete
+        self.al_detenerse = al_detenerse
+        self.fuente = ""
+        self.arbol: Any = None
+        self.modo = CONTINUAR
+        self.pausa: Optional[Pausa] = None
+        # Línea -> lugares (lista de declaraciones, índice) de sus declaraciones
+        self._lugares: Dict[int, List[Tuple[list, int]]] = {}
+        # Todas las declaraciones del árbol con su lugar: (lista, índice, declaración)
+        self._ranuras: List[Tuple[list, int, Any]] = []
+        self._puntos: Dict[int, Tuple[list, int, Any]] = {}  # Línea -> (lista, índice, declaración)
+        self._en_punto: set = set()  # id() de las declaraciones con punto de ruptura
+        self._profundidad = 0
+        self._pasando = False
+
+        pila = interprete.manejador_errores.pila
+
+        def ejecutar_punto_ruptura(declaracion: Any, ubicacion: Optional[dict] = None) -> Optional[Valor]:
+            if id(declaracion) in self._en_punto:
+                self._pausar(declaracion, 'punto_ruptura')
+            elif self._pasando and (self.modo == PASO or len(pila) <= self._profundidad):
+                self._pausar(declaracion, self.modo)
+            return interprete.ejecutar(declaracion)
+
+        interprete.ejecutar_punto_ruptura = ejecutar_punto_ruptura
+
+    def cargar(self, fuente: str) -> list:
+        """
+        Parsea y verifica `fuente` para depurarla con ejecutar(). Retorna los
+        errores de tipos; con errores, ejecutar() los reporta sin ejecutar nada
+        y no se pueden poner puntos de ruptura.
+        """
+        self.quitar_todos()
+        interprete = self.interprete
+        if interprete.parser is None:
+            from .parser import NahualParser
+            interprete.parser = NahualParser(interprete.debug)
+        self.fuente = fuente
+        self.arbol = interprete.parser.parse(fuente)
+        self._lugares.clear()
+        self._ranuras.clear()
+        errores = []
+        if self.arbol and self.arbol[0] == 'programa':
+            verificado, errores = verificar_programa(self.arbol)
+            if not errores:
+                self.arbol = verificado
+                self._indexar(self.arbol)
+        return errores
+
+    def _indexar(self, nodo: Any) -> None:
+        """Registra las declaraciones de cada lista de declaraciones del árbol."""
+        if isinstance(nodo, list):
+            for hijo in nodo:
+                self._indexar(hijo)
+        elif isinstance(nodo, tuple) and nodo and isinstance(nodo[0], str):
+            if nodo[0] in ('programa_verificado', 'bloque') and isinstance(nodo[1], list):
+                for indice, declaracion in enumerate(nodo[1]):
+                    if isinstance(declaracion, tuple):
+                        self._ranuras.append((nodo[1], indice, declaracion))
+                    linea = _linea(declaracion)
+                    if linea:
+                        self._lugares.setdefault(linea, []).append((nodo[1], indice))
+            for hijo in nodo[1:]:
+                self._indexar(hijo)
+
+    def ejecutar(self, detenerse_al_inicio: bool = False) -> None:
+        """Ejecuta el programa cargado; con `detenerse_al_inicio` se pausa en su primera declaración."""
+        if detenerse_al_inicio:
+            self.paso()
+        self._aplicar_modo()
+        try:
+            self.interprete.run_arbol(self.arbol)
+        finally:
+            self.modo = CONTINUAR
+            self.pausa = None
+            self._aplicar_modo()
+
+    # --- Puntos de ruptura ---
+
+    def poner_punto(self, linea: int) -> None:
+        """Se detiene antes de ejecutar la primera declaración de `linea`."""
+        if linea in self._puntos:
+            return
+        if linea not in self._lugares:
+            raise ValueError(f"No hay ninguna declaración en la línea {linea}")
+        lista, indice = self._lugares[linea][0]
+        declaracion = lista[indice]
+        if declaracion[0] == 'punto_ruptura':
+            # Ya reemplazada por el paso a paso
+            declaracion = declaracion[1]
+        self._puntos[linea] = (lista, indice, declaracion)
+        self._en_punto.add(id(declaracion))
+        _reemplazar(lista, indice, declaracion)
+
+    def quitar_punto(self, linea: int) -> None:
+        if linea not in self._puntos:
+            raise ValueError(f"No hay un punto de ruptura en la línea {linea}")
+        lista, indice, declaracion = self._puntos.pop(linea)
+        self._en_punto.discard(id(declaracion))
+        if not self._pasando:
+            lista[indice] = declaracion
+
+    def quitar_todos(self) -> None:
+        for linea in list(self._puntos):
+            self.quitar_punto(linea)
+
+    @property
+    def puntos(self) -> List[int]:
+        return sorted(self._puntos)
+
+    # --- Avance ---
+
+    def continuar(self) -> None:
+        """Sigue hasta el próximo punto de ruptura."""
+        self.modo = CONTINUAR
+
+    def paso(self) -> None:
+        """Se detiene en la próxima declaración, aunque esté dentro de una sabiduría llamada."""
+        self.modo = PASO
+
+    def siguiente(self) -> None:
+        """Se detiene en la próxima declaración de esta sabiduría o de quien la llamó."""
+        self.modo = SIGUIENTE
+
+    def terminar(self) -> None:
+        """Detiene el programa lanzando DepuracionTerminada."""
+        self.modo = TERMINAR
+
+    def _pausar(self, declaracion: Any, motivo: str) -> None:
+        self._profundidad = len(self.interprete.manejador_errores.pila)
+        self.pausa = Pausa(_linea(declaracion) or 0, declaracion, motivo, self._profundidad)
+        self.modo = CONTINUAR
+        self.interprete.salida.vaciar()
+        if self.al_detenerse is not None:
+            self.al_detenerse(self, self.pausa)
+        if self.modo == TERMINAR:
+            raise DepuracionTerminada()
+        self._aplicar_modo()
+
+    def _aplicar_modo(self) -> None:
+        """Al empezar a avanzar paso a paso reemplaza todas las declaraciones; al dejarlo, las devuelve."""
+        pasar = self.modo in (PASO, SIGUIENTE)
+        if pasar and not self._pasando:
+            for lista, indice, declaracion in self._ranuras:
+                if id(declaracion) not in self._en_punto:
+                    _reemplazar(lista, indice, declaracion)
+        elif not pasar and self._pasando:
+            for lista, indice, declaracion in self._ranuras:
+                if id(declaracion) not in self._en_punto:
+                    lista[indice] = declaracion
+        self._pasando = pasar
+
+    def desinstalar(self) -> None:
+        """Quita los puntos de ruptura y devuelve al intérprete sus métodos."""
+        self.quitar_todos()
+        self.modo = CONTINUAR
+        self._aplicar_modo()
+        vars(self.interprete).pop('ejecutar_punto_ruptura', None)
+
+    # --- Inspección ---
+
+    def variables(self, solo_locales: bool = False) -> Dict[str, Valor]:
+        """Variables visibles donde está detenido el programa; las locales ocultan a las externas."""
+        entorno = self.interprete.entorno_actual
+        if solo_locales:
+            return dict(entorno.variables)
+        visibles: Dict[str, Valor] = {}
+        while entorno is not None:
+            for nombre, valor in entorno.variables.items():
+                visibles.setdefault(nombre, valor)
+            entorno = entorno.parent
+        return visibles
+
+    def valor(self, nombre: str) -> Valor:
+        """Valor de una variable visible; NameError si no existe."""
+        return self.interprete.entorno_actual.obtener_variable(nombre)
+
+    def pila(self) -> List[Tuple[str, int]]:
+        """Sabidurías en curso, de la más externa a la más interna, con la línea de su llamada."""
+        return [(marco.nombre, marco.ubicacion['linea'] if marco.ubicacion else 0)
+                for marco in self.interprete.manejador_errores.pila]
+
+    def linea_fuente(self, linea: int) -> str:
+        lineas = self.fuente.splitlines()
+        return lineas[linea - 1].strip() if 0 < linea <= len(lineas) else ""
+
+
+class ConsolaDepuracion:
+    """Atiende las pausas del Depurador con órdenes leídas de `entrada` (--debug-interactive)."""
+
+    AYUDA = """Órdenes:
+  c, continuar       Sigue hasta el próximo punto de ruptura
+  s, paso            Ejecuta la declaración, entrando a las sabidurías
+  n, siguiente       Ejecuta la declaración sin detenerse dentro de las sabidurías
+  b, romper [línea]  Pone un punto de ruptura o, sin línea, lista los puestos
+  d, borrar <línea>  Quita un punto de ruptura
+  p, imprimir <var>  Muestra una variable
+  v, variables       Muestra las variables visibles
+  t, pila            Muestra las sabidurías en curso
+  q, terminar        Detiene el programa"""
+
+    def __init__(self, entrada: Any = None, salida: Any = None):
+        self.entrada = entrada if entrada is not None else sys.stdin
+        self.salida = salida if salida is not None else sys.stdout
+
+    def _escribir(self, texto: str) -> None:
+        self.salida.write(texto + "\n")
+        self.salida.flush()
+
+    def __call__(self, depurador: Depurador, pausa: Pausa) -> None:
+        self._escribir(f"⏸  línea {pausa.linea}: {depurador.linea_fuente(pausa.linea)}")
+        while True:
+            self.salida.write("(nahual) ")
+            self.salida.flush()
+            orden = self.entrada.readline()
+            if not orden:
+                depurador.terminar()
+                return
+            nombre, _, argumento = orden.strip().partition(' ')
+            argumento = argumento.strip()
+            if nombre in ('c', 'continuar'):
+                depurador.continuar()
+                return
+            if nombre in ('s', 'paso'):
+                depurador.paso()
+                return
+            if nombre in ('n', 'siguiente'):
+                depurador.siguiente()
+                return
+            if nombre in ('q', 'terminar'):
+                depurador.terminar()
+                return
+            self._inspeccionar(depurador, nombre, argumento)
+
+    def _inspeccionar(self, depurador: Depurador, nombre: str, argumento: str) -> None:
+        try:
+            if nombre in ('b', 'romper'):
+                if argumento:
+                    depurador.poner_punto(int(argumento))
+                self._escribir("Puntos de ruptura: " + (", ".join(map(str, depurador.puntos)) or "ninguno"))
+            elif nombre in ('d', 'borrar'):
+                depurador.quitar_punto(int(argumento))
+            elif nombre in ('p', 'imprimir'):
+                valor = depurador.valor(argumento)
+                self._escribir(f"{argumento} = {valor} ({valor.tipo.value})")
+            elif nombre in ('v', 'variables'):
+                for variable, valor in depurador.variables().items():
+                    self._escribir(f"  {variable} = {valor}")
+            elif nombre in ('t', 'pila'):
+                self._escribir("  <programa>")
+                for sabiduria, linea in depurador.pila():
+                    self._escribir(f"  {sabiduria}, llamada en línea {linea}")
+            elif nombre:
+                self._escribir(self.AYUDA)
+        except (ValueError, NameError) as e:
+            self._escribir(f"⚠️ {e}")
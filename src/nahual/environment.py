@@ -9,6 +9,14 @@ class Environment:
     def definir_variable(self, nombre: str, valor: Valor) -> None:
         self.variables[nombre] = valor
 
+    def asignar_variable(self, nombre: str, valor: Valor) -> None:
+        if nombre in self.variables:
+            self.variables[nombre] = valor
+        elif self.parent:
+            self.parent.asignar_variable(nombre, valor)
+        else:
+            raise NameError(f"Variable no definida: {nombre}")
+
     def definir_funcion(self, nombre: str, funcion: 'Funcion') -> None:
         self.funciones[nombre] = funcion
 
@@ -51,16 +51,91 @@ class MarcoEjecucion:
     variables: Dict[str, Any] = None
 
     def __str__(self) -> str:
-        resultado = f"  en {self.nombre} ({self.ubicacion})"
+        # Las sabidurías que aplica mapear_paralelo no tienen ubicación de llamada
+        resultado = f"  en {self.nombre}"
+        if self.ubicacion is not None:
+            resultado += f", llamada en {self.ubicacion}"
         if self.variables:
-            vars_str = ", ".join(f"{k}={v}" for k, v in self.variables.items())
+            vars_str = ", ".join(f"{k}={_resumir(v)}" for k, v in self.variables.items())
             resultado += f"\n    variables locales: {vars_str}"
         return resultado
 
 
+# Caracteres máximos de cada variable local en un rastro
+LARGO_VARIABLE = 40
+
+
+def _resumir(valor: Any) -> str:
+    texto = str(valor)
+    return texto if len(texto) <= LARGO_VARIABLE else texto[:LARGO_VARIABLE - 1] + "…"
+
+
+class _MarcoActivo:
+    """Marco reutilizable de PilaLlamadas."""
+    __slots__ = ('nombre', 'ubicacion', 'entorno')
+
+    def __init__(self):
+        self.nombre = None
+        self.ubicacion = None
+        self.entorno = None
+
+
+class PilaLlamadas:
+    """
+    Pila de llamadas a sabidurías del programa en ejecución.
+
+    Los marcos se asignan de antemano y se reutilizan: entrar() sólo guarda el
+    nombre, la ubicación de la llamada (el diccionario del nodo, sin
+    convertirlo) y el entorno de la llamada. capturar() crea los
+    MarcoEjecucion de un error copiando las variables locales; sólo se
+    convierten en texto si el error llega a mostrarse.
+    """
+    __slots__ = ('_marcos', 'profundidad')
+
+    CAPACIDAD_INICIAL = 64
+
+    def __init__(self):
+        self._marcos = [_MarcoActivo() for _ in range(self.CAPACIDAD_INICIAL)]
+        self.profundidad = 0
+
+    def entrar(self, nombre: str, ubicacion: Any, entorno: Any) -> None:
+        if self.profundidad == len(self._marcos):
+            self._marcos.extend(_MarcoActivo() for _ in range(len(self._marcos)))
+        marco = self._marcos[self.profundidad]
+        marco.nombre = nombre
+        marco.ubicacion = ubicacion
+        marco.entorno = entorno
+        self.profundidad += 1
+
+    def salir(self) -> None:
+        self.profundidad -= 1
+        self._marcos[self.profundidad].entorno = None
+
+    def __len__(self) -> int:
+        return self.profundidad
+
+    def __iter__(self):
+        return iter(self._marcos[:self.profundidad])
+
+    def capturar(self) -> List[MarcoEjecucion]:
+        """Copia de la pila actual, de la llamada más externa a la más interna."""
+        return [MarcoEjecucion(marco.nombre, _a_ubicacion(marco.ubicacion),
+                               dict(marco.entorno.variables) if marco.entorno is not None else None)
+                for marco in self]
+
+
+def _a_ubicacion(ubicacion: Any) -> Optional[Ubicacion]:
+    if isinstance(ubicacion, dict):
+        return Ubicacion(ubicacion.get('linea', 0), ubicacion.get('columna', 0))
+    return ubicacion
+
+
 class ErrorNahual(Exception):
     """Clase base para todos los errores de NahualScript."""
 
+    # Los errores fatales no se absorben en decorar_manejo_errores: detienen el programa
+    fatal = False
+
     def __init__(
             self,
             mensaje: str,
@@ -74,6 +149,15 @@ class ErrorNahual(Exception):
         self.sugerencia = sugerencia
         super().__init__(self.formatear_error())
 
+    def __str__(self) -> str:
+        # Se formatea al mostrarse: la pila se agrega después de crear el error
+        return self.formatear_error()
+
+    def __reduce__(self):
+        # Los argumentos de __init__ cambian entre subclases: se reconstruye desde
+        # sus atributos, para que los errores crucen entre procesos
+        return _reconstruir_error, (type(self), self.__dict__)
+
     def formatear_error(self) -> str:
         partes = [
             "🔮 Error en el Ritual Místico 🔮",
@@ -84,7 +168,7 @@ class ErrorNahual(Exception):
             partes.append(f"📍 Ubicación: {self.ubicacion}")
 
         if self.pila:
-            partes.append("\n🔍 Rastro del ritual:")
+            partes.append("\n🔍 Rastro del ritual (llamada más reciente primero):")
             for marco in reversed(self.pila):
                 partes.append(str(marco))
 
@@ -94,6 +178,12 @@ class ErrorNahual(Exception):
         return "\n".join(partes)
 
 
+def _reconstruir_error(clase: type, atributos: Dict[str, Any]) -> ErrorNahual:
+    error = clase.__new__(clase)
+    error.__dict__.update(atributos)
+    return error
+
+
 class ErrorSintaxis(ErrorNahual):
     """Error en la estructura del código."""
 
@@ -130,6 +220,23 @@ class ErrorEjecucion(ErrorNahual):
     pass
 
 
+def _reportar(interprete: Any, mensaje: str) -> None:
+    """Muestra un error por la salida del intérprete, respetando su búfer."""
+    salida = getattr(interprete, 'salida', None)
+    if salida is None:
+        print(mensaje)
+        return
+    salida.escribir_linea(mensaje)
+    salida.vaciar()
+
+
+def _registrar(interprete: Any, error: ErrorNahual) -> None:
+    """Guarda el error en el manejador del intérprete, si tiene uno."""
+    manejador = getattr(interprete, 'manejador_errores', None)
+    if manejador is not None:
+        manejador.registrar_error(error)
+
+
 def decorar_manejo_errores(metodo):
     """Decorador para manejar errores en métodos del intérprete."""
 
@@ -137,17 +244,22 @@ def decorar_manejo_errores(metodo):
         try:
             return metodo(self, *args, **kwargs)
         except ErrorNahual as e:
+            if e.fatal:
+                raise
             if hasattr(self, 'debug') and self.debug:
-                print("\nTraza completa para depuración:")
+                _reportar(self, "\nTraza completa para depuración:")
                 traceback.print_exc()
-            print(str(e))
+            # Al registrarse recibe la pila de llamadas, que se muestra con el error
+            _registrar(self, e)
+            _reportar(self, str(e))
             return None
         except Exception as e:
             error = ErrorEjecucion(
                 f"Error inesperado: {str(e)}",
                 sugerencia="Contacta a los ancianos sabios (desarrolladores)"
             )
-            print(str(error))
+            _reportar(self, str(error))
+            _registrar(self, error)
             if hasattr(self, 'debug') and self.debug:
                 traceback.print_exc()
             return None
@@ -161,14 +273,14 @@ class ManejadorErrores:
     def __init__(self):
         self.errores: List[ErrorNahual] = []
         self.ubicacion_actual: Optional[Ubicacion] = None
-        self.pila: List[MarcoEjecucion] = []
+        self.pila = PilaLlamadas()
 
     def registrar_error(self, error: ErrorNahual) -> None:
         """Registra un error y lo agrega a la lista de errores."""
         if not error.ubicacion:
             error.ubicacion = self.ubicacion_actual
         if not error.pila:
-            error.pila = self.pila.copy()
+            error.pila = self.pila.capturar()
         self.errores.append(error)
 
     def tiene_errores(self) -> bool:
@@ -0,0 +1,215 @@
+# src/nahual/files.py
+
+import os
+from typing import Iterator, Optional, Set
+
+from .output import SalidaNahual, TAMANO_BUFER
+from .types import TipoNahual, Valor
+from .error_handler import ErrorEjecucion
+
+
+# Tamaño del búfer de lectura de los pergaminos abiertos para leer
+TAMANO_BUFER_LECTURA = 1024 * 1024
+
+# Modos de apertura de pergaminos y su equivalente en open()
+MODOS = {
+    'leer': 'r',
+    'escribir': 'w',
+    'anexar': 'a',
+}
+
+
+# Banderas de os.open() de cada modo, para abrir relativo a un directorio
+BANDERAS = {
+    'leer': os.O_RDONLY,
+    'escribir': os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+    'anexar': os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+}
+
+# Sin O_NOFOLLOW ni dir_fd (Windows) el aislamiento sólo puede revisar la ruta
+_SIN_ENLACES = hasattr(os, 'O_NOFOLLOW') and os.open in os.supports_dir_fd
+
+
+class ErrorPergamino(ErrorEjecucion):
+    """Error al abrir, leer o escribir un pergamino (archivo)."""
+    pass
+
+
+class Pergamino:
+    """
+    Archivo abierto desde NahualScript.
+
+    Los pergaminos de lectura se recorren línea por línea sin cargarlos en
+    memoria, con `para cada linea en pergamino` o con leer_linea(). Los de
+    escritura acumulan el texto en una SalidaNahual y escriben en bloques.
+
+    Args:
+        ruta: Ruta del archivo
+        modo: 'leer', 'escribir' o 'anexar'
+        descriptor: Descriptor ya abierto para la ruta, que el pergamino pasa
+            a cerrar; si no se indica se abre la ruta
+    """
+
+    def __init__(self, ruta: str, modo: str, descriptor: Optional[int] = None):
+        self.ruta = ruta
+        self.modo = modo
+        self.cerrado = False
+        self._siguiente: Optional[str] = None  # Línea leída por adelantado en al_final()
+        archivo = ruta if descriptor is None else descriptor
+        try:
+            if modo == 'leer':
+                self._archivo = open(archivo, 'r', encoding='utf-8', newline=None,
+                                     buffering=TAMANO_BUFER_LECTURA)
+                self._salida = None
+            else:
+                self._archivo = open(archivo, MODOS[modo], encoding='utf-8')
+                self._salida = SalidaNahual(self._archivo, TAMANO_BUFER, por_lineas=False)
+        except OSError as e:
+            if descriptor is not None:
+                os.close(descriptor)
+            raise ErrorPergamino(
+                f"No se pudo abrir el pergamino '{ruta}': {e.strerror}",
+                sugerencia="Verifica que la ruta exista y tengas permiso sobre ella"
+            )
+
+    def _verificar(self, modo_lectura: bool) -> None:
+        if self.cerrado:
+            raise ErrorPergamino(f"El pergamino '{self.ruta}' ya está cerrado")
+        if modo_lectura != (self.modo == 'leer'):
+            accion = "leer" if modo_lectura else "escribir en"
+            raise ErrorPergamino(f"No se puede {accion} el pergamino '{self.ruta}' abierto para {self.modo}")
+
+    @staticmethod
+    def _sin_salto(linea: str) -> str:
+        return linea[:-1] if linea.endswith('\n') else linea
+
+    def lineas(self) -> Iterator[Valor]:
+        """Itera perezosamente las líneas restantes, sin el salto final."""
+        self._verificar(modo_lectura=True)
+        if self._siguiente is not None:
+            linea, self._siguiente = self._siguiente, None
+            yield Valor(TipoNahual.MANTRA, self._sin_salto(linea))
+        for linea in self._archivo:
+            yield Valor(TipoNahual.MANTRA, self._sin_salto(linea))
+
+    def al_final(self) -> bool:
+        """Indica si ya no quedan líneas por leer."""
+        self._verificar(modo_lectura=True)
+        if self._siguiente is None:
+            self._siguiente = self._archivo.readline()
+        return not self._siguiente
+
+    def leer_linea(self) -> str:
+        """Retorna la siguiente línea sin el salto final."""
+        if self.al_final():
+            raise ErrorPergamino(
+                f"No quedan líneas por leer en '{self.ruta}'",
+                sugerencia="Consulta fin_pergamino() antes de leer"
+            )
+        linea, self._siguiente = self._siguiente, None
+        return self._sin_salto(linea)
+
+    def escribir(self, texto: str) -> None:
+        self._verificar(modo_lectura=False)
+        self._salida.escribir(texto)
+
+    def cerrar(self) -> None:
+        if self.cerrado:
+            return
+        self.cerrado = True
+        try:
+            if self._salida is not None:
+                self._salida.vaciar()
+        finally:
+            self._archivo.close()
+
+    def __str__(self) -> str:
+        estado = "cerrado" if self.cerrado else self.modo
+        return f"<pergamino {self.ruta} ({estado})>"
+
+
+class GestorPergaminos:
+    """
+    Abre los pergaminos de un intérprete aplicando su configuración de aislamiento.
+
+    Args:
+        solo_lectura: Prohíbe abrir pergaminos para escribir o anexar
+        directorio_permitido: Si se indica, sólo se permiten rutas dentro de él
+            (después de resolver enlaces simbólicos y '..')
+
+    Con directorio_permitido, la ruta resuelta se abre componente por
+    componente desde el directorio, sin seguir enlaces simbólicos: si entre la
+    revisión y la apertura alguien cambia un componente por un enlace, la
+    apertura falla en lugar de salir del directorio.
+    """
+
+    def __init__(self, solo_lectura: bool = False, directorio_permitido: Optional[str] = None):
+        self.solo_lectura = solo_lectura
+        self.directorio_permitido = (os.path.realpath(directorio_permitido)
+                                     if directorio_permitido is not None else None)
+        self.abiertos: Set[Pergamino] = set()
+
+    def verificar_ruta(self, ruta: str, escritura: bool = False) -> str:
+        """Retorna la ruta resuelta o lanza ErrorPergamino si el aislamiento no la permite."""
+        if escritura and self.solo_lectura:
+            raise ErrorPergamino(
+                f"No se permite escribir en '{ruta}': los pergaminos son de solo lectura"
+            )
+        resuelta = os.path.realpath(ruta)
+        if self.directorio_permitido is not None:
+            if os.path.commonpath([self.directorio_permitido, resuelta]) != self.directorio_permitido:
+                raise ErrorPergamino(
+                    f"No se permite acceder a '{ruta}' fuera de {self.directorio_permitido}",
+                    sugerencia="Usa rutas dentro del directorio permitido"
+                )
+        return resuelta
+
+    def _abrir_sin_enlaces(self, resuelta: str, banderas: int) -> int:
+        relativa = os.path.relpath(resuelta, self.directorio_permitido)
+        partes = [] if relativa == os.curdir else relativa.split(os.sep)
+        directorio = os.open(self.directorio_permitido, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for parte in partes[:-1]:
+                siguiente = os.open(parte, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=directorio)
+                os.close(directorio)
+                directorio = siguiente
+            return os.open(partes[-1] if partes else os.curdir, banderas | os.O_NOFOLLOW, 0o666,
+                           dir_fd=directorio)
+        finally:
+            os.close(directorio)
+
+    def _abrir_verificada(self, ruta: str, resuelta: str, modo: str) -> int:
+        banderas = BANDERAS[modo] | getattr(os, 'O_CLOEXEC', 0)
+        try:
+            if self.directorio_permitido is not None and _SIN_ENLACES:
+                return self._abrir_sin_enlaces(resuelta, banderas)
+            return os.open(resuelta, banderas, 0o666)
+        except OSError as e:
+            raise ErrorPergamino(
+                f"No se pudo abrir el pergamino '{ruta}': {e.strerror}",
+                sugerencia="Verifica que la ruta exista y tengas permiso sobre ella"
+            )
+
+    def abrir_descriptor(self, ruta: str, modo: str = 'leer') -> int:
+        """Verifica la ruta y la abre con os.open(); quien llama cierra el descriptor."""
+        return self._abrir_verificada(ruta, self.verificar_ruta(ruta, escritura=modo != 'leer'), modo)
+
+    def abrir(self, ruta: str, modo: str = 'leer') -> Pergamino:
+        if modo not in MODOS:
+            raise ErrorPergamino(
+                f"Modo de pergamino desconocido: {modo}",
+                sugerencia=f"Usa uno de: {', '.join(MODOS)}"
+            )
+        resuelta = self.verificar_ruta(ruta, escritura=modo != 'leer')
+        pergamino = Pergamino(resuelta, modo, self._abrir_verificada(ruta, resuelta, modo))
+        self.abiertos.add(pergamino)
+        return pergamino
+
+    def cerrar(self, pergamino: Pergamino) -> None:
+        self.abiertos.discard(pergamino)
+        pergamino.cerrar()
+
+    def cerrar_todos(self) -> None:
+        """Cierra (y vacía) los pergaminos que el programa dejó abiertos."""
+        while self.abiertos:
+            self.abiertos.pop().cerrar()
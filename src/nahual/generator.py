@@ -0,0 +1,209 @@
+# src/nahual/generator.py
+"""
+Generador de grimorios sintéticos para pruebas de escala y benchmarks.
+
+    codigo = generar_programa(semilla=7, forma=Forma(sabidurias=500, profundidad=4))
+
+La misma semilla y la misma Forma producen siempre el mismo texto. Los
+programas generados son válidos: parsean, pasan la verificación de tipos,
+terminan y al final invocan una suma de control, de modo que sirven para
+medir y comparar el lexer, el parser y el intérprete.
+
+Para que terminen, cada sabiduría sólo llama a sabidurías definidas antes
+que ella y recibe un primer parámetro `n` de combustible que baja en cada
+llamada; los rituales dan `vueltas` vueltas y los valores se mantienen
+acotados con `residuo`. Las expresiones muy largas se anidan en el árbol
+tanto como operandos tienen.
+
+Desde la línea de comandos (los campos de Forma como opciones):
+
+    python -m nahual.generator --semilla=1 --sabidurias=1000 > grande.nhl
+"""
+
+import random
+import sys
+from dataclasses import dataclass, fields, replace
+from typing import List, Optional
+
+# Módulo con el que se acotan los espiritus generados
+MODULO = 9973
+
+
+@dataclass(frozen=True)
+class Forma:
+    sabidurias: int = 20  # Definiciones de sabiduría
+    profundidad: int = 2  # Anidamiento de vision y ritual dentro de cada sabiduría
+    declaraciones: int = 4  # Declaraciones por bloque
+    largo_expresion: int = 3  # Operandos por expresión
+    elementos_ofrenda: int = 8  # Elementos de cada ofrenda literal
+    abanico: int = 2  # Llamadas de cada sabiduría a sabidurías anteriores
+    combustible: int = 3  # Llamadas anidadas como máximo
+    vueltas: int = 3  # Vueltas de cada ritual
+
+    def escalada(self, factor: float) -> 'Forma':
+        """La misma forma con `factor` veces más sabidurías y ofrendas más grandes."""
+        return replace(self, sabidurias=max(1, round(self.sabidurias * factor)),
+                       elementos_ofrenda=max(1, round(self.elementos_ofrenda * factor)))
+
+
+class _Generador:
+    def __init__(self, semilla: int, forma: Forma):
+        self.azar = random.Random(semilla)
+        self.forma = forma
+        self.lineas: List[str] = []
+        self.sangria = 0
+        self.contador = 0
+        # Por cada bloque abierto, las variables que declara
+        self.espiritus: List[List[str]] = []
+        self.ofrendas: List[List[str]] = []
+        self.aridades: List[int] = []  # Parámetros de cada sabiduría, sin contar `n`
+
+    def _linea(self, texto: str) -> None:
+        self.lineas.append("    " * self.sangria + texto)
+
+    def _nuevo(self, prefijo: str) -> str:
+        self.contador += 1
+        return f"{prefijo}{self.contador}"
+
+    def _visibles(self, ambitos: List[List[str]]) -> List[str]:
+        return [nombre for ambito in ambitos for nombre in ambito]
+
+    def _termino(self) -> str:
+        azar = self.azar
+        espiritus = self._visibles(self.espiritus)
+        ofrendas = self._visibles(self.ofrendas)
+        eleccion = azar.random()
+        if ofrendas and self.forma.elementos_ofrenda and eleccion < 0.15:
+            ofrenda = azar.choice(ofrendas)
+            if azar.random() < 0.5:
+                return f"longitud({ofrenda})"
+            return f"{ofrenda}[{azar.randrange(self.forma.elementos_ofrenda)}]"
+        if espiritus and eleccion < 0.75:
+            return azar.choice(espiritus)
+        return str(azar.randint(1, 99))
+
+    def _expresion(self) -> str:
+        partes = [self._termino()]
+        for _ in range(self.forma.largo_expresion - 1):
+            partes += [self.azar.choice(('unir', 'separar', 'multiplicar')), self._termino()]
+        return f"({' '.join(partes)}) residuo {MODULO}"
+
+    def _bloque(self, profundidad: int, cuerpo_extra: Optional[List[str]] = None) -> None:
+        """Genera el contenido de un bloque ya abierto con `{`; lo que declara no sale de él."""
+        self.sangria += 1
+        self.espiritus.append([])
+        self.ofrendas.append([])
+        self._declaraciones(profundidad)
+        for linea in cuerpo_extra or []:
+            self._linea(linea)
+        self.espiritus.pop()
+        self.ofrendas.pop()
+        self.sangria -= 1
+
+    def _declaraciones(self, profundidad: int) -> None:
+        for indice in range(self.forma.declaraciones):
+            # La primera de cada bloque anida, para llegar siempre a la profundidad pedida
+            if profundidad < self.forma.profundidad and (indice == 0 or self.azar.random() < 0.25):
+                self._compuesta(profundidad + 1)
+            else:
+                self._simple()
+
+    def _simple(self) -> None:
+        azar = self.azar
+        espiritus = self._visibles(self.espiritus)
+        ofrendas = self._visibles(self.ofrendas)
+        eleccion = azar.random()
+        if eleccion < 0.15:
+            nombre = self._nuevo('xs')
+            elementos = ", ".join(str(azar.randint(0, 99)) for _ in range(self.forma.elementos_ofrenda))
+            self._linea(f"ofrenda {nombre} := [{elementos}];")
+            self.ofrendas[-1].append(nombre)
+        elif ofrendas and eleccion < 0.3:
+            self._linea(f"agregar({azar.choice(ofrendas)}, {self._expresion()});")
+        elif espiritus and eleccion < 0.4:
+            self._linea(f"mantra {self._nuevo('m')} := \"valor \" unir {azar.choice(espiritus)};")
+        elif len(espiritus) > 1 and eleccion < 0.7:
+            # `n` es el combustible de las llamadas: no se reasigna
+            destino = azar.choice([nombre for nombre in espiritus if nombre != 'n'])
+            self._linea(f"{destino} := {self._expresion()};")
+        else:
+            nombre = self._nuevo('v')
+            self._linea(f"espiritu {nombre} := {self._expresion()};")
+            self.espiritus[-1].append(nombre)
+
+    def _compuesta(self, profundidad: int) -> None:
+        if self.azar.random() < 0.5:
+            self._linea(f"vision (({self._expresion()}) residuo 2 igual 0) {{")
+            self._bloque(profundidad)
+            self._linea("} sino {")
+            self._bloque(profundidad)
+            self._linea("}")
+        else:
+            contador = self._nuevo('c')
+            self._linea(f"espiritu {contador} := 0;")
+            self._linea(f"ritual ({contador} menor {self.forma.vueltas}) {{")
+            self._bloque(profundidad, [f"{contador} := {contador} unir 1;"])
+            self._linea("}")
+
+    def _sabiduria(self, indice: int) -> None:
+        azar = self.azar
+        parametros = [f"p{i}" for i in range(azar.randint(1, 3))]
+        self._linea(f"sabiduria f{indice}(espiritu n, "
+                    f"{', '.join(f'espiritu {p}' for p in parametros)}) {{")
+        self.sangria += 1
+        self.espiritus.append(['n', *parametros])
+        self.ofrendas.append([])
+        self._linea(f"espiritu r := {self._expresion()};")
+        self.espiritus[-1].append('r')
+        self._declaraciones(0)
+        # Llamadas a sabidurías anteriores, sólo mientras quede combustible
+        if indice and self.forma.abanico:
+            self._linea("vision (n mayor 0) {")
+            for _ in range(self.forma.abanico):
+                llamada = azar.randrange(indice)
+                argumentos = ", ".join(self._expresion() for _ in range(self.aridades[llamada]))
+                self._linea(f"    r := (r unir f{llamada}(n separar 1, {argumentos})) residuo {MODULO};")
+            self._linea("}")
+        self._linea("retornar r;")
+        self.espiritus.pop()
+        self.ofrendas.pop()
+        self.sangria -= 1
+        self._linea("}")
+        self.aridades.append(len(parametros))
+
+    def generar(self) -> str:
+        for indice in range(self.forma.sabidurias):
+            self._sabiduria(indice)
+            self._linea("")
+        self._linea("espiritu total := 0;")
+        for indice, aridad in enumerate(self.aridades):
+            argumentos = ", ".join(str(self.azar.randint(0, 99)) for _ in range(aridad))
+            self._linea(f"total := (total unir f{indice}({self.forma.combustible}, {argumentos})) "
+                        f"residuo {MODULO};")
+        self._linea("invocar total;")
+        return "\n".join(self.lineas) + "\n"
+
+
+def generar_programa(semilla: int = 0, forma: Optional[Forma] = None) -> str:
+    """Código fuente de un grimorio válido con la `forma` pedida, determinado por `semilla`."""
+    return _Generador(semilla, forma or Forma()).generar()
+
+
+def main() -> None:
+    valores = {}
+    semilla = 0
+    for argumento in sys.argv[1:]:
+        nombre, _, valor = argumento.lstrip('-').partition('=')
+        if nombre == 'semilla':
+            semilla = int(valor)
+        elif nombre in {campo.name for campo in fields(Forma)}:
+            valores[nombre] = int(valor)
+        else:
+            print(f"Opción desconocida: {argumento} (hay --semilla y "
+                  f"{', '.join(f'--{campo.name}' for campo in fields(Forma))})", file=sys.stderr)
+            sys.exit(2)
+    sys.stdout.write(generar_programa(semilla, Forma(**valores)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# src/nahual/input.py
+
+import codecs
+import sys
+from typing import Any, List, Optional, TextIO
+
+from .types import TipoNahual, Valor
+
+
+# Cantidad de caracteres leídos de la fuente en cada bloque
+TAMANO_BLOQUE = 64 * 1024
+
+
+class EntradaNahual:
+    """
+    Capa de entrada compartida por las dos rutas de `percibir`.
+
+    Cuando la fuente no es interactiva (tubería o archivo) se lee en bloques
+    grandes y las líneas se entregan desde un búfer, sin mostrar el mensaje de
+    `percibir`. Cada bloque trae lo que ya está disponible, hasta
+    `tamano_bloque`, para que una tubería que escribe despacio no detenga la
+    primera lectura hasta llenarlo. En una terminal se lee línea por línea y el mensaje se escribe
+    por la salida del intérprete después de vaciarla.
+    """
+
+    def __init__(self, fuente: Optional[TextIO] = None, tamano_bloque: int = TAMANO_BLOQUE,
+                 interactiva: Optional[bool] = None, salida: Optional[Any] = None):
+        self.fuente = fuente if fuente is not None else sys.stdin
+        self.tamano_bloque = tamano_bloque
+        self.interactiva = self._es_terminal(self.fuente) if interactiva is None else interactiva
+        self.salida = salida
+        self._lineas: List[str] = []
+        self._indice = 0
+        self._resto = ''
+        self._decodificador: Optional[codecs.IncrementalDecoder] = None
+
+    @staticmethod
+    def _es_terminal(fuente: Any) -> bool:
+        try:
+            return fuente.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def _crudo(self) -> Optional[Any]:
+        """Búfer binario de la fuente, si lo tiene y permite leer sólo lo disponible."""
+        crudo = getattr(self.fuente, 'buffer', None)
+        return crudo if hasattr(crudo, 'read1') else None
+
+    def _leer_bloque(self) -> str:
+        crudo = self._crudo()
+        if crudo is None:
+            # Fuentes en memoria como StringIO: read() nunca espera
+            return self.fuente.read(self.tamano_bloque)
+        if self._decodificador is None:
+            self._decodificador = codecs.getincrementaldecoder(self.fuente.encoding)(self.fuente.errors or 'strict')
+        while True:
+            # read1 retorna en cuanto hay datos, sin esperar a llenar el bloque
+            datos = crudo.read1(self.tamano_bloque)
+            texto = self._decodificador.decode(datos, final=not datos)
+            if texto or not datos:
+                return texto
+
+    def _rellenar(self) -> bool:
+        bloque = self._leer_bloque()
+        if not bloque:
+            if not self._resto:
+                return False
+            self._lineas, self._resto = [self._resto], ''
+        else:
+            self._lineas = (self._resto + bloque).split('\n')
+            self._resto = self._lineas.pop()
+        self._indice = 0
+        return True
+
+    def leer_linea(self, mensaje: str = '') -> str:
+        """Retorna la siguiente línea sin el salto final; lanza EOFError al agotarse."""
+        if self.interactiva:
+            if self.salida is not None:
+                if mensaje:
+                    self.salida.escribir(mensaje)
+                self.salida.vaciar()
+            linea = self.fuente.readline()
+            if not linea:
+                raise EOFError("No hay más entrada que percibir")
+            linea = linea[:-1] if linea.endswith('\n') else linea
+        else:
+            while self._indice >= len(self._lineas):
+                if not self._rellenar():
+                    raise EOFError("No hay más entrada que percibir")
+            linea = self._lineas[self._indice]
+            self._indice += 1
+        return linea[:-1] if linea.endswith('\r') else linea
+
+    def leer_resto(self) -> str:
+        """Retorna todo lo que queda por leer de la fuente, incluido lo ya almacenado en el búfer."""
+        pendientes = self._lineas[self._indice:]
+        partes = ['\n'.join(pendientes) + '\n'] if pendientes else []
+        partes.append(self._resto)
+        if self._decodificador is not None:
+            partes.append(self._decodificador.decode(self._crudo().read(), final=True))
+        else:
+            partes.append(self.fuente.read())
+        self._lineas, self._indice, self._resto = [], 0, ''
+        return ''.join(partes)
+
+    def leer_espiritu(self, mensaje: str = '') -> int:
+        """Lee una línea y la convierte directamente a entero."""
+        return int(self.leer_linea(mensaje))
+
+    def leer_energia(self, mensaje: str = '') -> float:
+        """Lee una línea y la convierte directamente a flotante."""
+        return float(self.leer_linea(mensaje))
+
+    def leer_valor(self, tipo: TipoNahual, mensaje: str = '') -> Valor:
+        """Lee una línea como Valor del tipo indicado; espiritu y energia se convierten sin pasar por mantra."""
+        if tipo == TipoNahual.ESPIRITU:
+            return Valor(TipoNahual.ESPIRITU, self.leer_espiritu(mensaje))
+        if tipo == TipoNahual.ENERGIA:
+            return Valor(TipoNahual.ENERGIA, self.leer_energia(mensaje))
+        return Valor(TipoNahual.MANTRA, self.leer_linea(mensaje))
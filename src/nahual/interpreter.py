@@ -1,22 +1,85 @@
 # src/nahual/interpreter.py
 
 from typing import Any, List, Optional, Dict
-from .types import TipoNahual, Valor, TipoError, Lista
+from .types import TipoNahual, Valor, TipoError, Lista, Mapa
+from .type_checker import VerificadorTipos, verificar_programa
+from .operators import buscar_operacion
 from .environment import Environment
+from . import vector_ops
+from .loader import cargar_numeros
+from .rope import Cuerda
+from .output import SalidaNahual
+from .input import EntradaNahual
+from .files import GestorPergaminos, Pergamino
+from .parallel import RepartidorParalelo
+from .limits import Limites, Medidor
+from .stats import Estadisticas
 from .error_handler import (
     ErrorNahual, ErrorSemantico, ErrorTipos, ErrorEjecucion,
-    Ubicacion, MarcoEjecucion, decorar_manejo_errores, ManejadorErrores
+    Ubicacion, MarcoEjecucion, decorar_manejo_errores, ManejadorErrores,
+    _reportar, _registrar
 )
 
 
+def str_o_cuerda(valor: Valor):
+    """Retorna el valor como mantra, conservando las cuerdas sin aplanarlas."""
+    if isinstance(valor.valor, (str, Cuerda)):
+        return valor.valor
+    return str(valor.valor)
+
+
+class Retorno(Exception):
+    """Señal interna con la que `retornar` sale de una sabiduría llevando su valor."""
+
+    def __init__(self, valor: Optional[Valor]):
+        super().__init__()
+        self.valor = valor
+
+
 class NahualInterpreter:
     """Intérprete principal para NahualScript."""
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, salida: Optional[Any] = None, entrada: Optional[Any] = None,
+                 pergaminos: Optional[GestorPergaminos] = None, procesos: Optional[int] = None,
+                 parser: Optional[Any] = None, limites: Optional[Limites] = None,
+                 entorno: Optional[Environment] = None, estadisticas: bool = False):
+        """
+        Args:
+            debug: Muestra información detallada de la ejecución
+            salida: SalidaNahual o sumidero con write() donde escribe `invocar`;
+                por defecto sys.stdout
+            entrada: EntradaNahual o fuente con read()/readline() de donde lee
+                `percibir`; por defecto sys.stdin
+            pergaminos: GestorPergaminos con el aislamiento del acceso a archivos;
+                por defecto se permite leer y escribir en cualquier ruta
+            procesos: Procesos trabajadores de `mapear_paralelo`; por defecto
+                uno por núcleo
+            parser: NahualParser ya construido para reutilizar sus tablas; por
+                defecto se construye uno en el primer run()
+            limites: Límites de instrucciones, profundidad, tiempo y tamaños que
+                se aplican a cada run(); por defecto, ninguno
+            entorno: Environment que se usa como entorno global, por ejemplo el
+                de una ejecución anterior; sus funciones nativas se reemplazan
+                por las de este intérprete. Por defecto, uno vacío
+            estadisticas: Cuenta nodos evaluados, Valores y entornos creados,
+                búsquedas de variables, llamadas y crecimiento de ofrendas en
+                self.estadisticas, acumulando entre ejecuciones. Sin ella las
+                ejecuciones no pagan nada por los contadores
+        """
         self.debug = debug
-        self.entorno_global = Environment()
+        self.salida = salida if isinstance(salida, SalidaNahual) else SalidaNahual(salida)
+        self.entrada = entrada if isinstance(entrada, EntradaNahual) else EntradaNahual(entrada)
+        if self.entrada.salida is None:
+            self.entrada.salida = self.salida
+        self.pergaminos = pergaminos if pergaminos is not None else GestorPergaminos()
+        self.paralelo = RepartidorParalelo(procesos)
+        self.programa = None  # AST del programa en ejecución, para preparar los trabajadores
+        self.parser = parser
+        self.medidor = Medidor(limites)
+        self.entorno_global = entorno if entorno is not None else Environment()
         self.entorno_actual = self.entorno_global
         self.manejador_errores = ManejadorErrores()
+        self.estadisticas = Estadisticas() if estadisticas else None
         self._inicializar_funciones_base()
 
     def _inicializar_funciones_base(self):
@@ -24,13 +87,12 @@ class NahualInterpreter:
 
         def invocar(*args) -> None:
             """Función para imprimir valores."""
-            print(*[str(arg.valor) for arg in args])
+            self.salida.escribir_linea(*args)
 
         def percibir(mensaje: str = "") -> Valor:
             """Función para recibir entrada del usuario."""
             try:
-                valor = input(mensaje)
-                return Valor(TipoNahual.MANTRA, valor)
+                return Valor(TipoNahual.MANTRA, self.entrada.leer_linea(str(mensaje)))
             except Exception as e:
                 raise ErrorEjecucion(
                     "Error al leer entrada",
@@ -52,18 +114,154 @@ class NahualInterpreter:
                 raise ErrorSemantico(f"Tipo desconocido: {tipo_destino}")
 
         def longitud(coleccion: Valor) -> Valor:
-            """Calcula la longitud de una colección (lista o cadena)."""
-            if coleccion.tipo == TipoNahual.LISTA:
-                return Valor(TipoNahual.ESPIRITU, len(coleccion.valor))
+            """Calcula la longitud de una colección (lista, mapa o cadena)."""
+            if coleccion.tipo in {TipoNahual.LISTA, TipoNahual.MAPA}:
+                return Valor(TipoNahual.ESPIRITU, coleccion.valor.longitud())
             elif coleccion.tipo == TipoNahual.MANTRA:
                 return Valor(TipoNahual.ESPIRITU, len(coleccion.valor))
             raise TipoError(f"Tipo {coleccion.tipo} no soporta longitud")
 
+        def _lista(valor: Valor) -> Lista:
+            if valor.tipo != TipoNahual.LISTA:
+                raise TipoError(f"Se esperaba una ofrenda, se recibió {valor.tipo.value}")
+            return valor.valor
+
+        def agregar(lista: Valor, valor: Valor) -> Valor:
+            """Agrega un valor al final de una ofrenda."""
+            lista = _lista(lista)
+            lista.agregar(valor)
+            self.medidor.verificar_ofrenda(lista.longitud())
+            return Valor(TipoNahual.VERDAD, True)
+
+        def rebanar(lista: Valor, inicio: Valor, fin: Optional[Valor] = None) -> Valor:
+            """Retorna una vista de la ofrenda entre inicio (incluido) y fin (excluido)."""
+            return Valor(TipoNahual.LISTA, _lista(lista).rebanar(
+                inicio.valor, fin.valor if fin is not None else None))
+
+        def _mapa(valor: Valor) -> Mapa:
+            if valor.tipo != TipoNahual.MAPA:
+                raise TipoError(f"Se esperaba un mapa, se recibió {valor.tipo.value}")
+            return valor.valor
+
+        def poner(mapa: Valor, clave: Valor, valor: Valor) -> Valor:
+            """Guarda un valor en el mapa bajo la clave indicada."""
+            _mapa(mapa).poner(clave, valor)
+            return Valor(TipoNahual.VERDAD, True)
+
+        def obtener(mapa: Valor, clave: Valor) -> Valor:
+            """Obtiene el valor guardado bajo una clave."""
+            return _mapa(mapa).obtener(clave)
+
+        def contiene(mapa: Valor, clave: Valor) -> Valor:
+            """Indica si el mapa contiene la clave."""
+            return Valor(TipoNahual.VERDAD, _mapa(mapa).contiene(clave))
+
+        def quitar(mapa: Valor, clave: Valor) -> Valor:
+            """Elimina una clave del mapa y retorna su valor."""
+            return _mapa(mapa).quitar(clave)
+
+        def claves(mapa: Valor) -> Valor:
+            """Retorna las claves del mapa como ofrenda, en orden de inserción."""
+            mapa = _mapa(mapa)
+            return Valor(TipoNahual.LISTA, Lista(list(mapa.claves()), mapa.tipo_claves))
+
+        def valores(mapa: Valor) -> Valor:
+            """Retorna los valores del mapa como ofrenda, en orden de inserción."""
+            mapa = _mapa(mapa)
+            return Valor(TipoNahual.LISTA, Lista(list(mapa.entradas.values()), mapa.tipo_valores))
+
+        def _cargador(tipo: TipoNahual):
+            def cargar(ruta: Valor, separador: Optional[Valor] = None,
+                       columna: Optional[Valor] = None) -> Valor:
+                """Carga un archivo de números (o '-' para la entrada estándar) en una ofrenda tipada."""
+                ruta = str(ruta.valor)
+                # Se lee el descriptor que abrió el gestor, no la ruta de nuevo
+                descriptor = self.pergaminos.abrir_descriptor(ruta) if ruta != '-' else None
+                lista = cargar_numeros(
+                    ruta, tipo,
+                    separador=str(separador.valor) if separador is not None else None,
+                    columna=columna.valor if columna is not None else None,
+                    entrada=self.entrada, descriptor=descriptor)
+                self.medidor.verificar_ofrenda(lista.longitud())
+                return Valor(TipoNahual.LISTA, lista)
+            return cargar
+
+        def _pergamino(valor: Valor) -> Pergamino:
+            if valor.tipo != TipoNahual.PERGAMINO:
+                raise TipoError(f"Se esperaba un pergamino, se recibió {valor.tipo.value}")
+            return valor.valor
+
+        def abrir_pergamino(ruta: Valor, modo: Optional[Valor] = None) -> Valor:
+            """Abre un archivo para leer, escribir o anexar (por defecto, leer)."""
+            modo = str(modo.valor) if modo is not None else 'leer'
+            return Valor(TipoNahual.PERGAMINO, self.pergaminos.abrir(str(ruta.valor), modo))
+
+        def leer_linea(pergamino: Valor) -> Valor:
+            """Lee la siguiente línea de un pergamino."""
+            return Valor(TipoNahual.MANTRA, _pergamino(pergamino).leer_linea())
+
+        def fin_pergamino(pergamino: Valor) -> Valor:
+            """Indica si ya se leyeron todas las líneas de un pergamino."""
+            return Valor(TipoNahual.VERDAD, _pergamino(pergamino).al_final())
+
+        def escribir(pergamino: Valor, *valores: Valor) -> Valor:
+            """Escribe los valores en el pergamino, sin separadores ni salto de línea."""
+            _pergamino(pergamino).escribir(''.join(map(str, valores)))
+            return Valor(TipoNahual.VERDAD, True)
+
+        def escribir_linea(pergamino: Valor, *valores: Valor) -> Valor:
+            """Escribe los valores separados por espacios y un salto de línea, como invocar."""
+            _pergamino(pergamino).escribir(' '.join(map(str, valores)) + '\n')
+            return Valor(TipoNahual.VERDAD, True)
+
+        def cerrar_pergamino(pergamino: Valor) -> Valor:
+            """Vacía y cierra un pergamino."""
+            self.pergaminos.cerrar(_pergamino(pergamino))
+            return Valor(TipoNahual.VERDAD, True)
+
+        def mapear_paralelo(nombre: Valor, lista: Valor) -> Valor:
+            """Aplica la sabiduría nombrada a cada elemento de la ofrenda, repartiendo entre procesos."""
+            if nombre.tipo != TipoNahual.MANTRA:
+                raise TipoError(f"Se esperaba el nombre de una sabiduría, se recibió {nombre.tipo.value}")
+            funcion = self.entorno_global.obtener_funcion(str(nombre.valor))
+            if callable(funcion):
+                raise TipoError("mapear_paralelo requiere una sabiduría definida en el programa")
+            return Valor(TipoNahual.LISTA, self.paralelo.mapear(self, self.programa, str(nombre.valor), _lista(lista)))
+
         # Registrar funciones nativas en el entorno global
         self._registrar_funcion_nativa("invocar", invocar)
         self._registrar_funcion_nativa("percibir", percibir)
         self._registrar_funcion_nativa("convertir", convertir)
         self._registrar_funcion_nativa("longitud", longitud)
+        self._registrar_funcion_nativa("agregar", agregar)
+        self._registrar_funcion_nativa("rebanar", rebanar)
+        self._registrar_funcion_nativa("poner", poner)
+        self._registrar_funcion_nativa("obtener", obtener)
+        self._registrar_funcion_nativa("contiene", contiene)
+        self._registrar_funcion_nativa("quitar", quitar)
+        self._registrar_funcion_nativa("claves", claves)
+        self._registrar_funcion_nativa("valores", valores)
+
+        # Reducciones sobre ofrendas numéricas, ejecutadas en una sola llamada
+        self._registrar_funcion_nativa("sumar", vector_ops.sumar)
+        self._registrar_funcion_nativa("minimo", vector_ops.minimo)
+        self._registrar_funcion_nativa("maximo", vector_ops.maximo)
+        self._registrar_funcion_nativa("promedio", vector_ops.promedio)
+
+        # Carga masiva de datos numéricos en ofrendas compactas
+        self._registrar_funcion_nativa("cargar_espiritus", _cargador(TipoNahual.ESPIRITU))
+        self._registrar_funcion_nativa("cargar_energias", _cargador(TipoNahual.ENERGIA))
+
+        # Pergaminos (archivos), sujetos al aislamiento de self.pergaminos
+        self._registrar_funcion_nativa("abrir_pergamino", abrir_pergamino)
+        self._registrar_funcion_nativa("leer_linea", leer_linea)
+        self._registrar_funcion_nativa("fin_pergamino", fin_pergamino)
+        self._registrar_funcion_nativa("escribir", escribir)
+        self._registrar_funcion_nativa("escribir_linea", escribir_linea)
+        self._registrar_funcion_nativa("cerrar_pergamino", cerrar_pergamino)
+
+        # Paralelismo entre procesos
+        self._registrar_funcion_nativa("mapear_paralelo", mapear_paralelo)
 
     def _registrar_funcion_nativa(self, nombre: str, funcion: Any) -> None:
         """Registra una función nativa en el entorno global."""
@@ -96,40 +294,93 @@ class NahualInterpreter:
             resultado = self.ejecutar(declaracion)
         return resultado
 
+    ejecutar_programa_verificado = ejecutar_programa
+
     @decorar_manejo_errores
     def ejecutar_var_declaracion(self, tipo: str, nombre: str, valor: Any, ubicacion: Optional[dict] = None) -> None:
         """Ejecuta una declaración de variable."""
         if isinstance(valor, str) and valor == 'percibir':
             try:
-                entrada = input()
-                if tipo == 'energia':
-                    valor_ejecutado = Valor(TipoNahual.ENERGIA, float(entrada))
-                elif tipo == 'espiritu':
-                    valor_ejecutado = Valor(TipoNahual.ESPIRITU, int(entrada))
-                else:
-                    valor_ejecutado = Valor(TipoNahual.MANTRA, entrada)
+                valor_ejecutado = self.entrada.leer_valor(TipoNahual(tipo))
             except ValueError:
                 raise ErrorTipos(
                     f"No se puede convertir la entrada a {tipo}",
                     tipo_esperado=tipo,
                     tipo_recibido="entrada inválida"
                 )
+            except EOFError as e:
+                raise ErrorEjecucion(str(e), sugerencia="Verifica que la entrada tenga suficientes líneas")
         else:
             valor_ejecutado = self.ejecutar(valor)
             if not valor_ejecutado:
                 return None
 
         try:
-            tipo_nahual = TipoNahual(tipo)
+            tipo_base = tipo[0] if isinstance(tipo, tuple) else tipo
+            tipo_nahual = TipoNahual(tipo_base)
             if not valor_ejecutado.es_compatible_con(Valor(tipo_nahual, None)):
                 raise ErrorTipos(
                     f"Tipo incompatible en asignación a '{nombre}'",
-                    tipo_esperado=tipo,
+                    tipo_esperado=tipo_base,
                     tipo_recibido=valor_ejecutado.tipo.value
                 )
+            if isinstance(tipo, tuple):
+                self._tipar_mapa(valor_ejecutado, tipo)
             self.entorno_actual.definir_variable(nombre, valor_ejecutado)
         except ValueError:
             raise ErrorSemantico(f"Tipo desconocido: {tipo}")
+
+    @decorar_manejo_errores
+    def ejecutar_var_declaracion_verificada(self, tipo: str, nombre: str, valor: Any,
+                                            ubicacion: Optional[dict] = None) -> None:
+        """Declaración cuyo tipo ya probó el análisis estático."""
+        valor_ejecutado = self.ejecutar(valor)
+        if valor_ejecutado is not None:
+            self.entorno_actual.definir_variable(nombre, valor_ejecutado)
+
+    def _tipar_mapa(self, valor: Valor, tipo: tuple) -> None:
+        """
+        Verifica un mapa declarado como mapa[claves, valores] y fija sus tipos.
+
+        Los tipos se fijan en el Mapa mismo, no en la variable: si el mapa ya
+        estaba en otra variable, también ella queda tipada, como la ofrenda que
+        comparten. Un mapa que ya tiene otros tipos no puede redeclararse.
+        """
+        mapa = valor.valor
+        tipo_claves, tipo_valores = TipoNahual(tipo[1]), TipoNahual(tipo[2])
+        if mapa.tipo_claves is not None and (mapa.tipo_claves, mapa.tipo_valores) != (tipo_claves, tipo_valores):
+            raise ErrorTipos(
+                "El mapa ya está tipado con otros tipos",
+                tipo_esperado=f"mapa[{tipo_claves.value}, {tipo_valores.value}]",
+                tipo_recibido=f"mapa[{mapa.tipo_claves.value}, {mapa.tipo_valores.value}]"
+            )
+        VerificadorTipos.verificar_mapa(mapa, tipo_claves, tipo_valores)
+        mapa.tipo_claves = tipo_claves
+        mapa.tipo_valores = tipo_valores
+
+    @decorar_manejo_errores
+    def ejecutar_asignacion(self, nombre: str, valor: Any, ubicacion: Optional[dict] = None) -> None:
+        """Ejecuta la reasignación de una variable ya declarada."""
+        valor_ejecutado = self.ejecutar(valor)
+        if valor_ejecutado is None:
+            return None
+
+        actual = self.entorno_actual.obtener_variable(nombre)
+        if not valor_ejecutado.es_compatible_con(actual):
+            raise ErrorTipos(
+                f"Tipo incompatible en asignación a '{nombre}'",
+                tipo_esperado=actual.tipo.value,
+                tipo_recibido=valor_ejecutado.tipo.value
+            )
+        self.entorno_actual.asignar_variable(nombre, valor_ejecutado)
+
+    @decorar_manejo_errores
+    def ejecutar_asignacion_verificada(self, nombre: str, valor: Any, ubicacion: Optional[dict] = None) -> None:
+        """Reasignación cuyo tipo ya probó el análisis estático."""
+        valor_ejecutado = self.ejecutar(valor)
+        if valor_ejecutado is not None:
+            self.entorno_actual.asignar_variable(nombre, valor_ejecutado)
+
     @decorar_manejo_errores
     def ejecutar_funcion_declaracion(self, nombre: str, parametros: List[tuple], cuerpo: Any,
                                      ubicacion: Optional[dict]) -> None:
@@ -143,36 +394,94 @@ class NahualInterpreter:
         self.entorno_actual.definir_funcion(nombre, funcion)
 
     @decorar_manejo_errores
-    def ejecutar_llamada_funcion(self, nombre: str, argumentos: List[Any], ubicacion: Optional[dict] = None) -> \
-    Optional[Valor]:
+    def ejecutar_llamada_funcion(self, nombre: str, argumentos: List[Any], ubicacion: Optional[dict] = None,
+                                 firma: Optional[list] = None) -> Optional[Valor]:
         """
         Executes a function call by resolving its name and evaluating arguments.
         """
         try:
-            funcion = self.entorno_actual.obtener_funcion(nombre)
             args_evaluados = [self.ejecutar(arg) for arg in argumentos]
 
             if None in args_evaluados:
                 return None
 
-            nuevo_entorno = Environment(funcion['entorno'])
-            for (tipo, param_nombre), arg in zip(funcion['parametros'], args_evaluados):
-                if not arg.es_compatible_con(Valor(TipoNahual(tipo), None)):
-                    raise ErrorTipos(
-                        f"Argumento inválido para parámetro '{param_nombre}'",
-                        tipo_esperado=tipo,
-                        tipo_recibido=arg.tipo.value
-                    )
-                nuevo_entorno.definir_variable(param_nombre, arg)
-
-            return self.ejecutar_con_entorno(funcion['cuerpo'], nuevo_entorno)
+            return self.llamar_funcion(nombre, args_evaluados, firma, ubicacion)
         except KeyError:
             raise ErrorSemantico(f"Función no definida: {nombre}")
+        except ErrorNahual:
+            # Ya trae su ubicación y la pila de llamadas; envolverlo las ocultaría
+            raise
+        except Exception as e:
+            raise ErrorEjecucion(
+                f"Error al ejecutar la función '{nombre}': {str(e)}",
+                ubicacion,
+                sugerencia="Revisa la definición de la función y los argumentos proporcionados"
+            )
+
+    def ejecutar_llamada_funcion_verificada(self, nombre: str, argumentos: List[Any], firma: list,
+                                           ubicacion: Optional[dict] = None) -> Optional[Valor]:
+        """Llamada cuyos argumentos ya probó el análisis estático para la sabiduría de `firma`."""
+        return self.ejecutar_llamada_funcion(nombre, argumentos, ubicacion, firma)
+
+    def llamar_funcion(self, nombre: str, argumentos: List[Valor], firma: Optional[list] = None,
+                       ubicacion: Optional[dict] = None) -> Optional[Valor]:
+        """
+        Llama a una función nativa o sabiduría con argumentos ya evaluados. Si
+        la sabiduría resuelta tiene los parámetros `firma`, los argumentos ya
+        se verificaron estáticamente y no se revisan de nuevo. Las sabidurías
+        se apilan en manejador_errores.pila con la `ubicacion` de la llamada.
+        """
+        funcion = self.entorno_actual.obtener_funcion(nombre)
+        if callable(funcion):
+            return funcion(*argumentos)
+
+        nuevo_entorno = Environment(funcion['entorno'])
+        if funcion['parametros'] is firma:
+            nuevo_entorno.variables.update(zip((param_nombre for _, param_nombre in firma), argumentos))
+        else:
+            self._ligar_parametros(nuevo_entorno, funcion['parametros'], argumentos)
+
+        self.medidor.entrar()
+        pila = self.manejador_errores.pila
+        pila.entrar(nombre, ubicacion, nuevo_entorno)
+        try:
+            return self.ejecutar_con_entorno(funcion['cuerpo'], nuevo_entorno)
+        except Retorno as retorno:
+            return retorno.valor
+        except ErrorNahual as e:
+            if not e.pila:
+                e.pila = pila.capturar()
+            raise
         except Exception as e:
             raise ErrorEjecucion(
                 f"Error al ejecutar la función '{nombre}': {str(e)}",
+                pila=pila.capturar(),
                 sugerencia="Revisa la definición de la función y los argumentos proporcionados"
             )
+        finally:
+            self.medidor.salir()
+            pila.salir()
+
+    def _ligar_parametros(self, entorno: Environment, parametros: List[tuple], argumentos: List[Valor]) -> None:
+        """Verifica los argumentos contra los tipos de los parámetros y los liga en el entorno."""
+        for (tipo, param_nombre), arg in zip(parametros, argumentos):
+            tipo_base = tipo[0] if isinstance(tipo, tuple) else tipo
+            if not arg.es_compatible_con(Valor(TipoNahual(tipo_base), None)):
+                raise ErrorTipos(
+                    f"Argumento inválido para parámetro '{param_nombre}'",
+                    tipo_esperado=tipo_base,
+                    tipo_recibido=arg.tipo.value
+                )
+            if isinstance(tipo, tuple):
+                mapa = arg.valor
+                # Un mapa tipado igual que el parámetro no se recorre en cada llamada
+                if mapa.tipo_claves is None or (mapa.tipo_claves.value, mapa.tipo_valores.value) != tipo[1:]:
+                    VerificadorTipos.verificar_mapa(mapa, TipoNahual(tipo[1]), TipoNahual(tipo[2]))
+            entorno.definir_variable(param_nombre, arg)
+
+    def ejecutar_retorno(self, expresion: Any, ubicacion: Optional[dict] = None) -> None:
+        """Ejecuta `retornar expresion;` saliendo de la sabiduría en curso."""
+        raise Retorno(self.ejecutar(expresion))
 
     def ejecutar_operacion(self, op: str, izq: Any, der: Any, ubicacion: Optional[dict] = None) -> Optional[Valor]:
         """Ejecuta una operación binaria."""
@@ -185,65 +494,35 @@ class NahualInterpreter:
             return None
 
         try:
-            # Operaciones numéricas
-            if op == 'unir':
-                # Solo para números
-                if val_izq.tipo in {TipoNahual.ESPIRITU, TipoNahual.ENERGIA} and val_der.tipo in {TipoNahual.ESPIRITU,
-                                                                                                  TipoNahual.ENERGIA}:
-                    resultado = val_izq.valor + val_der.valor
-                    tipo_resultado = TipoNahual.ENERGIA if TipoNahual.ENERGIA in {val_izq.tipo,
-                                                                                  val_der.tipo} else TipoNahual.ESPIRITU
-                    return Valor(tipo_resultado, resultado)
-                raise TipoError(f"Operación unir solo admite valores numéricos (ESPIRITU o ENERGIA)")
-
-            # Otras operaciones
-            elif op == 'separar':
-                resultado = val_izq.valor - val_der.valor
-                tipo_resultado = TipoNahual.ENERGIA if TipoNahual.ENERGIA in {val_izq.tipo,
-                                                                              val_der.tipo} else TipoNahual.ESPIRITU
-                return Valor(tipo_resultado, resultado)
-            elif op == 'multiplicar':
-                resultado = val_izq.valor * val_der.valor
-                tipo_resultado = TipoNahual.ENERGIA if TipoNahual.ENERGIA in {val_izq.tipo,
-                                                                              val_der.tipo} else TipoNahual.ESPIRITU
-                return Valor(tipo_resultado, resultado)
-            elif op == 'dividir':
-                if val_der.valor == 0:
-                    raise ErrorEjecucion("División por cero")
-                resultado = val_izq.valor / val_der.valor
-                tipo_resultado = TipoNahual.ENERGIA
-                return Valor(tipo_resultado, resultado)
-            elif op == 'residuo':
-                resultado = val_izq.valor % val_der.valor
-                tipo_resultado = TipoNahual.ESPIRITU
-                return Valor(tipo_resultado, resultado)
-
-            # Operaciones de comparación
-            elif op in ['mayor', 'menor', 'igual']:
-                if not val_izq.es_compatible_con(val_der):
-                    raise TipoError(f"No se pueden comparar valores de tipo {val_izq.tipo} y {val_der.tipo}")
-
-                if op == 'mayor':
-                    resultado = val_izq.valor > val_der.valor
-                elif op == 'menor':
-                    resultado = val_izq.valor < val_der.valor
-                else:  # igual
-                    resultado = val_izq.valor == val_der.valor
-
-                return Valor(TipoNahual.VERDAD, resultado)
-
-            raise ValueError(f"Operador no soportado: {op}")
+            # Operaciones elemento a elemento sobre ofrendas
+            if TipoNahual.LISTA in (val_izq.tipo, val_der.tipo):
+                return vector_ops.operar_elemento_a_elemento(op, val_izq, val_der)
+
+            resultado = self._aplicar_operacion(op, val_izq, val_der)
+            if resultado.tipo == TipoNahual.MANTRA:
+                self.medidor.verificar_mantra(len(resultado.valor))
+            return resultado
 
         except Exception as e:
+            if getattr(e, 'fatal', False):
+                raise
             raise ErrorEjecucion(f"Error en operación {op}: {str(e)}", ubicacion)
 
-    def ejecutar_ritual(self, condicion: Any, cuerpo: Any, ubicacion: Optional[dict] = None) -> None:
+    def ejecutar_ritual(self, condicion: Any, cuerpo: Any, ubicacion: Optional[dict] = None,
+                        verificada: bool = False) -> None:
         """
-        Ejecuta un ciclo `ritual` (equivalente a un `mientras`).
+        Ejecuta un ciclo `ritual` (equivalente a un `mientras`). Con `verificada`,
+        el análisis estático ya probó que la condición es una verdad.
         """
+        medidor = self.medidor
+        costo = len(cuerpo[1]) + 1
         while True:
             cond_valor = self.ejecutar(condicion)
-            if not isinstance(cond_valor, Valor) or cond_valor.tipo != TipoNahual.VERDAD:
+            if verificada:
+                # Sólo falta descartar un error ya reportado dentro de la condición
+                if cond_valor is None:
+                    raise TipoError("La condición debe ser una verdad")
+            elif not isinstance(cond_valor, Valor) or cond_valor.tipo != TipoNahual.VERDAD:
                 raise TipoError("La condición debe ser una verdad")
 
             if not cond_valor.valor:
@@ -251,15 +530,73 @@ class NahualInterpreter:
 
             self.ejecutar(cuerpo)
 
-    def ejecutar_vision(self, condicion: Any, verdadero: Any, falso: Any, ubicacion: Optional[dict] = None) -> Optional[
-        Valor]:
+            # Punto de retorno del ciclo: aquí se mide el consumo
+            medidor.instrucciones += costo
+            if medidor.instrucciones > medidor.proxima_revision:
+                medidor.revisar()
+
+    def ejecutar_ritual_verificado(self, condicion: Any, cuerpo: Any, ubicacion: Optional[dict] = None) -> None:
+        self.ejecutar_ritual(condicion, cuerpo, ubicacion, verificada=True)
+
+    def ejecutar_para_cada(self, nombre: str, iterable: Any, cuerpo: Any, ubicacion: Optional[dict] = None) -> None:
+        """
+        Ejecuta un ciclo `para cada x en coleccion` sobre una ofrenda, las claves
+        de un mapa, los caracteres de un mantra o las líneas de un pergamino.
+        """
+        coleccion = self.ejecutar(iterable)
+        if coleccion is None:
+            return None
+
+        if coleccion.tipo == TipoNahual.LISTA:
+            elementos = iter(coleccion.valor)
+        elif coleccion.tipo == TipoNahual.MAPA:
+            elementos = coleccion.valor.claves()
+        elif coleccion.tipo == TipoNahual.MANTRA:
+            elementos = (Valor(TipoNahual.MANTRA, c) for c in str(coleccion.valor))
+        elif coleccion.tipo == TipoNahual.PERGAMINO:
+            elementos = coleccion.valor.lineas()
+        else:
+            raise TipoError(f"No se puede recorrer un valor de tipo {coleccion.tipo.value}")
+
+        self._repetir(nombre, elementos, cuerpo)
+
+    def ejecutar_para_rango(self, nombre: str, inicio: Any, fin: Any, cuerpo: Any,
+                            ubicacion: Optional[dict] = None) -> None:
+        """Ejecuta un ciclo `para i desde a hasta b`, con b excluido."""
+        valor_inicio = self.ejecutar(inicio)
+        valor_fin = self.ejecutar(fin)
+        if valor_inicio is None or valor_fin is None:
+            return None
+        if valor_inicio.tipo != TipoNahual.ESPIRITU or valor_fin.tipo != TipoNahual.ESPIRITU:
+            raise TipoError("Los límites de un ciclo para deben ser espiritus (enteros)")
+
+        numeros = range(valor_inicio.valor, valor_fin.valor)
+        self._repetir(nombre, (Valor(TipoNahual.ESPIRITU, n) for n in numeros), cuerpo)
+
+    def _repetir(self, nombre: str, elementos: Any, cuerpo: Any) -> None:
+        """Liga cada elemento a la variable del ciclo y ejecuta el cuerpo."""
+        variables = self.entorno_actual.variables
+        declaraciones = cuerpo[1]
+        ejecutar = self.ejecutar
+        medidor = self.medidor
+        costo = len(declaraciones) + 1
+        for elemento in elementos:
+            variables[nombre] = elemento
+            for declaracion in declaraciones:
+                ejecutar(declaracion)
+            medidor.instrucciones += costo
+            if medidor.instrucciones > medidor.proxima_revision:
+                medidor.revisar()
+
+    def ejecutar_vision(self, condicion: Any, verdadero: Any, falso: Any, ubicacion: Optional[dict] = None,
+                        verificada: bool = False) -> Optional[Valor]:
         """Ejecuta una declaración vision (if-else)."""
         try:
             cond_valor = self.ejecutar(condicion)
             if cond_valor is None:
                 return None
 
-            if cond_valor.tipo != TipoNahual.VERDAD:
+            if not verificada and cond_valor.tipo != TipoNahual.VERDAD:
                 raise TipoError("La condición debe ser una verdad")
 
             if cond_valor.valor:
@@ -267,58 +604,30 @@ class NahualInterpreter:
             elif falso:
                 return self.ejecutar(falso)
             return None
+        except Retorno:
+            raise
         except Exception as e:
+            if getattr(e, 'fatal', False):
+                raise
             raise ErrorEjecucion(f"Error en evaluación de visión: {str(e)}", ubicacion)
 
+    def ejecutar_vision_verificada(self, condicion: Any, verdadero: Any, falso: Any,
+                                   ubicacion: Optional[dict] = None) -> Optional[Valor]:
+        return self.ejecutar_vision(condicion, verdadero, falso, ubicacion, verificada=True)
+
     def convertir_a_tipo(self, valor: Valor, tipo_destino: TipoNahual) -> Valor:
         """Convierte un valor al tipo especificado."""
-        try:
-            if tipo_destino == TipoNahual.ENERGIA:
-                return Valor(TipoNahual.ENERGIA, float(valor.valor))
-            elif tipo_destino == TipoNahual.ESPIRITU:
-                return Valor(TipoNahual.ESPIRITU, int(float(valor.valor)))
-            elif tipo_destino == TipoNahual.MANTRA:
-                return Valor(TipoNahual.MANTRA, str(valor.valor))
-            elif tipo_destino == TipoNahual.VERDAD:
-                return Valor(TipoNahual.VERDAD, bool(valor.valor))
-            raise TipoError(f"No se puede convertir a tipo {tipo_destino}")
-        except Exception as e:
-            raise TipoError(f"Error en conversión: {str(e)}")
-
-    def _aplicar_operacion(self, op: str, izq: Valor, der: Valor) -> Optional[Valor]:
-        """Aplica una operación binaria a dos valores."""
-        operaciones = {
-            'unir': lambda x, y: x.valor + y.valor,
-            'separar': lambda x, y: x.valor - y.valor,
-            'multiplicar': lambda x, y: x.valor * y.valor,
-            'dividir': lambda x, y: x.valor / y.valor,
-            'residuo': lambda x, y: x.valor % y.valor,
-            'igual': lambda x, y: x.valor == y.valor,
-            'mayor': lambda x, y: x.valor > y.valor,
-            'menor': lambda x, y: x.valor < y.valor,
-        }
-
-        if op not in operaciones:
-            raise ValueError(f"Operador no soportado: {op}")
-
-        # Verificar compatibilidad de tipos
-        if not izq.es_compatible_con(der):
-            raise ErrorTipos(
-                "Tipos incompatibles en operación",
-                tipo_esperado=izq.tipo.value,
-                tipo_recibido=der.tipo.value
-            )
+        return valor.convertir_a(tipo_destino)
 
+    def _aplicar_operacion(self, op: str, izq: Valor, der: Valor) -> Valor:
+        """Aplica una operación binaria entre dos valores que no son ofrendas."""
+        operacion = buscar_operacion(op, izq.tipo, der.tipo)
+        if operacion is None:
+            raise VerificadorTipos.error_operacion(op, izq, der)
         try:
-            resultado = operaciones[op](izq, der)
-            # Determinar el tipo de retorno
-            if op in {'igual', 'mayor', 'menor'}:
-                return Valor(TipoNahual.VERDAD, resultado)
-            return Valor(izq.tipo, resultado)
+            return Valor(operacion.resultado, operacion.aplicar(izq.valor, der.valor))
         except ZeroDivisionError:
             raise ErrorEjecucion("División por cero")
-        except Exception as e:
-            raise ErrorEjecucion(f"Error en operación {op}: {str(e)}")
 
     def ejecutar_con_entorno(self, nodo: Any, entorno: Environment) -> Optional[Valor]:
         """Ejecuta un nodo en un entorno específico."""
@@ -331,17 +640,62 @@ class NahualInterpreter:
 
     @decorar_manejo_errores
     def run(self, source: str) -> None:
+        self._correr(source=source)
+
+    @decorar_manejo_errores
+    def run_arbol(self, nodos: Any) -> None:
+        """Ejecuta un programa ya parseado, como run() pero sin volver a parsear."""
+        self._correr(nodos=nodos)
+
+    def _correr(self, source: Optional[str] = None, nodos: Any = None) -> None:
         try:
-            from .parser import NahualParser
-            parser = NahualParser(self.debug)
-            nodos = parser.parse(source)
+            if nodos is None:
+                if self.parser is None:
+                    from .parser import NahualParser
+                    self.parser = NahualParser(self.debug)
+                nodos = self.parser.parse(source)
+            if nodos and nodos[0] == 'programa':
+                nodos, errores = verificar_programa(nodos)
+                if errores:
+                    # Todos los errores de tipos se reportan antes de ejecutar
+                    for error in errores:
+                        _reportar(self, str(error))
+                        _registrar(self, error)
+                    return
+            self.medidor.reiniciar()
             if nodos:
-                self.ejecutar_programa(nodos)
+                self.programa = nodos
+                if self.estadisticas is None:
+                    self.ejecutar_programa(nodos)
+                else:
+                    self.estadisticas.instalar(self)
+                    try:
+                        self.ejecutar_programa(nodos)
+                    finally:
+                        self.estadisticas.desinstalar()
         except Exception as e:
+            if getattr(e, 'fatal', False):
+                # Límites excedidos o depuración terminada: llegan a quien llamó a run()
+                raise
             raise ErrorEjecucion(
                 f"Error al ejecutar el programa: {str(e)}",
                 sugerencia="Verifica que el código fuente sea válido"
             )
+        finally:
+            # Los pergaminos que el programa dejó abiertos se vacían y cierran al terminar
+            self.pergaminos.cerrar_todos()
+            self.paralelo.cerrar()
+            self.salida.vaciar()
+
+    def guardar_instantanea(self, ruta: str) -> None:
+        """Guarda las variables y sabidurías globales para restaurarlas en otro intérprete."""
+        from .snapshot import guardar_instantanea
+        guardar_instantanea(self, ruta)
+
+    def restaurar_instantanea(self, ruta: str) -> None:
+        """Restaura el entorno global guardado con guardar_instantanea()."""
+        from .snapshot import restaurar_instantanea
+        restaurar_instantanea(self, ruta)
 
     def _rastrear_ubicacion(self, nodo: Any):
         """Contexto para rastrear la ubicación actual en el código."""
@@ -371,17 +725,104 @@ class NahualInterpreter:
                 # Pass the location to handle debugging correctly
                 return self.ejecutar_llamada_funcion(*valor[1:], ubicacion=ubicacion)
             raise ValueError(f"Tipo de literal inesperado con contenido: {valor}")
+        elif isinstance(valor, bool):  # bool es subclase de int
+            return Valor(TipoNahual.VERDAD, valor)
         elif isinstance(valor, int):
             return Valor(TipoNahual.ESPIRITU, valor)
         elif isinstance(valor, float):
             return Valor(TipoNahual.ENERGIA, valor)
         elif isinstance(valor, str):
             return Valor(TipoNahual.MANTRA, valor)
-        elif isinstance(valor, bool):
-            return Valor(TipoNahual.VERDAD, valor)
         else:
             raise ValueError(f"Tipo de literal desconocido: {type(valor)}")
 
+    def ejecutar_lista(self, elementos: List[Any], ubicacion: Optional[dict] = None) -> Optional[Valor]:
+        """Ejecuta un literal de ofrenda."""
+        valores = []
+        for elemento in elementos:
+            valor = self.ejecutar(elemento)
+            if valor is None:
+                return None
+            valores.append(valor)
+
+        self.medidor.verificar_ofrenda(len(valores))
+        tipos = {valor.tipo for valor in valores}
+        tipo_elementos = tipos.pop() if len(tipos) == 1 else None
+        return Valor(TipoNahual.LISTA, Lista(valores, tipo_elementos))
+
+    def ejecutar_mapa(self, entradas: List[tuple], ubicacion: Optional[dict] = None) -> Optional[Valor]:
+        """Ejecuta un literal de mapa."""
+        mapa = Mapa()
+        for nodo_clave, nodo_valor in entradas:
+            clave = self.ejecutar(nodo_clave)
+            valor = self.ejecutar(nodo_valor)
+            if clave is None or valor is None:
+                return None
+            mapa.poner(clave, valor)
+
+        tipos_claves = {clave.tipo for clave in mapa.claves()}
+        tipos_valores = {valor.tipo for valor in mapa.entradas.values()}
+        if len(tipos_claves) == 1 and len(tipos_valores) == 1:
+            mapa.tipo_claves = tipos_claves.pop()
+            mapa.tipo_valores = tipos_valores.pop()
+        return Valor(TipoNahual.MAPA, mapa)
+
+    def ejecutar_acceso_lista(self, coleccion: Any, indice: Any, ubicacion: Optional[dict] = None) -> Optional[Valor]:
+        """Ejecuta el acceso por índice a una ofrenda o por clave a un mapa."""
+        valor_coleccion = self.ejecutar(coleccion)
+        valor_indice = self.ejecutar(indice)
+        if valor_coleccion is None or valor_indice is None:
+            return None
+
+        try:
+            if valor_coleccion.tipo == TipoNahual.MAPA:
+                return valor_coleccion.valor.obtener(valor_indice)
+            if valor_coleccion.tipo != TipoNahual.LISTA:
+                raise TipoError(f"No se puede acceder por índice a tipo {valor_coleccion.tipo.value}")
+            if valor_indice.tipo != TipoNahual.ESPIRITU:
+                raise TipoError("El índice debe ser un espiritu (entero)")
+            return valor_coleccion.valor.obtener(valor_indice.valor)
+        except (IndexError, KeyError) as e:
+            raise ErrorEjecucion(str(e.args[0]), ubicacion)
+
+    def ejecutar_rebanada(self, lista: Any, inicio: Any, fin: Any, ubicacion: Optional[dict] = None) -> Optional[Valor]:
+        """Ejecuta una rebanada xs[inicio:fin], que comparte el almacenamiento de xs."""
+        valor_lista = self.ejecutar(lista)
+        if valor_lista is None:
+            return None
+        if valor_lista.tipo != TipoNahual.LISTA:
+            raise TipoError(f"No se puede rebanar un valor de tipo {valor_lista.tipo.value}")
+
+        limites = []
+        for limite in (inicio, fin):
+            valor_limite = self.ejecutar(limite) if limite is not None else None
+            if valor_limite is not None and valor_limite.tipo != TipoNahual.ESPIRITU:
+                raise TipoError("Los límites de una rebanada deben ser espiritus (enteros)")
+            limites.append(valor_limite.valor if valor_limite is not None else None)
+        return Valor(TipoNahual.LISTA, valor_lista.valor.rebanar(*limites))
+
+    @decorar_manejo_errores
+    def ejecutar_asignacion_indice(self, coleccion: Any, indice: Any, valor: Any,
+                                   ubicacion: Optional[dict] = None) -> None:
+        """Ejecuta una asignación xs[i] := valor sobre una ofrenda o un mapa."""
+        valor_coleccion = self.ejecutar(coleccion)
+        valor_indice = self.ejecutar(indice)
+        valor_ejecutado = self.ejecutar(valor)
+        if valor_coleccion is None or valor_indice is None or valor_ejecutado is None:
+            return None
+
+        if valor_coleccion.tipo == TipoNahual.MAPA:
+            valor_coleccion.valor.poner(valor_indice, valor_ejecutado)
+        elif valor_coleccion.tipo == TipoNahual.LISTA:
+            if valor_indice.tipo != TipoNahual.ESPIRITU:
+                raise TipoError("El índice debe ser un espiritu (entero)")
+            try:
+                valor_coleccion.valor.asignar(valor_indice.valor, valor_ejecutado)
+            except IndexError as e:
+                raise ErrorEjecucion(str(e), ubicacion)
+        else:
+            raise TipoError(f"No se puede asignar por índice a tipo {valor_coleccion.tipo.value}")
+
     def ejecutar_expresion_stmt(self, expresion, ubicacion):
         """
         Ejecuta un nodo de tipo expresion_stmt.
@@ -400,6 +841,14 @@ class NahualInterpreter:
         for declaracion in declaraciones:
             self.ejecutar(declaracion)
 
+    def ejecutar_punto_ruptura(self, declaracion: Any, ubicacion: Optional[dict] = None) -> Optional[Valor]:
+        """
+        Declaración con un punto de ruptura del depurador. El Depurador
+        reemplaza este método en la instancia; sin él (por ejemplo en los
+        procesos de mapear_paralelo) la declaración se ejecuta normalmente.
+        """
+        return self.ejecutar(declaracion)
+
     def ejecutar_llamada_sistema(self, tipo: str, argumentos: List[Any], ubicacion: Optional[dict] = None) -> Optional[
         Valor]:
         """Ejecuta una llamada al sistema como 'invocar' o 'percibir'."""
@@ -409,16 +858,17 @@ class NahualInterpreter:
                 valor = self.ejecutar(arg)
                 if valor is None:
                     return None
-                valores_evaluados.append(valor.valor)
+                valores_evaluados.append(valor)
 
             if tipo == 'invocar':
-                print(*valores_evaluados)
+                self.salida.escribir_linea(*valores_evaluados)
                 return Valor(TipoNahual.VERDAD, True)
             elif tipo == 'percibir':
                 mensaje = str(valores_evaluados[0]) if valores_evaluados else ""
-                entrada = input(mensaje)
-                return Valor(TipoNahual.MANTRA, entrada)
+                return Valor(TipoNahual.MANTRA, self.entrada.leer_linea(mensaje))
             else:
                 raise ErrorSemantico(f"Función del sistema desconocida: {tipo}")
         except Exception as e:
+            if getattr(e, 'fatal', False):
+                raise
             raise ErrorEjecucion(f"Error al ejecutar función del sistema: {str(e)}", ubicacion)
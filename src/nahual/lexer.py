@@ -22,6 +22,7 @@ class NahualLexer:
         'RBRACKET',  # ]
         'COMMA',  # ,
         'SEMICOLON',  # ;
+        'COLON',  # :
     ]
 
     reserved = {
@@ -29,6 +30,11 @@ class NahualLexer:
         'ritual': 'RITUAL',  # while
         'vision': 'VISION',  # if
         'sino': 'SINO',  # else
+        'para': 'PARA',  # for
+        'cada': 'CADA',  # each
+        'en': 'EN',  # in
+        'desde': 'DESDE',  # from
+        'hasta': 'HASTA',  # to
 
         # Definición de funciones
         'sabiduria': 'SABIDURIA',  # function
@@ -40,6 +46,8 @@ class NahualLexer:
         'mantra': 'MANTRA',  # string
         'verdad': 'VERDAD',  # bool
         'ofrenda': 'OFRENDA',  # list
+        'mapa': 'MAPA',  # dict
+        'pergamino': 'PERGAMINO',  # file
 
         # Operadores
         'unir': 'UNIR',  # +
@@ -60,7 +68,6 @@ class NahualLexer:
         'invocar': 'INVOCAR',  # print
         'percibir': 'PERCIBIR',  # input
         'convertir': 'CONVERTIR',
-        'longitud': 'LONGITUD',
 
         # Valores de verdad
         'cierto': 'CIERTO',  # true
@@ -79,6 +86,7 @@ class NahualLexer:
     t_RBRACKET = r'\]'
     t_COMMA = r','
     t_SEMICOLON = r';'
+    t_COLON = r':'
 
     # Expresiones regulares con acciones
     def t_ENERGIA_VAL(self, t):
@@ -127,7 +135,7 @@ class NahualLexer:
         error = LexError(f"Carácter místico inválido '{t.value[0]}'", pos)
         self.error_collector.append(error)
         if self.debug:
-            self.logger.error(str(error))
+            self.logger.error("%s", error)
         t.lexer.skip(1)
 
     def find_column(self, token):
@@ -142,6 +150,10 @@ class NahualLexer:
         self.lexer = lex.lex(module=self)
 
     def input(self, data):
+        # Un mismo lexer se reutiliza entre programas: la numeración de líneas
+        # y los errores empiezan de nuevo con cada entrada
+        self.lexer.lineno = 1
+        self.error_collector = []
         self.lexer.input(data)
 
     def token(self):
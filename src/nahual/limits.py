@@ -0,0 +1,151 @@
+# src/nahual/limits.py
+
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Optional
+
+from .error_handler import ErrorEjecucion
+
+
+# Instrucciones entre dos lecturas del reloj cuando hay límite de tiempo
+INTERVALO_RELOJ = 4096
+
+
+@dataclass
+class Limites:
+    """
+    Límites por ejecución de un programa. None significa sin límite.
+
+    Las instrucciones se cuentan en los puntos de retorno de los ciclos (cada
+    vuelta cuesta las declaraciones de su cuerpo más la condición) y en cada
+    llamada a una sabiduría; el código sin ciclos ni llamadas es finito y no
+    se mide.
+    """
+    instrucciones: Optional[int] = None
+    profundidad: Optional[int] = None  # Llamadas a sabidurías anidadas
+    tiempo: Optional[float] = None  # Segundos de reloj
+    elementos_ofrenda: Optional[int] = None
+    longitud_mantra: Optional[int] = None
+
+    @classmethod
+    def desde_texto(cls, texto: str) -> 'Limites':
+        """Crea límites desde 'instrucciones=1000000,tiempo=2.5', como en la línea de comandos."""
+        tipos = {campo.name: float if campo.name == 'tiempo' else int for campo in fields(cls)}
+        valores = {}
+        for parte in filter(None, (p.strip() for p in texto.split(','))):
+            nombre, _, valor = parte.partition('=')
+            if nombre not in tipos:
+                raise ValueError(f"Límite desconocido: {nombre}")
+            valores[nombre] = tipos[nombre](valor)
+        return cls(**valores)
+
+
+class ErrorLimiteExcedido(ErrorEjecucion):
+    """
+    Un programa superó uno de sus límites.
+
+    Es fatal: el manejo de errores de las declaraciones no lo absorbe, de modo
+    que detiene la ejecución completa y llega a quien llamó a run().
+    """
+    fatal = True
+
+    def __init__(self, limite: str, maximo: Any, consumo: Dict[str, Any], **kwargs):
+        self.limite = limite
+        self.maximo = maximo
+        self.consumo = consumo
+        uso = ", ".join(f"{nombre}={valor}" for nombre, valor in consumo.items())
+        super().__init__(
+            f"Límite de {limite} excedido (máximo {maximo}). Consumo hasta ahora: {uso}",
+            sugerencia="Revisa los ciclos y la recursión del ritual, o aumenta el límite",
+            **kwargs
+        )
+
+
+class Medidor:
+    """
+    Lleva el consumo de una ejecución y lo compara con sus límites.
+
+    El intérprete sólo suma a `instrucciones` y compara con `proxima_revision`
+    en cada vuelta de ciclo; la revisión completa (incluido el reloj) ocurre
+    cuando se alcanza ese umbral, que es infinito si no hay límites que revisar.
+    """
+
+    def __init__(self, limites: Optional[Limites] = None):
+        self.limites = limites or Limites()
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """Pone el consumo en cero; se llama al comenzar cada run()."""
+        self.instrucciones = 0
+        self.profundidad = 0
+        self.profundidad_maxima = 0
+        self.inicio = time.monotonic()
+        self.proxima_revision = self._calcular_proxima_revision()
+
+    def restante(self) -> Limites:
+        """Límites con lo que le queda a esta ejecución, para continuarla en otro proceso."""
+        limites = self.limites
+        return replace(
+            limites,
+            instrucciones=None if limites.instrucciones is None
+            else max(0, limites.instrucciones - self.instrucciones),
+            profundidad=None if limites.profundidad is None else max(0, limites.profundidad - self.profundidad),
+            tiempo=None if limites.tiempo is None else max(0.0, limites.tiempo - (time.monotonic() - self.inicio)),
+        )
+
+    def _calcular_proxima_revision(self) -> float:
+        limites = self.limites
+        candidatos = []
+        if limites.instrucciones is not None:
+            candidatos.append(limites.instrucciones)
+        if limites.tiempo is not None:
+            candidatos.append(self.instrucciones + INTERVALO_RELOJ)
+        return min(candidatos) if candidatos else float('inf')
+
+    def consumo(self) -> Dict[str, Any]:
+        return {
+            'instrucciones': self.instrucciones,
+            'profundidad_maxima': self.profundidad_maxima,
+            'tiempo': round(time.monotonic() - self.inicio, 3),
+        }
+
+    def _excedido(self, limite: str, maximo: Any) -> ErrorLimiteExcedido:
+        return ErrorLimiteExcedido(limite, maximo, self.consumo())
+
+    def revisar(self) -> None:
+        """Revisión completa, al alcanzar proxima_revision."""
+        limites = self.limites
+        if limites.instrucciones is not None and self.instrucciones > limites.instrucciones:
+            raise self._excedido('instrucciones', limites.instrucciones)
+        if limites.tiempo is not None and time.monotonic() - self.inicio > limites.tiempo:
+            raise self._excedido('tiempo', limites.tiempo)
+        self.proxima_revision = self._calcular_proxima_revision()
+
+    def paso(self, costo: int = 1) -> None:
+        self.instrucciones += costo
+        if self.instrucciones > self.proxima_revision:
+            self.revisar()
+
+    def entrar(self) -> None:
+        """Registra la entrada a una sabiduría."""
+        profundidad = self.profundidad + 1
+        if profundidad > self.profundidad_maxima:
+            maximo = self.limites.profundidad
+            if maximo is not None and profundidad > maximo:
+                raise self._excedido('profundidad', maximo)
+            self.profundidad_maxima = profundidad
+        self.profundidad = profundidad
+        self.paso()
+
+    def salir(self) -> None:
+        self.profundidad -= 1
+
+    def verificar_ofrenda(self, elementos: int) -> None:
+        maximo = self.limites.elementos_ofrenda
+        if maximo is not None and elementos > maximo:
+            raise self._excedido('elementos de ofrenda', maximo)
+
+    def verificar_mantra(self, longitud: int) -> None:
+        maximo = self.limites.longitud_mantra
+        if maximo is not None and longitud > maximo:
+            raise self._excedido('longitud de mantra', maximo)
@@ -0,0 +1,147 @@
+# src/nahual/loader.py
+
+import io
+from array import array
+from typing import Any, List, Optional
+
+from .types import CODIGOS_CRUDOS, TipoNahual, Lista
+from .error_handler import ErrorEjecucion
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional; se usa la ruta en Python puro
+    np = None
+
+
+# Ruta especial que indica leer el resto de la entrada estándar
+RUTA_ENTRADA = '-'
+
+# Saltos de línea a espacios, para que NumPy lea todos los campos como una sola fila
+_UNA_FILA = bytes.maketrans(b'\r\n', b'  ')
+
+
+def _leer_archivo(ruta: str, descriptor: Optional[int] = None) -> bytes:
+    """Lee el archivo completo de una vez; los campos se separan después sobre estos bytes."""
+    try:
+        with open(ruta if descriptor is None else descriptor, 'rb') as archivo:
+            return archivo.read()
+    except OSError as e:
+        raise ErrorEjecucion(
+            f"No se pudo abrir '{ruta}': {e.strerror}",
+            sugerencia="Verifica que la ruta exista y pueda leerse"
+        )
+
+
+def _normalizar(texto: bytes, separador: Optional[str]) -> bytes:
+    """Reemplaza el separador por espacios para que todo quede separado por blancos."""
+    if separador and not separador.isspace():
+        return texto.replace(separador.encode(), b' ')
+    return texto
+
+
+def _columnas(texto: bytes) -> int:
+    for linea in texto.split(b'\n', 64):
+        if linea.strip():
+            return len(linea.split())
+    return 1
+
+
+def _campos_columna(texto: bytes, columna: int, columnas: int) -> List[bytes]:
+    """Campos de la columna pedida; cada línea con datos debe tener `columnas` campos."""
+    campos = []
+    for numero, linea in enumerate(texto.split(b'\n'), 1):
+        fila = linea.split()
+        if not fila:
+            continue
+        if len(fila) != columnas:
+            raise ErrorEjecucion(
+                f"La línea {numero} tiene {len(fila)} columnas, no {columnas}",
+                sugerencia="Verifica que ninguna línea tenga campos de más o de menos"
+            )
+        campos.append(fila[columna])
+    return campos
+
+
+def _parsear_python(campos: List[bytes], tipo: TipoNahual) -> Any:
+    convertir = int if tipo == TipoNahual.ESPIRITU else float
+    try:
+        valores = list(map(convertir, campos))
+    except ValueError as e:
+        raise ErrorEjecucion(
+            f"Dato no numérico al cargar {tipo.value}s: {e}",
+            sugerencia="Verifica el separador y que todos los datos sean números"
+        )
+    try:
+        return array(CODIGOS_CRUDOS[tipo], valores)
+    except OverflowError:  # Espiritus fuera de 64 bits: la ofrenda guardará Valores
+        return valores
+
+
+def _parsear_numpy(texto: bytes, tipo: TipoNahual, columnas: Optional[int] = None) -> Optional[Any]:
+    """
+    Parsea con NumPy todos los campos o ninguno; retorna None si hay que repetir
+    en Python para diagnosticar el dato inválido, la línea con otra cantidad de
+    columnas o guardar espiritus de más de 64 bits.
+
+    Sin `columnas` retorna todos los campos como una sola fila; con ellas, una
+    matriz de una fila por línea.
+    """
+    dtype = np.int64 if tipo == TipoNahual.ESPIRITU else np.float64
+    if not texto or texto.isspace():
+        return np.empty(0 if columnas is None else (0, columnas), dtype=dtype)
+    try:
+        # loadtxt falla con el primer campo inválido en lugar de cortar ahí la
+        # lectura, y con la primera línea que cambia la cantidad de columnas
+        if columnas is None:
+            return np.loadtxt(io.BytesIO(texto.translate(_UNA_FILA)), dtype=dtype, comments=None, ndmin=1)
+        matriz = np.loadtxt(io.BytesIO(texto), dtype=dtype, comments=None, ndmin=2)
+        return matriz if matriz.shape[1] == columnas else None
+    except (ValueError, OverflowError):
+        return None
+
+
+def cargar_numeros(ruta: str, tipo: TipoNahual, separador: Optional[str] = None,
+                   columna: Optional[int] = None, entrada: Optional[Any] = None,
+                 descriptor: Optional[int] = None) -> Lista:
+    """
+    Carga un archivo de números delimitados en una ofrenda tipada compacta.
+
+    Args:
+        ruta: Archivo a cargar, o '-' para leer el resto de `entrada`
+        tipo: TipoNahual.ESPIRITU o TipoNahual.ENERGIA
+        separador: Separador entre campos; por defecto cualquier espacio en blanco
+        columna: Si se indica, sólo se toma esa columna (desde 0) de cada línea;
+            si no, todos los valores en el orden del archivo
+        entrada: EntradaNahual usada cuando la ruta es '-'
+        descriptor: Descriptor ya abierto para la ruta, que se lee y se cierra
+    """
+    if ruta == RUTA_ENTRADA:
+        texto = entrada.leer_resto().encode()
+    else:
+        texto = _leer_archivo(ruta, descriptor)
+    texto = _normalizar(texto, separador)
+
+    # Con NumPy se parsea todo el archivo de una vez; si falla (por ejemplo, otra
+    # columna tiene energias al cargar espiritus) se recurre a Python, que sólo
+    # convierte los campos de la columna pedida.
+    if columna is None:
+        crudos = _parsear_numpy(texto, tipo) if np is not None else None
+        if crudos is None:
+            crudos = texto.split()
+    else:
+        columnas = _columnas(texto)
+        if not 0 <= columna < columnas:
+            raise ErrorEjecucion(f"Columna {columna} fuera de rango: el archivo tiene {columnas}")
+        crudos = _parsear_numpy(texto, tipo, columnas) if np is not None else None
+        if crudos is None:
+            crudos = _campos_columna(texto, columna, columnas)
+        else:
+            crudos = crudos[:, columna]
+
+    if isinstance(crudos, list):
+        crudos = _parsear_python(crudos, tipo)
+    else:
+        arreglo = array(CODIGOS_CRUDOS[tipo])
+        arreglo.frombytes(np.ascontiguousarray(crudos).tobytes())
+        crudos = arreglo
+    return Lista.desde_crudos(crudos, tipo)
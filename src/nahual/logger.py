@@ -1,66 +1,145 @@
 # src/nahual/logger.py
+"""
+Registro de NahualScript: un único logger 'NahualScript' por proceso.
 
+La configuración es idempotente: construir muchos NahualLogger (uno por
+lexer, y por tanto por parser e intérprete) o llamar varias veces a
+configurar_registro() no agrega manejadores repetidos. En la consola sólo
+aparecen advertencias y errores, salvo en modo debug; el sumidero opcional
+de líneas JSON recibe también los mensajes informativos.
+
+Los mensajes se pasan como formato y argumentos (`"Token %s", valor`): sólo
+se construyen si algún manejador los va a escribir.
+"""
+
+import json
 import logging
-from typing import Optional
+import os
+from typing import Any, Optional
+
+NOMBRE = 'NahualScript'
+
+# Emojis para diferentes niveles de log
+EMOJIS = {
+    'DEBUG': '🔍',
+    'INFO': '✨',
+    'WARNING': '⚠️',
+    'ERROR': '❌',
+    'CRITICAL': '💥'
+}
+
+# Atributos propios de todo LogRecord; el resto llegó por `extra` y va al JSON
+_ATRIBUTOS_BASE = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'emoji'}
+
+
+class _FormatoMistico(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(emoji)s %(levelname)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, 'emoji'):
+            record.emoji = EMOJIS.get(record.levelname, '✨')
+        return super().format(record)
+
+
+class FormatoJSON(logging.Formatter):
+    """Una línea JSON por registro, con los campos pasados en `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            'momento': record.created,
+            'nivel': record.levelname,
+            'mensaje': record.getMessage(),
+            'proceso': record.process,
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_BASE:
+                datos[clave] = valor
+        if record.exc_info:
+            datos['excepcion'] = self.formatException(record.exc_info)
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+def configurar_registro(debug: Optional[bool] = None, json_ruta: Optional[str] = None) -> logging.Logger:
+    """
+    Configura el logger del proceso y lo retorna. Puede llamarse cualquier
+    número de veces.
+
+    Args:
+        debug: True muestra también los mensajes de debug en la consola; False
+            vuelve a mostrar sólo advertencias y errores; None no cambia el nivel
+        json_ruta: Archivo al que se anexan los registros desde el nivel
+            informativo como líneas JSON. Varios procesos pueden compartirlo:
+            cada registro se escribe con una sola escritura en modo anexar
+    """
+    registro = logging.getLogger(NOMBRE)
+    consola = next((h for h in registro.handlers if getattr(h, '_nahual', None) == 'consola'), None)
+    if consola is None:
+        consola = logging.StreamHandler()
+        consola._nahual = 'consola'
+        consola.setFormatter(_FormatoMistico())
+        consola.setLevel(logging.WARNING)
+        registro.addHandler(consola)
+        registro.setLevel(logging.INFO)
+    if debug is not None:
+        consola.setLevel(logging.DEBUG if debug else logging.WARNING)
+        registro.setLevel(logging.DEBUG if debug else logging.INFO)
+
+    if json_ruta is not None:
+        destino = ('json', os.path.abspath(json_ruta))
+        if not any(getattr(h, '_nahual', None) == destino for h in registro.handlers):
+            sumidero = logging.FileHandler(destino[1], mode='a', encoding='utf-8', delay=True)
+            sumidero._nahual = destino
+            sumidero.setFormatter(FormatoJSON())
+            sumidero.setLevel(logging.INFO)
+            registro.addHandler(sumidero)
+    return registro
 
 
 class NahualLogger:
     """Sistema de logging para NahualScript."""
 
     def __init__(self, debug: bool = False):
-        """Inicializa el logger con nivel opcional de debug."""
-        self.logger = logging.getLogger('NahualScript')
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(emoji)s %(levelname)s: %(message)s'
-        )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-
-        self.logger.setLevel(logging.DEBUG if debug else logging.INFO)
-
-        # Emojis para diferentes niveles de log
-        self.emojis = {
-            'DEBUG': '🔍',
-            'INFO': '✨',
-            'WARNING': '⚠️',
-            'ERROR': '❌',
-            'CRITICAL': '💥'
-        }
+        """
+        Usa el logger compartido del proceso; con debug activa los mensajes de
+        debug, sin debug deja el nivel como esté.
+        """
+        self.logger = configurar_registro(debug=True if debug else None)
+        self.emojis = EMOJIS
 
-    def _log(self, level: int, msg: str, emoji: Optional[str] = None) -> None:
+    def _log(self, level: int, msg: str, *args: Any, emoji: Optional[str] = None) -> None:
         """Método interno para manejar el logging con emojis."""
-        extra = {'emoji': emoji or self.emojis.get(logging.getLevelName(level), '✨')}
-        self.logger.log(level, msg, extra=extra)
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, msg, *args, extra={'emoji': emoji} if emoji else None)
 
-    def debug(self, msg: str) -> None:
+    def debug(self, msg: str, *args: Any) -> None:
         """Registra un mensaje de debug."""
-        self._log(logging.DEBUG, msg)
+        self._log(logging.DEBUG, msg, *args)
 
-    def info(self, msg: str) -> None:
+    def info(self, msg: str, *args: Any) -> None:
         """Registra un mensaje informativo."""
-        self._log(logging.INFO, msg)
+        self._log(logging.INFO, msg, *args)
 
-    def warning(self, msg: str) -> None:
+    def warning(self, msg: str, *args: Any) -> None:
         """Registra una advertencia."""
-        self._log(logging.WARNING, msg)
+        self._log(logging.WARNING, msg, *args)
 
-    def error(self, msg: str) -> None:
+    def error(self, msg: str, *args: Any) -> None:
         """Registra un error."""
-        self._log(logging.ERROR, msg)
+        self._log(logging.ERROR, msg, *args)
 
-    def critical(self, msg: str) -> None:
+    def critical(self, msg: str, *args: Any) -> None:
         """Registra un error crítico."""
-        self._log(logging.CRITICAL, msg)
+        self._log(logging.CRITICAL, msg, *args)
 
     def lexer_debug(self, token: str, value: str) -> None:
         """Registra información de debug del lexer."""
-        self.debug(f"Token encontrado: {token} = {value}")
+        self._log(logging.DEBUG, "Token encontrado: %s = %s", token, value)
 
     def parser_debug(self, rule: str, values: list) -> None:
         """Registra información de debug del parser."""
-        self.debug(f"Regla aplicada: {rule} con valores {values}")
+        self._log(logging.DEBUG, "Regla aplicada: %s con valores %s", rule, values)
 
-    def interpreter_debug(self, operation: str, result: any) -> None:
+    def interpreter_debug(self, operation: str, result: Any) -> None:
         """Registra información de debug del intérprete."""
-        self.debug(f"Operación: {operation} = {result}")
\ No newline at end of file
+        self._log(logging.DEBUG, "Operación: %s = %s", operation, result)
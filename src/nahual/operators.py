@@ -0,0 +1,85 @@
+# src/nahual/operators.py
+"""
+Tabla única de operadores binarios, compartida por el verificador de tipos
+(estático y en tiempo de ejecución), el intérprete y las operaciones sobre
+ofrendas.
+
+Cada entrada indica, para un operador y los tipos de sus operandos, el tipo
+del resultado y la función que lo calcula a partir de los valores de Python.
+Una combinación que no está en la tabla es un error de tipos. Las ofrendas no
+aparecen: sus operaciones son elemento a elemento (ver vector_ops) y usan la
+tabla con el tipo de sus elementos.
+"""
+
+import operator
+from itertools import product
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from .rope import Cuerda
+from .types import TipoNahual
+
+
+class Operacion(NamedTuple):
+    resultado: TipoNahual
+    aplicar: Callable[[Any, Any], Any]
+
+
+ARITMETICOS = frozenset({'unir', 'separar', 'multiplicar', 'dividir', 'residuo'})
+LOGICOS = frozenset({'y', 'o'})
+COMPARACIONES = frozenset({'igual', 'mayor', 'menor', 'mayor_igual', 'menor_igual'})
+OPERADORES = ARITMETICOS | LOGICOS | COMPARACIONES
+
+_NUMERICOS = (TipoNahual.ESPIRITU, TipoNahual.ENERGIA)
+
+_FUNCIONES = {
+    'unir': operator.add,
+    'separar': operator.sub,
+    'multiplicar': operator.mul,
+    'dividir': operator.truediv,
+    'residuo': operator.mod,
+    'igual': operator.eq,
+    'mayor': operator.gt,
+    'menor': operator.lt,
+    'mayor_igual': operator.ge,
+    'menor_igual': operator.le,
+}
+
+
+def _unir_mantras(izq: Any, der: Any) -> Any:
+    return Cuerda.concatenar(izq if isinstance(izq, (str, Cuerda)) else str(izq), der)
+
+
+def _construir_tabla() -> Dict[Tuple[str, TipoNahual, TipoNahual], Operacion]:
+    tabla = {}
+
+    # Aritmética: con una energia el resultado es energia; dividir siempre lo es
+    for op, (izq, der) in product(ARITMETICOS, product(_NUMERICOS, repeat=2)):
+        energia = op == 'dividir' or TipoNahual.ENERGIA in (izq, der)
+        tabla[op, izq, der] = Operacion(
+            TipoNahual.ENERGIA if energia else TipoNahual.ESPIRITU, _FUNCIONES[op])
+
+    # Concatenación: el operando que no es mantra se convierte a texto
+    for otro in _NUMERICOS + (TipoNahual.MANTRA, TipoNahual.VERDAD):
+        tabla['unir', TipoNahual.MANTRA, otro] = Operacion(TipoNahual.MANTRA, _unir_mantras)
+        tabla['unir', otro, TipoNahual.MANTRA] = Operacion(TipoNahual.MANTRA, _unir_mantras)
+
+    tabla['y', TipoNahual.VERDAD, TipoNahual.VERDAD] = Operacion(TipoNahual.VERDAD, lambda x, y: x and y)
+    tabla['o', TipoNahual.VERDAD, TipoNahual.VERDAD] = Operacion(TipoNahual.VERDAD, lambda x, y: x or y)
+
+    # Comparaciones entre valores compatibles; mapas y pergaminos sólo se igualan
+    ordenables = [*product(_NUMERICOS, repeat=2),
+                  (TipoNahual.MANTRA, TipoNahual.MANTRA), (TipoNahual.VERDAD, TipoNahual.VERDAD)]
+    for op, (izq, der) in product(COMPARACIONES, ordenables):
+        tabla[op, izq, der] = Operacion(TipoNahual.VERDAD, _FUNCIONES[op])
+    for tipo in (TipoNahual.MAPA, TipoNahual.PERGAMINO):
+        tabla['igual', tipo, tipo] = Operacion(TipoNahual.VERDAD, operator.eq)
+
+    return tabla
+
+
+TABLA_OPERACIONES = _construir_tabla()
+
+
+def buscar_operacion(op: str, izq: TipoNahual, der: TipoNahual) -> Optional[Operacion]:
+    """Operación para esos tipos de operandos, o None si no está definida."""
+    return TABLA_OPERACIONES.get((op, izq, der))
@@ -0,0 +1,57 @@
+# src/nahual/output.py
+
+import sys
+from typing import Any, List, Optional, TextIO
+
+
+# Cantidad de caracteres acumulados antes de escribir en el sumidero
+TAMANO_BUFER = 64 * 1024
+
+
+class SalidaNahual:
+    """
+    Capa de salida con búfer usada por `invocar`.
+
+    El sumidero es cualquier objeto con un método `write(str)` (y
+    opcionalmente `flush()`): sys.stdout por defecto, o un io.StringIO para
+    capturar la salida en memoria sin tocar sys.stdout. Si el sumidero es una
+    terminal la salida se vacía en cada salto de línea; si no, se acumula
+    hasta llenar el búfer.
+    """
+
+    def __init__(self, sumidero: Optional[TextIO] = None, tamano_bufer: int = TAMANO_BUFER,
+                 por_lineas: Optional[bool] = None):
+        self.sumidero = sumidero if sumidero is not None else sys.stdout
+        self.tamano_bufer = tamano_bufer
+        self.por_lineas = self._es_terminal(self.sumidero) if por_lineas is None else por_lineas
+        self._partes: List[str] = []
+        self._pendiente = 0
+
+    @staticmethod
+    def _es_terminal(sumidero: Any) -> bool:
+        try:
+            return sumidero.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def escribir(self, texto: str) -> None:
+        """Agrega texto al búfer y lo vacía si corresponde."""
+        self._partes.append(texto)
+        self._pendiente += len(texto)
+        if self._pendiente >= self.tamano_bufer or (self.por_lineas and '\n' in texto):
+            self.vaciar()
+
+    def escribir_linea(self, *valores: Any) -> None:
+        """Escribe los valores separados por espacios, como print()."""
+        self.escribir(' '.join(map(str, valores)) + '\n')
+
+    def vaciar(self) -> None:
+        """Escribe el contenido pendiente en el sumidero."""
+        if self._partes:
+            texto = ''.join(self._partes)
+            self._partes.clear()
+            self._pendiente = 0
+            self.sumidero.write(texto)
+        flush = getattr(self.sumidero, 'flush', None)
+        if flush is not None:
+            flush()
@@ -0,0 +1,306 @@
+# src/nahual/parallel.py
+
+import os
+import pickle
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, List, Optional, Tuple
+
+from .types import CODIGOS_CRUDOS, TipoNahual, Valor, Lista
+from .error_handler import ErrorEjecucion, ErrorNahual, _resumir
+from .limits import Limites
+
+
+# Por debajo de este tamaño repartir entre procesos cuesta más de lo que ahorra
+UMBRAL_PARALELO = 64
+
+# Fragmentos por proceso: más de uno equilibra la carga sin multiplicar los envíos
+FRAGMENTOS_POR_PROCESO = 4
+
+# Intérprete de cada proceso trabajador, preparado una sola vez por el inicializador
+_interprete_trabajador = None
+
+# Llamada a mapear_paralelo cuyas variables globales tiene el trabajador
+_version_globales = None
+
+
+def declaraciones_de_funciones(programa: Any) -> List[Any]:
+    """Extrae las declaraciones de sabidurías del nivel superior de un programa."""
+    # Las que tienen un punto de ruptura del depurador se envían sin él
+    declaraciones = [nodo[1] if isinstance(nodo, tuple) and nodo[0] == 'punto_ruptura' else nodo
+                     for nodo in programa[1]]
+    return [nodo for nodo in declaraciones
+            if isinstance(nodo, tuple) and nodo[0] == 'funcion_declaracion']
+
+
+def _preparar_trabajador(declaraciones: List[Any]) -> None:
+    """
+    Inicializador de los procesos: crea un intérprete y define las sabidurías
+    del programa ya parseado. El resto del programa no se ejecuta, para no
+    repetir sus efectos (invocar, pergaminos...) en cada proceso.
+    """
+    global _interprete_trabajador
+    from .interpreter import NahualInterpreter
+    _interprete_trabajador = NahualInterpreter()
+    for declaracion in declaraciones:
+        _interprete_trabajador.ejecutar(declaracion)
+
+
+def _aplicar(interprete: Any, nombre: str, elementos: Any) -> Tuple[Optional[TipoNahual], Any]:
+    """Aplica la sabiduría a los elementos; los resultados numéricos se retornan crudos."""
+    resultados = []
+    for elemento in elementos:
+        resultado = interprete.llamar_funcion(nombre, [elemento])
+        if resultado is None:
+            raise ErrorEjecucion(f"La sabiduría '{nombre}' no retornó un valor")
+        resultados.append(resultado)
+
+    tipos = {resultado.tipo for resultado in resultados}
+    if len(tipos) == 1:
+        tipo = tipos.pop()
+        if tipo in CODIGOS_CRUDOS:
+            try:
+                return tipo, array(CODIGOS_CRUDOS[tipo], [resultado.valor for resultado in resultados])
+            except OverflowError:
+                pass
+    return None, resultados
+
+
+def serializar_globales(entorno: Any, excluida: Optional[Lista] = None) -> bytes:
+    """
+    Variables globales que reciben los trabajadores. Los pergaminos abiertos
+    son del proceso principal y no se envían. La ofrenda `excluida` tampoco:
+    sólo se envían los nombres que la guardan, para que el trabajador los
+    ligue a la copia que ya recibe en memoria compartida.
+    """
+    variables = {}
+    ligadas = []
+    for nombre, valor in entorno.variables.items():
+        if excluida is not None and valor.valor is excluida:
+            ligadas.append(nombre)
+        elif valor.tipo != TipoNahual.PERGAMINO:
+            variables[nombre] = valor
+    try:
+        return pickle.dumps((variables, ligadas), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise ErrorEjecucion(
+            f"Las variables globales no pueden enviarse a los procesos: {e}",
+            sugerencia="mapear_paralelo no puede compartir pergaminos guardados en ofrendas o mapas"
+        )
+
+
+def _leer_compartida(nombre: str, tamano: int) -> bytes:
+    """Copia los primeros `tamano` bytes de un bloque de memoria compartida."""
+    compartida = SharedMemory(name=nombre)
+    try:
+        return bytes(compartida.buf[:tamano])
+    finally:
+        compartida.close()
+
+
+def _preparar_tarea(version: int, globales: str, tamano: int, limites: Limites,
+                    ofrenda: Optional[Lista] = None) -> None:
+    """
+    Carga las variables globales de la llamada desde la memoria compartida
+    `globales`, sólo si el trabajador aún no tiene esa versión, y mide la
+    tarea con sus límites. Los nombres de la ofrenda excluida se ligan a
+    `ofrenda`.
+    """
+    global _version_globales
+    if version != _version_globales:
+        recibidas, ligadas = pickle.loads(_leer_compartida(globales, tamano))
+        variables = _interprete_trabajador.entorno_global.variables
+        variables.clear()
+        variables.update(recibidas)
+        for nombre in ligadas:
+            variables[nombre] = Valor(TipoNahual.LISTA, ofrenda)
+        _version_globales = version
+    medidor = _interprete_trabajador.medidor
+    medidor.limites = limites
+    medidor.reiniciar()
+
+
+def _transportable(error: ErrorNahual) -> ErrorNahual:
+    """Deja el error listo para volver al proceso principal: las variables del rastro, como texto."""
+    for marco in error.pila:
+        if marco.variables:
+            marco.variables = {nombre: _resumir(valor) for nombre, valor in marco.variables.items()}
+    return error
+
+
+def _aplicar_fragmento(nombre: str, contexto: Tuple[int, str, int, Limites],
+                       elementos: List[Valor],
+                       ofrenda: Optional[Lista] = None) -> Tuple[Tuple[Optional[TipoNahual], Any], int]:
+    """
+    Tarea de un trabajador sobre un fragmento serializado de la ofrenda.
+    Retorna el resultado y las instrucciones que consumió.
+    """
+    try:
+        _preparar_tarea(*contexto, ofrenda=ofrenda)
+        resultado = _aplicar(_interprete_trabajador, nombre, elementos)
+        return resultado, _interprete_trabajador.medidor.instrucciones
+    except ErrorNahual as e:
+        raise _transportable(e) from None
+    except Exception as e:
+        raise ErrorEjecucion(f"Error al aplicar la sabiduría '{nombre}': {e}") from None
+    finally:
+        _interprete_trabajador.salida.vaciar()
+
+
+def _aplicar_compartido(nombre: str, contexto: Tuple[int, str, int, Limites], memoria: str, tipo: TipoNahual,
+                        cantidad: int, inicio: int, fin: int) -> Tuple[Tuple[Optional[TipoNahual], Any], int]:
+    """
+    Tarea de un trabajador que lee el fragmento [inicio, fin) de la memoria
+    compartida. Si aún no tiene las globales de la llamada copia además la
+    ofrenda completa, que las globales no incluyen.
+    """
+    ofrenda = None
+    compartida = SharedMemory(name=memoria)
+    try:
+        with memoryview(compartida.buf) as vista, vista.cast(CODIGOS_CRUDOS[tipo]) as numeros:
+            crudos = numeros[inicio:fin].tolist()
+            if contexto[0] != _version_globales:
+                ofrenda = Lista.desde_crudos(array(CODIGOS_CRUDOS[tipo], numeros[:cantidad]), tipo)
+    finally:
+        compartida.close()
+    return _aplicar_fragmento(nombre, contexto, [Valor(tipo, x) for x in crudos], ofrenda)
+
+
+class RepartidorParalelo:
+    """
+    Aplica una sabiduría a cada elemento de una ofrenda en un ProcessPoolExecutor.
+
+    El grupo de procesos se crea la primera vez que se usa con un programa y se
+    reutiliza mientras el programa no cambie; cada proceso recibe el AST ya
+    parseado y define sus sabidurías al iniciar. Los elementos se envían en
+    fragmentos contiguos y los resultados se reensamblan en orden. Las ofrendas
+    compactas de espiritus o energias viajan por memoria compartida en lugar de
+    serializarse.
+
+    Cada llamada publica además una copia de las variables globales en memoria
+    compartida; las tareas llevan sólo su nombre y versión, y cada trabajador
+    la carga una vez por llamada. Así las sabidurías las leen igual que en el
+    proceso principal; lo que les asignen no vuelve a él. Si la ofrenda que se
+    mapea es compacta no se copia en las globales: el trabajador la toma de la
+    memoria compartida de los elementos. Un error en un trabajador se relanza aquí con su
+    ubicación y su rastro, debajo de las llamadas del proceso principal.
+
+    Cada fragmento se mide con lo que queda de los límites del intérprete al
+    repartir, y las instrucciones que consume se suman a su medidor, que se
+    revisa al recibir cada fragmento.
+
+    Args:
+        procesos: Cantidad de procesos trabajadores; por defecto os.cpu_count()
+    """
+
+    def __init__(self, procesos: Optional[int] = None):
+        self.procesos = procesos or os.cpu_count() or 1
+        self._grupo: Optional[ProcessPoolExecutor] = None
+        self._programa: Any = None
+        self._llamadas = 0
+
+    def _obtener_grupo(self, programa: Any) -> ProcessPoolExecutor:
+        if self._grupo is None or self._programa is not programa:
+            self.cerrar()
+            # Los trabajadores deben compartir el rastreador de recursos del proceso
+            # principal para que adjuntar la memoria compartida no la libere al salir
+            resource_tracker.ensure_running()
+            self._grupo = ProcessPoolExecutor(
+                max_workers=self.procesos,
+                initializer=_preparar_trabajador,
+                initargs=(declaraciones_de_funciones(programa),)
+            )
+            self._programa = programa
+        return self._grupo
+
+    def _tamano_fragmento(self, cantidad: int) -> int:
+        return max(1, -(-cantidad // (self.procesos * FRAGMENTOS_POR_PROCESO)))
+
+    def mapear(self, interprete: Any, programa: Any, nombre: str, lista: Lista) -> Lista:
+        """Retorna una ofrenda con el resultado de la sabiduría para cada elemento, en orden."""
+        cantidad = lista.longitud()
+        if programa is None or self.procesos < 2 or cantidad < UMBRAL_PARALELO:
+            return self._ensamblar([_aplicar(interprete, nombre, lista)])
+
+        grupo = self._obtener_grupo(programa)
+        self._llamadas += 1
+        tamano = self._tamano_fragmento(cantidad)
+        limites = [(inicio, min(inicio + tamano, cantidad)) for inicio in range(0, cantidad, tamano)]
+
+        memorias = []
+        try:
+            globales = serializar_globales(interprete.entorno_global,
+                                           excluida=lista if lista.compacta else None)
+            memorias.append(self._compartir(memoryview(globales)))
+            contexto = (self._llamadas, memorias[0].name, len(globales), interprete.medidor.restante())
+            if lista.compacta:
+                crudos = lista.datos_crudos()
+                memorias.append(self._compartir(memoryview(crudos).cast('B')))
+                futuros = [grupo.submit(_aplicar_compartido, nombre, contexto, memorias[1].name,
+                                        lista.tipo_elementos, cantidad, inicio, fin)
+                           for inicio, fin in limites]
+            else:
+                elementos = lista.elementos
+                futuros = [grupo.submit(_aplicar_fragmento, nombre, contexto, elementos[inicio:fin])
+                           for inicio, fin in limites]
+            partes = self._recoger(interprete, futuros)
+        finally:
+            for compartida in memorias:
+                compartida.close()
+                compartida.unlink()
+        return self._ensamblar(partes)
+
+    @staticmethod
+    def _compartir(datos: memoryview) -> SharedMemory:
+        """Copia los bytes a un bloque nuevo de memoria compartida."""
+        compartida = SharedMemory(create=True, size=max(1, datos.nbytes))
+        with memoryview(compartida.buf) as vista:
+            vista[:datos.nbytes] = datos
+        return compartida
+
+    @staticmethod
+    def _recoger(interprete: Any, futuros: List[Any]) -> List[Tuple[Optional[TipoNahual], Any]]:
+        """Resultados de los fragmentos; si uno falla, descarta los pendientes y relanza su error."""
+        medidor = interprete.medidor
+        try:
+            partes = []
+            for futuro in futuros:
+                parte, instrucciones = futuro.result()
+                partes.append(parte)
+                medidor.instrucciones += instrucciones
+                medidor.revisar()
+            return partes
+        except ErrorNahual as e:
+            e.pila = interprete.manejador_errores.pila.capturar() + e.pila
+            raise
+        finally:
+            for futuro in futuros:
+                futuro.cancel()
+            # La memoria compartida se libera sólo cuando ningún fragmento la lee
+            wait(futuros)
+
+    @staticmethod
+    def _ensamblar(partes: List[Tuple[Optional[TipoNahual], Any]]) -> Lista:
+        tipos = {tipo for tipo, _ in partes}
+        if len(tipos) == 1 and None not in tipos:
+            tipo = tipos.pop()
+            crudos = array(CODIGOS_CRUDOS[tipo])
+            for _, datos in partes:
+                crudos.extend(datos)
+            return Lista.desde_crudos(crudos, tipo)
+
+        elementos = []
+        for tipo, datos in partes:
+            elementos.extend(datos if tipo is None else (Valor(tipo, x) for x in datos))
+        tipos_elementos = {elemento.tipo for elemento in elementos}
+        return Lista(elementos, tipos_elementos.pop() if len(tipos_elementos) == 1 else None)
+
+    def cerrar(self) -> None:
+        """Detiene los procesos trabajadores, si los hay."""
+        if self._grupo is not None:
+            self._grupo.shutdown()
+            self._grupo = None
+            self._programa = None
+
@@ -41,8 +41,11 @@ class NahualParser:
 
     def p_declaracion(self, p):
         '''declaracion : var_declaracion
+                      | asignacion
+                      | asignacion_indice
                       | funcion_declaracion
                       | ritual_declaracion
+                      | para_declaracion
                       | vision_declaracion
                       | llamada_sistema
                       | retorno_stmt
@@ -92,13 +95,28 @@ class NahualParser:
         else:  # tipo ID := llamada_sistema;
             p[0] = ('var_declaracion', tipo, nombre, p[4], ubicacion)
 
+    def p_asignacion(self, p):
+        '''asignacion : ID ASSIGN expresion SEMICOLON'''
+        p[0] = ('asignacion', p[1], p[3], self._ubicacion(p))
+
+    def p_asignacion_indice(self, p):
+        '''asignacion_indice : ID LBRACKET expresion RBRACKET ASSIGN expresion SEMICOLON'''
+        ubicacion = self._ubicacion(p)
+        p[0] = ('asignacion_indice', ('variable', p[1], ubicacion), p[3], p[6], ubicacion)
+
     def p_tipo(self, p):
         '''tipo : ESPIRITU
                | ENERGIA
                | MANTRA
                | VERDAD
-               | OFRENDA'''
-        p[0] = p[1]
+               | OFRENDA
+               | MAPA
+               | PERGAMINO
+               | MAPA LBRACKET tipo COMMA tipo RBRACKET'''
+        if len(p) == 2:
+            p[0] = p[1]
+        else:  # mapa[tipo_claves, tipo_valores]
+            p[0] = ('mapa', p[3], p[5])
 
     def p_funcion_declaracion(self, p):
         '''funcion_declaracion : SABIDURIA ID LPAREN parametros_opt RPAREN bloque'''
@@ -108,6 +126,14 @@ class NahualParser:
         '''ritual_declaracion : RITUAL LPAREN expresion RPAREN bloque'''
         p[0] = ('ritual', p[3], p[5], self._ubicacion(p))
 
+    def p_para_declaracion(self, p):
+        '''para_declaracion : PARA CADA ID EN expresion bloque
+                           | PARA ID DESDE expresion HASTA expresion bloque'''
+        if p[2] == 'cada':
+            p[0] = ('para_cada', p[3], p[5], p[6], self._ubicacion(p))
+        else:
+            p[0] = ('para_rango', p[2], p[4], p[6], p[7], self._ubicacion(p))
+
     def p_vision_declaracion(self, p):
         '''vision_declaracion : VISION LPAREN expresion RPAREN bloque sino_opt'''
         p[0] = ('vision', p[3], p[5], p[6], self._ubicacion(p))
@@ -155,7 +181,9 @@ class NahualParser:
                     | SEPARAR expresion %prec UMENOS
                     | LPAREN expresion RPAREN
                     | lista_literal
+                    | mapa_literal
                     | acceso_lista
+                    | rebanada
                     | ID
                     | ESPIRITU_VAL
                     | ENERGIA_VAL
@@ -212,10 +240,46 @@ class NahualParser:
         else:
             p[0] = p[1] + [p[3]]
 
+    def p_mapa_literal(self, p):
+        '''mapa_literal : LBRACE entradas_opt RBRACE'''
+        p[0] = ('mapa', p[2], self._ubicacion(p))
+
+    def p_entradas_opt(self, p):
+        '''entradas_opt : entradas
+                       | empty'''
+        p[0] = p[1] if p[1] is not None else []
+
+    def p_entradas(self, p):
+        '''entradas : entrada
+                   | entradas COMMA entrada'''
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[0] = p[1] + [p[3]]
+
+    def p_entrada(self, p):
+        '''entrada : expresion COLON expresion'''
+        p[0] = (p[1], p[3])
+
     def p_acceso_lista(self, p):
         '''acceso_lista : ID LBRACKET expresion RBRACKET'''
         p[0] = ('acceso_lista', ('variable', p[1], self._ubicacion(p)), p[3], self._ubicacion(p))
 
+    def p_rebanada(self, p):
+        '''rebanada : ID LBRACKET expresion COLON expresion RBRACKET
+                   | ID LBRACKET expresion COLON RBRACKET
+                   | ID LBRACKET COLON expresion RBRACKET
+                   | ID LBRACKET COLON RBRACKET'''
+        ubicacion = self._ubicacion(p)
+        inicio = fin = None
+        if len(p) == 7:  # xs[a:b]
+            inicio, fin = p[3], p[5]
+        elif len(p) == 6 and p[3] == ':':  # xs[:b]
+            fin = p[4]
+        elif len(p) == 6:  # xs[a:]
+            inicio = p[3]
+        p[0] = ('rebanada', ('variable', p[1], ubicacion), inicio, fin, ubicacion)
+
     def p_empty(self, p):
         '''empty :'''
         pass
@@ -234,13 +298,22 @@ class NahualParser:
 
     def _ubicacion(self, p, indice: int = 1) -> Dict[str, Any]:
         """Obtiene la ubicación mística del token en el código fuente."""
-        return {
-            'linea': p.lineno(indice),
-            'columna': getattr(p.slice[indice], 'lexpos', 0)
-        }
+        if p.lineno(indice):
+            return {
+                'linea': p.lineno(indice),
+                'columna': getattr(p.slice[indice], 'lexpos', 0)
+            }
+        # Sin seguimiento de posiciones los no terminales no tienen línea: se
+        # usa el primer token de la regla (el ID de una declaración, el operador
+        # de una operación binaria)
+        for simbolo in p.slice[indice + 1:]:
+            if getattr(simbolo, 'lineno', 0):
+                return {'linea': simbolo.lineno, 'columna': getattr(simbolo, 'lexpos', 0)}
+        return {'linea': 0, 'columna': 0}
 
     def parse(self, text: str) -> Optional[Any]:
         """Interpreta el ritual místico y retorna el árbol de sabidurías."""
         resultado = self.parser.parse(text, lexer=self.lexer, debug=self.debug)
-        print("🌟 Árbol generado:", resultado)  # Agrega esta línea
+        if self.debug:
+            print("🌟 Árbol generado:", resultado)
         return resultado
@@ -0,0 +1,278 @@
+# src/nahual/profiler.py
+"""
+Perfiladores a nivel de NahualScript.
+
+Perfilador es determinista: cuenta las llamadas y el tiempo inclusivo y
+propio de cada sabiduría (y de cada función nativa), y las ejecuciones y el
+tiempo propio de cada línea del grimorio según las ubicaciones del parser.
+
+Muestreador no mide cada nodo: un hilo lee periódicamente la pila de
+llamadas del intérprete y, de los marcos de Python del hilo que ejecuta, el
+nodo en ejecución. No cambia el intérprete, distorsiona menos los ciclos
+ajustados y escribe pilas colapsadas para generar flame graphs.
+
+Para no costar nada cuando no se usa, el intérprete no sabe del Perfilador:
+instalar() reemplaza `ejecutar` y `llamar_funcion` en la instancia del
+intérprete por versiones que miden, y desinstalar() devuelve lo que había.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+_FALTA = object()
+
+
+@dataclass
+class EstadisticaSabiduria:
+    nombre: str
+    nativa: bool
+    llamadas: int = 0
+    inclusivo: float = 0.0  # Segundos, contando las llamadas que hace
+    propio: float = 0.0  # Segundos, sin las llamadas que hace
+
+
+@dataclass
+class EstadisticaLinea:
+    linea: int
+    ejecuciones: int = 0
+    propio: float = 0.0  # Segundos en los que ésta era la línea en ejecución
+
+
+class Perfilador:
+    """
+    Uso:
+
+        perfilador = Perfilador()
+        perfilador.instalar(interprete)
+        interprete.run(codigo)
+        perfilador.desinstalar()
+        print(perfilador.informe())
+    """
+
+    def __init__(self, reloj: Any = time.perf_counter):
+        self.reloj = reloj
+        self.sabidurias: Dict[str, EstadisticaSabiduria] = {}
+        self.lineas: Dict[int, EstadisticaLinea] = {}
+        self.total = 0.0
+        self._interprete: Any = None
+        self._inicio = 0.0
+        # Línea en ejecución y momento desde el que se le carga el tiempo
+        self._linea: Optional[EstadisticaLinea] = None
+        self._marca = 0.0
+        # Llamadas en curso: [estadística, inicio, tiempo de sus llamadas]
+        self._pila: List[list] = []
+        self._activas: Dict[str, int] = {}
+        self._anteriores: Dict[str, Any] = {}
+
+    def instalar(self, interprete: Any) -> 'Perfilador':
+        """Empieza a medir las ejecuciones de `interprete`."""
+        self._interprete = interprete
+        ejecutar = interprete.ejecutar
+        llamar_funcion = interprete.llamar_funcion
+        lineas = self.lineas
+        reloj = self.reloj
+
+        def ejecutar_medido(nodo: Any) -> Any:
+            if type(nodo) is not tuple or nodo[0] == 'bloque':
+                return ejecutar(nodo)
+            ubicacion = nodo[-1]
+            numero = ubicacion.get('linea') if type(ubicacion) is dict else None
+            anterior = self._linea
+            if not numero or (anterior is not None and anterior.linea == numero):
+                return ejecutar(nodo)
+
+            linea = lineas.get(numero)
+            if linea is None:
+                linea = lineas[numero] = EstadisticaLinea(numero)
+            linea.ejecuciones += 1
+            ahora = reloj()
+            if anterior is not None:
+                anterior.propio += ahora - self._marca
+            self._linea, self._marca = linea, ahora
+            try:
+                return ejecutar(nodo)
+            finally:
+                ahora = reloj()
+                linea.propio += ahora - self._marca
+                self._linea, self._marca = anterior, ahora
+
+        def llamar_funcion_medida(nombre: str, argumentos: List[Any], *resto: Any) -> Any:
+            estadistica = self.sabidurias.get(nombre)
+            if estadistica is None:
+                funcion = interprete.entorno_actual.obtener_funcion(nombre)
+                estadistica = self.sabidurias[nombre] = EstadisticaSabiduria(nombre, callable(funcion))
+            estadistica.llamadas += 1
+            activas = self._activas.get(nombre, 0)
+            self._activas[nombre] = activas + 1
+            # El cuerpo de la sabiduría empieza sin línea en curso, para que en la
+            # recursión la misma línea no parezca anidada en sí misma
+            linea = self._linea
+            ahora = reloj()
+            if linea is not None:
+                linea.propio += ahora - self._marca
+            self._linea = None
+            marco = [estadistica, ahora, 0.0]
+            self._pila.append(marco)
+            try:
+                return llamar_funcion(nombre, argumentos, *resto)
+            finally:
+                ahora = reloj()
+                self._linea, self._marca = linea, ahora
+                transcurrido = ahora - marco[1]
+                self._pila.pop()
+                self._activas[nombre] = activas
+                estadistica.propio += transcurrido - marco[2]
+                # En la recursión sólo cuenta la activación más externa
+                if not activas:
+                    estadistica.inclusivo += transcurrido
+                if self._pila:
+                    self._pila[-1][2] += transcurrido
+
+        self._anteriores = {nombre: vars(interprete).get(nombre, _FALTA)
+                            for nombre in ('ejecutar', 'llamar_funcion')}
+        interprete.ejecutar = ejecutar_medido
+        interprete.llamar_funcion = llamar_funcion_medida
+        self._inicio = self._marca = reloj()
+        return self
+
+    def desinstalar(self) -> None:
+        """Deja de medir y devuelve al intérprete los métodos que tenía al instalar()."""
+        if self._interprete is None:
+            return
+        for nombre, anterior in self._anteriores.items():
+            if anterior is _FALTA:
+                delattr(self._interprete, nombre)
+            else:
+                setattr(self._interprete, nombre, anterior)
+        self._interprete = None
+        self.total += self.reloj() - self._inicio
+
+    def informe(self, limite: int = 15) -> str:
+        """Informe legible, de lo más costoso a lo menos."""
+        total = self.total or 1e-12
+        renglones = [f"🔮 Perfil del ritual: {self.total:.6f}s",
+                     "",
+                     f"{'llamadas':>10} {'inclusivo':>11} {'propio':>11} {'%':>6}  sabiduría"]
+        for s in sorted(self.sabidurias.values(), key=lambda s: s.propio, reverse=True)[:limite]:
+            nombre = f"{s.nombre} (nativa)" if s.nativa else s.nombre
+            renglones.append(f"{s.llamadas:>10} {s.inclusivo:>11.6f} {s.propio:>11.6f} "
+                             f"{100 * s.propio / total:>5.1f}%  {nombre}")
+        renglones += ["", f"{'veces':>10} {'propio':>11} {'%':>6}  línea"]
+        for l in sorted(self.lineas.values(), key=lambda l: l.propio, reverse=True)[:limite]:
+            renglones.append(f"{l.ejecuciones:>10} {l.propio:>11.6f} "
+                             f"{100 * l.propio / total:>5.1f}%  {l.linea}")
+        return "\n".join(renglones)
+
+    def como_diccionario(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'sabidurias': [vars(s) for s in sorted(self.sabidurias.values(),
+                                                   key=lambda s: s.propio, reverse=True)],
+            'lineas': [vars(l) for l in sorted(self.lineas.values(), key=lambda l: l.linea)],
+        }
+
+    def guardar(self, ruta: str) -> None:
+        """Escribe el perfil como JSON."""
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.como_diccionario(), archivo, ensure_ascii=False, indent=2)
+
+
+class Muestreador:
+    """
+    Perfilador por muestreo de la pila de llamadas del intérprete
+    (manejador_errores.pila):
+
+        muestreador = Muestreador(frecuencia=1000)
+        muestreador.instalar(interprete)
+        interprete.run(codigo)
+        muestreador.desinstalar()
+        muestreador.guardar("perfil.folded")  # flamegraph.pl perfil.folded > perfil.svg
+
+    La pila guarda dónde se llamó cada sabiduría; el muestreador sólo agrega
+    la línea en ejecución de la más interna, que toma del nodo del `ejecutar`
+    más interno en los marcos de Python del hilo que llamó a instalar().
+    """
+
+    # Muestras por segundo por defecto
+    FRECUENCIA = 1000
+
+    def __init__(self, frecuencia: float = FRECUENCIA):
+        if frecuencia <= 0:
+            raise ValueError("La frecuencia de muestreo debe ser positiva")
+        self.intervalo = 1.0 / frecuencia
+        # Pila (nombre, línea) de la más externa a la más interna -> número de muestras
+        self.muestras: Counter = Counter()
+        self.linea = 0  # Línea en ejecución en la sabiduría más interna, en la última muestra
+        self._interprete: Any = None
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._intervalo_gil = 0.0
+
+    def instalar(self, interprete: Any) -> 'Muestreador':
+        """Empieza a muestrear la pila de `interprete`, que debe ejecutarse en este hilo."""
+        self._interprete = interprete
+
+        # El hilo sólo puede tomar muestras cuando el intérprete suelta el GIL
+        self._intervalo_gil = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._intervalo_gil, self.intervalo))
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._muestrear,
+                                      args=(interprete, threading.get_ident()),
+                                      name='nahual-muestreador', daemon=True)
+        self._hilo.start()
+        return self
+
+    @staticmethod
+    def _linea_en_ejecucion(marco: Any, codigo: Any, interprete: Any) -> int:
+        """Línea del nodo del `ejecutar` más interno de `interprete`, recorriendo los marcos de Python."""
+        while marco is not None:
+            if marco.f_code is codigo:
+                locales = marco.f_locals
+                nodo = locales.get('nodo')
+                if (locales.get('self') is interprete and type(nodo) is tuple and nodo[0] != 'bloque'
+                        and type(nodo[-1]) is dict):
+                    linea = nodo[-1].get('linea')
+                    if linea:
+                        return linea
+            marco = marco.f_back
+        return 0
+
+    def _muestrear(self, interprete: Any, hilo: int) -> None:
+        muestras = self.muestras
+        pila = interprete.manejador_errores.pila
+        codigo = type(interprete).ejecutar.__code__
+        while not self._detener.wait(self.intervalo):
+            self.linea = self._linea_en_ejecucion(sys._current_frames().get(hilo), codigo, interprete)
+            marcos = list(pila)
+            nombres = ['<programa>'] + [marco.nombre for marco in marcos]
+            lineas = [marco.ubicacion['linea'] if marco.ubicacion else 0 for marco in marcos]
+            muestras[tuple(zip(nombres, lineas + [self.linea]))] += 1
+
+    def desinstalar(self) -> None:
+        """Detiene el muestreo."""
+        if self._interprete is None:
+            return
+        self._detener.set()
+        self._hilo.join()
+        sys.setswitchinterval(self._intervalo_gil)
+        self._interprete = None
+
+    @property
+    def total(self) -> int:
+        return sum(self.muestras.values())
+
+    def pilas_colapsadas(self) -> List[str]:
+        """Líneas `marco;marco;marco cuenta`, el formato de flamegraph.pl y speedscope."""
+        return [';'.join(f"{nombre}:{linea}" for nombre, linea in pila) + f" {cuenta}"
+                for pila, cuenta in sorted(self.muestras.items())]
+
+    def guardar(self, ruta: str) -> None:
+        """Escribe las pilas colapsadas."""
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            for linea in self.pilas_colapsadas():
+                archivo.write(linea + '\n')
@@ -0,0 +1,87 @@
+# src/nahual/program.py
+"""
+API para incrustar NahualScript: compilar una vez, ejecutar muchas veces.
+
+    programa = compilar(codigo)
+    for peticion in peticiones:
+        interprete = programa.ejecutar(globales={'peticion': peticion}, salida=sumidero)
+
+Cada ejecución usa un intérprete nuevo, por lo que un mismo Programa puede
+ejecutarse a la vez desde varios hilos.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Union
+
+from .environment import Environment
+from .type_checker import verificar_programa
+from .types import Valor
+
+
+# Parser compartido por compilar(); PLY guarda estado durante cada parseo
+_parser = None
+_cerrojo_parser = threading.Lock()
+
+
+@dataclass(frozen=True, eq=False)
+class Programa:
+    """
+    Programa ya parseado. Es inmutable: ejecutarlo no modifica su árbol, que
+    se comparte entre todas las ejecuciones.
+    """
+    fuente: str
+    arbol: Any
+
+    def ejecutar(self, globales: Optional[Union[Environment, Mapping[str, Valor]]] = None,
+                 salida: Optional[Any] = None, entrada: Optional[Any] = None,
+                 **opciones: Any) -> Any:
+        """
+        Ejecuta el programa con un intérprete nuevo y lo retorna, para consultar
+        su entorno_global y los errores de su manejador_errores.
+
+        Args:
+            globales: Environment que se usa como entorno global (por ejemplo,
+                el de una ejecución anterior) o variables iniciales como
+                nombre -> Valor. Por defecto, un entorno vacío. Un mismo
+                Environment no debe usarse en dos ejecuciones a la vez
+            salida: Sumidero de `invocar`; por defecto sys.stdout
+            entrada: Fuente de `percibir`; por defecto sys.stdin
+            **opciones: pergaminos, procesos, limites o debug, como en
+                NahualInterpreter
+        """
+        from .interpreter import NahualInterpreter
+
+        if globales is not None and not isinstance(globales, Environment):
+            entorno = Environment()
+            entorno.variables.update(globales)
+            globales = entorno
+        interprete = NahualInterpreter(salida=salida, entrada=entrada, entorno=globales, **opciones)
+        interprete.run_arbol(self.arbol)
+        return interprete
+
+
+def compilar(fuente: str, parser: Optional[Any] = None) -> Programa:
+    """
+    Parsea y verifica los tipos del código fuente una sola vez. Los errores de
+    sintaxis se lanzan como ErrorSintaxis. Es seguro llamarla desde varios hilos.
+
+    Args:
+        parser: NahualParser a usar; por defecto uno compartido que se
+            construye en la primera llamada
+    """
+    global _parser
+    with _cerrojo_parser:
+        if parser is None:
+            if _parser is None:
+                from .parser import NahualParser
+                _parser = NahualParser()
+            parser = _parser
+        arbol = parser.parse(fuente)
+    if arbol:
+        verificado, errores = verificar_programa(arbol)
+        # Con errores de tipos se conserva el árbol sin verificar: cada ejecución
+        # los vuelve a encontrar y los reporta por la salida de su intérprete
+        if not errores:
+            arbol = verificado
+    return Programa(fuente, arbol)
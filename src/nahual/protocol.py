@@ -0,0 +1,90 @@
+# src/nahual/protocol.py
+
+import json
+import os
+import socket
+import struct
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+# Protocolo entre el cliente y el servidor de NahualScript por un socket Unix.
+#
+# Petición: una línea JSON con la ruta del grimorio, los argumentos de línea de
+# comandos, el directorio de trabajo y la longitud de la entrada, seguida de
+# esos bytes de entrada estándar.
+#
+# Respuesta: marcos (canal, longitud, datos). Los canales SALIDA y ERRORES
+# llevan texto UTF-8 a medida que se produce; el marco FIN lleva el código de
+# salida y cierra la respuesta.
+
+SALIDA = b'S'
+ERRORES = b'E'
+FIN = b'X'
+
+_CABECERA = struct.Struct('>cI')
+_CODIGO = struct.Struct('>i')
+
+
+def ruta_socket_predeterminada() -> str:
+    """
+    Socket del usuario actual: $NAHUAL_SOCKET, o nahual-<uid>/servidor.sock dentro
+    de $XDG_RUNTIME_DIR o /tmp. El servidor crea ese directorio sólo para el usuario.
+    """
+    if os.environ.get('NAHUAL_SOCKET'):
+        return os.environ['NAHUAL_SOCKET']
+    directorio = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directorio, f'nahual-{os.getuid()}', 'servidor.sock')
+
+
+def es_privado(ruta: str) -> bool:
+    """Indica si `ruta` existe, es del usuario actual y nadie más puede escribir en ella."""
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        return False
+    return estado.st_uid == os.getuid() and not estado.st_mode & 0o022
+
+
+def enviar_peticion(conexion: socket.socket, peticion: Dict[str, Any], entrada: bytes) -> None:
+    peticion = dict(peticion, entrada=len(entrada))
+    conexion.sendall(json.dumps(peticion).encode() + b'\n' + entrada)
+
+
+def recibir_peticion(archivo: Any) -> Tuple[Dict[str, Any], bytes]:
+    """Lee una petición desde el archivo binario de la conexión."""
+    peticion = json.loads(archivo.readline())
+    entrada = archivo.read(peticion.pop('entrada'))
+    return peticion, entrada
+
+
+def enviar_marco(conexion: socket.socket, canal: bytes, datos: bytes) -> None:
+    conexion.sendall(_CABECERA.pack(canal, len(datos)) + datos)
+
+
+def enviar_fin(conexion: socket.socket, codigo: int) -> None:
+    enviar_marco(conexion, FIN, _CODIGO.pack(codigo))
+
+
+def _leer_exacto(conexion: socket.socket, cantidad: int) -> Optional[bytes]:
+    partes = []
+    while cantidad:
+        parte = conexion.recv(min(cantidad, 1 << 16))
+        if not parte:
+            return None
+        partes.append(parte)
+        cantidad -= len(parte)
+    return b''.join(partes)
+
+
+def recibir_marco(conexion: socket.socket) -> Optional[Tuple[bytes, bytes]]:
+    """Retorna el siguiente (canal, datos), o None si el servidor cerró la conexión."""
+    cabecera = _leer_exacto(conexion, _CABECERA.size)
+    if cabecera is None:
+        return None
+    canal, longitud = _CABECERA.unpack(cabecera)
+    datos = _leer_exacto(conexion, longitud)
+    return None if datos is None else (canal, datos)
+
+
+def codigo_de_fin(datos: bytes) -> int:
+    return _CODIGO.unpack(datos)[0]
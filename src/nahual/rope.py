@@ -0,0 +1,98 @@
+# src/nahual/rope.py
+
+from itertools import islice
+from typing import Any, List, Optional, Union
+
+
+# Las concatenaciones cuyo resultado es menor a esto se hacen directamente con str
+UMBRAL_CUERDA = 256
+
+
+class Cuerda:
+    """
+    Mantra construido por concatenación que se aplana al leerse por primera vez.
+
+    Varias cuerdas pueden compartir la misma lista de partes: cada una conoce
+    cuántas partes le pertenecen. Concatenar a la cuerda más reciente de una
+    lista sólo agrega una parte, por lo que construir un mantra en un ritual
+    cuesta O(longitud total) amortizado en lugar de O(n²).
+    """
+
+    __slots__ = ('_partes', '_cantidad', '_longitud', '_plano')
+
+    def __init__(self, partes: List[str], cantidad: int, longitud: int):
+        self._partes = partes
+        self._cantidad = cantidad
+        self._longitud = longitud
+        self._plano: Optional[str] = None
+
+    @classmethod
+    def concatenar(cls, izq: Union[str, 'Cuerda'], der: Any) -> Union[str, 'Cuerda']:
+        """Concatena dos mantras sin copiar el lado izquierdo."""
+        texto = str(der)
+        longitud = len(izq) + len(texto)
+        if not isinstance(izq, Cuerda):
+            if longitud < UMBRAL_CUERDA:
+                return izq + texto
+            return cls([izq, texto], 2, longitud)
+
+        partes = izq._partes
+        if izq._cantidad != len(partes):
+            # Otra cuerda ya extendió esta lista; se copia sólo la porción propia
+            partes = partes[:izq._cantidad]
+        partes.append(texto)
+        return cls(partes, len(partes), longitud)
+
+    def _aplanar(self) -> str:
+        if self._plano is None:
+            if self._cantidad == len(self._partes):
+                plano = ''.join(self._partes)
+            else:
+                plano = ''.join(islice(self._partes, self._cantidad))
+            self._plano = plano
+            # Las concatenaciones siguientes parten del texto ya aplanado
+            self._partes = [plano]
+            self._cantidad = 1
+        return self._plano
+
+    def __str__(self) -> str:
+        return self._aplanar()
+
+    def __repr__(self) -> str:
+        return repr(self._aplanar())
+
+    def __len__(self) -> int:
+        return self._longitud
+
+    def __hash__(self) -> int:
+        return hash(self._aplanar())
+
+    def __eq__(self, otro: Any) -> bool:
+        if isinstance(otro, (str, Cuerda)):
+            return self._aplanar() == str(otro)
+        return NotImplemented
+
+    def __lt__(self, otro: Any) -> bool:
+        if isinstance(otro, (str, Cuerda)):
+            return self._aplanar() < str(otro)
+        return NotImplemented
+
+    def __gt__(self, otro: Any) -> bool:
+        if isinstance(otro, (str, Cuerda)):
+            return self._aplanar() > str(otro)
+        return NotImplemented
+
+    def __int__(self) -> int:
+        return int(self._aplanar())
+
+    def __float__(self) -> float:
+        return float(self._aplanar())
+
+    def __getstate__(self):
+        return self._aplanar()
+
+    def __setstate__(self, plano: str):
+        self._partes = [plano]
+        self._cantidad = 1
+        self._longitud = len(plano)
+        self._plano = plano
@@ -0,0 +1,242 @@
+# src/nahual/server.py
+
+import io
+import os
+import select
+import socket
+import socketserver
+import sys
+import traceback
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .protocol import (
+    SALIDA, ERRORES, ruta_socket_predeterminada, es_privado, recibir_peticion, enviar_marco, enviar_fin
+)
+
+
+# Cantidad de programas parseados que se conservan en memoria
+CAPACIDAD_CACHE = 256
+
+# Segundos que el proceso hijo espera a que el cliente termine de enviar su petición
+TIEMPO_PETICION = 30.0
+
+
+class ParserEnCache:
+    """
+    NahualParser que recuerda los árboles de los programas ya parseados.
+
+    Se usa como `parser` del intérprete: run() llama a parse() como siempre y
+    un programa repetido no se vuelve a parsear.
+    """
+
+    def __init__(self, parser: Any, capacidad: int = CAPACIDAD_CACHE):
+        self.parser = parser
+        self.capacidad = capacidad
+        self._arboles: 'OrderedDict[str, Any]' = OrderedDict()
+
+    def parse(self, texto: str) -> Optional[Any]:
+        arbol = self._arboles.get(texto)
+        if arbol is not None:
+            self._arboles.move_to_end(texto)
+            return arbol
+        arbol = self.parser.parse(texto)
+        if arbol is not None:
+            self._arboles[texto] = arbol
+            if len(self._arboles) > self.capacidad:
+                self._arboles.popitem(last=False)
+        return arbol
+
+
+class _SumideroSocket:
+    """Objeto tipo archivo que envía lo escrito al cliente como marcos de un canal."""
+
+    def __init__(self, conexion: socket.socket, canal: bytes, terminal: bool):
+        self.conexion = conexion
+        self.canal = canal
+        self.terminal = terminal
+        self.encoding = 'utf-8'
+
+    def write(self, texto: str) -> int:
+        if texto:
+            enviar_marco(self.conexion, self.canal, texto.encode('utf-8'))
+        return len(texto)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return self.terminal
+
+
+class _ManejadorPeticion(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.server.atender(self.request)
+
+
+class ServidorNahual(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """
+    Servidor local que ejecuta grimorios con el intérprete ya cargado.
+
+    El proceso principal importa el intérprete y construye el parser una sola
+    vez. Por cada conexión se bifurca de inmediato, de modo que un cliente
+    lento no detiene a los demás; el proceso hijo, que hereda todo eso ya en
+    memoria, lee la petición y ejecuta la misma función main() de la línea de
+    comandos con la entrada y la salida conectadas al socket. Así la salida y
+    el código de salida son los mismos que con `python -m nahual`, y un
+    grimorio no puede afectar a los siguientes.
+
+    El hijo avisa por un tubo qué grimorio ejecuta, y el proceso principal lo
+    parsea entre peticiones a través de un ParserEnCache para que los hijos
+    siguientes lo hereden ya parseado.
+
+    El socket se crea con permisos sólo para el usuario, dentro de un
+    directorio que debe ser suyo y en el que nadie más pueda escribir.
+    """
+
+    # Cada hijo atiende a su cliente por su cuenta; cerrar el servidor no los espera
+    block_on_close = False
+
+    def __init__(self, ruta_socket: Optional[str] = None):
+        from .parser import NahualParser
+        from .interpreter import NahualInterpreter
+        from . import __main__  # noqa: F401  (los hijos la heredan ya importada)
+        self.ruta_socket = ruta_socket or ruta_socket_predeterminada()
+        self.parser = ParserEnCache(NahualParser())
+        # Un intérprete construido de antemano deja cargados sus módulos (NumPy
+        # incluido) y el registro, para que los hijos no paguen esas importaciones
+        self.interprete = NahualInterpreter(salida=io.StringIO(), parser=self.parser)
+        self._aviso: Optional[int] = None  # En el hijo, el tubo por el que avisa su grimorio
+        self._avisos: List[int] = []  # En el principal, los tubos de los hijos en curso
+        self._preparar_directorio()
+        self._liberar_socket()
+        # Con esta máscara el socket nace con permisos 0600, sin un momento abierto a otros
+        mascara = os.umask(0o177)
+        try:
+            super().__init__(self.ruta_socket, _ManejadorPeticion)
+        finally:
+            os.umask(mascara)
+
+    def _preparar_directorio(self) -> None:
+        directorio = os.path.dirname(os.path.abspath(self.ruta_socket))
+        os.makedirs(directorio, mode=0o700, exist_ok=True)
+        if not es_privado(directorio):
+            raise OSError(f"El directorio del socket {directorio} debe ser del usuario actual "
+                          f"y nadie más debe poder escribir en él")
+
+    def _liberar_socket(self) -> None:
+        """Elimina un socket abandonado; falla si otro servidor sigue escuchando en él."""
+        if not os.path.exists(self.ruta_socket):
+            return
+        prueba = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            prueba.connect(self.ruta_socket)
+        except OSError:
+            os.unlink(self.ruta_socket)
+        else:
+            raise OSError(f"Ya hay un servidor de NahualScript en {self.ruta_socket}")
+        finally:
+            prueba.close()
+
+    def process_request(self, request: socket.socket, client_address: Any) -> None:
+        lectura, escritura = os.pipe()
+        self._aviso = escritura
+        try:
+            # El hijo no vuelve de aquí: termina con os._exit()
+            super().process_request(request, client_address)
+        finally:
+            os.close(escritura)
+            self._aviso = None
+        self._avisos.append(lectura)
+
+    def service_actions(self) -> None:
+        """Entre peticiones, parsea los grimorios que avisaron los hijos."""
+        super().service_actions()
+        if not self._avisos:
+            return
+        listos, _, _ = select.select(self._avisos, [], [], 0)
+        for descriptor in listos:
+            datos = os.read(descriptor, select.PIPE_BUF)
+            if not datos:
+                os.close(descriptor)
+                self._avisos.remove(descriptor)
+                continue
+            for ruta in datos.decode('utf-8', errors='replace').splitlines():
+                self._precargar(ruta)
+
+    def _precargar(self, ruta: str) -> None:
+        try:
+            with open(ruta, 'r', encoding='utf-8') as archivo:
+                self.parser.parse(archivo.read())
+        except OSError as e:
+            print(f'⚠️ No se pudo precargar {ruta}: {e}', file=sys.stderr)
+        except Exception:
+            print(f'⚠️ Error inesperado al precargar {ruta}:', file=sys.stderr)
+            traceback.print_exc()
+
+    def _avisar(self, peticion: Dict[str, Any]) -> None:
+        """En el hijo: envía al proceso principal la ruta del grimorio de la petición."""
+        argumentos = peticion.get('argumentos', [])
+        if argumentos and not argumentos[0].startswith('--'):
+            aviso = (os.path.join(peticion['cwd'], argumentos[0]) + '\n').encode('utf-8')
+            # Hasta PIPE_BUF bytes la escritura es atómica y no espera al proceso principal
+            if len(aviso) <= select.PIPE_BUF:
+                os.write(self._aviso, aviso)
+        os.close(self._aviso)
+        self._aviso = None
+
+    def atender(self, conexion: socket.socket) -> None:
+        """Lee la petición en el proceso hijo, la ejecuta y envía el código de salida."""
+        from .__main__ import main
+
+        # Un cliente que no termina su petición sólo retiene a este hijo, y no para siempre
+        conexion.settimeout(TIEMPO_PETICION)
+        archivo = conexion.makefile('rb')
+        try:
+            peticion, entrada = recibir_peticion(archivo)
+        except (ValueError, KeyError, OSError):  # socket.timeout incluido
+            return
+        finally:
+            archivo.close()
+        conexion.settimeout(None)
+        if self._aviso is not None:
+            self._avisar(peticion)
+
+        argumentos = peticion.get('argumentos', [])
+        os.chdir(peticion['cwd'])
+        sys.argv = ['nahual'] + argumentos
+        sys.stdin = io.StringIO(entrada.decode('utf-8', errors='replace'))
+        sys.stdout = _SumideroSocket(conexion, SALIDA, peticion.get('terminal', False))
+        sys.stderr = _SumideroSocket(conexion, ERRORES, peticion.get('terminal', False))
+        codigo = 0
+        try:
+            # Con --debug se usa un parser propio para que también muestre sus árboles
+            main(parser=None if '--debug' in argumentos else self.parser)
+        except SystemExit as salida:
+            if salida.code is None or isinstance(salida.code, int):
+                codigo = salida.code or 0
+            else:
+                print(salida.code, file=sys.stderr)
+                codigo = 1
+        except BaseException:
+            traceback.print_exc()
+            codigo = 1
+        enviar_fin(conexion, codigo)
+
+    def server_close(self) -> None:
+        super().server_close()
+        for descriptor in self._avisos:
+            os.close(descriptor)
+        self._avisos.clear()
+        if os.path.exists(self.ruta_socket):
+            os.unlink(self.ruta_socket)
+
+
+def servir(ruta_socket: Optional[str] = None) -> None:
+    """Inicia el servidor y atiende peticiones hasta recibir Ctrl+C."""
+    with ServidorNahual(ruta_socket) as servidor:
+        print(f'🔮 Servidor de NahualScript escuchando en {servidor.ruta_socket}')
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,181 @@
+# src/nahual/snapshot.py
+
+import hashlib
+import io
+import os
+import pickle
+import struct
+import zlib
+from typing import Any, Dict, Optional
+
+from . import VERSION
+from .error_handler import ErrorEjecucion
+from .files import Pergamino
+from .rope import Cuerda
+
+
+# Encabezado: firma, versión del formato y huella del intérprete que la creó
+FIRMA = b'NHLI'
+FORMATO = 1
+_ENCABEZADO = struct.Struct('>4sH32s')
+
+NIVEL_COMPRESION = 6
+
+# Módulos generados por PLY junto al paquete; no son parte del intérprete
+_GENERADOS = {'parsetab.py'}
+
+# Lo único que una instantánea puede reconstruir: los tipos del intérprete y
+# los contenedores con los que se guardan. Cualquier otra clase o función se
+# rechaza, para que una instantánea manipulada no ejecute código al cargarse.
+_PERMITIDOS = {
+    'builtins': {'str', 'bytes', 'bytearray', 'list', 'dict', 'tuple', 'set', 'frozenset',
+                 'int', 'float', 'complex', 'bool'},
+    'array': {'array', '_array_reconstructor'},
+    'nahual.types': {'TipoNahual', 'Valor', 'Lista', 'Mapa', '_Almacen'},
+    'nahual.environment': {'Environment'},
+}
+
+_huella: Optional[bytes] = None
+
+
+class ErrorInstantanea(ErrorEjecucion):
+    """Error al guardar o restaurar una instantánea del entorno global."""
+    pass
+
+
+def huella_interprete() -> bytes:
+    """
+    Huella de esta versión del intérprete: el SHA-256 de la versión, del
+    protocolo de pickle y del código fuente de sus módulos, sin los generados
+    por PLY, que cambian al regenerarse las tablas. Cualquier cambio en
+    el intérprete (el formato del AST, los tipos, las funciones nativas) cambia
+    la huella, y las instantáneas anteriores dejan de aceptarse.
+    """
+    global _huella
+    if _huella is None:
+        resumen = hashlib.sha256(f'{VERSION}:{pickle.HIGHEST_PROTOCOL}'.encode())
+        directorio = os.path.dirname(os.path.abspath(__file__))
+        for nombre in sorted(os.listdir(directorio)):
+            if nombre.endswith('.py') and nombre not in _GENERADOS:
+                with open(os.path.join(directorio, nombre), 'rb') as archivo:
+                    resumen.update(nombre.encode())
+                    resumen.update(archivo.read())
+        _huella = resumen.digest()
+    return _huella
+
+
+class _Empaquetador(pickle.Pickler):
+    """
+    Pickler que guarda por nombre lo que pertenece al intérprete (el entorno
+    global al que apuntan las sabidurías y las funciones nativas) para que al
+    restaurar se enlace con el intérprete nuevo.
+    """
+
+    def __init__(self, archivo: Any, interprete: Any):
+        super().__init__(archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self.entorno_global = interprete.entorno_global
+        self.nativas = {id(funcion): nombre
+                        for nombre, funcion in interprete.entorno_global.funciones.items()
+                        if callable(funcion)}
+
+    def persistent_id(self, objeto: Any) -> Optional[tuple]:
+        if objeto is self.entorno_global:
+            return ('entorno_global',)
+        nombre = self.nativas.get(id(objeto))
+        if nombre is not None:
+            return ('nativa', nombre)
+        return None
+
+    def reducer_override(self, objeto: Any) -> Any:
+        if isinstance(objeto, Cuerda):
+            return str, (str(objeto),)
+        if isinstance(objeto, Pergamino):
+            raise ErrorInstantanea(
+                f"No se puede guardar el pergamino abierto {objeto}",
+                sugerencia="Cierra los pergaminos antes de tomar la instantánea"
+            )
+        return NotImplemented
+
+
+class _Desempaquetador(pickle.Unpickler):
+    """Unpickler que sólo reconstruye las clases de _PERMITIDOS."""
+
+    def __init__(self, archivo: Any, interprete: Any):
+        super().__init__(archivo)
+        self.entorno_global = interprete.entorno_global
+
+    def persistent_load(self, identificador: tuple) -> Any:
+        if identificador == ('entorno_global',):
+            return self.entorno_global
+        if identificador[0] == 'nativa':
+            funcion = self.entorno_global.funciones.get(identificador[1])
+            if callable(funcion):
+                return funcion
+        raise ErrorInstantanea(f"Referencia desconocida en la instantánea: {identificador}")
+
+    def find_class(self, modulo: str, nombre: str) -> Any:
+        if nombre in _PERMITIDOS.get(modulo, ()):
+            return super().find_class(modulo, nombre)
+        raise pickle.UnpicklingError(f"contiene un objeto no permitido: {modulo}.{nombre}")
+
+
+def guardar_instantanea(interprete: Any, ruta: str) -> None:
+    """
+    Guarda las variables y sabidurías del entorno global del intérprete.
+
+    Las funciones nativas no se guardan: las sabidurías que las usan se
+    enlazan por nombre con las del intérprete que restaura.
+    """
+    entorno = interprete.entorno_global
+    contenido = {
+        'variables': entorno.variables,
+        'funciones': {nombre: funcion for nombre, funcion in entorno.funciones.items()
+                      if not callable(funcion)},
+    }
+    datos = io.BytesIO()
+    try:
+        _Empaquetador(datos, interprete).dump(contenido)
+    except (pickle.PicklingError, TypeError, RecursionError) as e:
+        raise ErrorInstantanea(f"No se pudo guardar la instantánea: {e}")
+
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as archivo:
+        archivo.write(_ENCABEZADO.pack(FIRMA, FORMATO, huella_interprete()))
+        archivo.write(zlib.compress(datos.getbuffer(), NIVEL_COMPRESION))
+    os.replace(temporal, ruta)
+
+
+def restaurar_instantanea(interprete: Any, ruta: str) -> None:
+    """
+    Restaura en el entorno global del intérprete lo guardado con
+    guardar_instantanea(). Rechaza archivos que no son instantáneas, que
+    fueron creados por otra versión del intérprete o que contienen objetos
+    ajenos al intérprete.
+    """
+    try:
+        with open(ruta, 'rb') as archivo:
+            encabezado = archivo.read(_ENCABEZADO.size)
+            comprimido = archivo.read()
+    except OSError as e:
+        raise ErrorInstantanea(f"No se pudo leer la instantánea '{ruta}': {e}")
+
+    if len(encabezado) < _ENCABEZADO.size:
+        raise ErrorInstantanea(f"'{ruta}' no es una instantánea de NahualScript")
+    firma, formato, huella = _ENCABEZADO.unpack(encabezado)
+    if firma != FIRMA:
+        raise ErrorInstantanea(f"'{ruta}' no es una instantánea de NahualScript")
+    if formato != FORMATO or huella != huella_interprete():
+        raise ErrorInstantanea(
+            f"La instantánea '{ruta}' fue creada por otra versión del intérprete",
+            sugerencia="Vuelve a ejecutar el grimorio de preparación para crearla de nuevo"
+        )
+
+    try:
+        contenido: Dict[str, Any] = _Desempaquetador(
+            io.BytesIO(zlib.decompress(comprimido)), interprete).load()
+    except (zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        raise ErrorInstantanea(f"La instantánea '{ruta}' está dañada: {e}")
+
+    entorno = interprete.entorno_global
+    entorno.variables.update(contenido['variables'])
+    entorno.funciones.update(contenido['funciones'])
@@ -0,0 +1,224 @@
+# src/nahual/stats.py
+"""
+Contadores internos del intérprete para afinar grimorios (`--stats`).
+
+Como los perfiladores, no existen en una ejecución normal: instalar()
+reemplaza métodos por versiones que cuentan y desinstalar() devuelve los
+originales. `ejecutar` y `llamar_funcion` se reemplazan en la instancia del
+intérprete; la creación de Valores y entornos, las búsquedas de variables y
+el crecimiento de ofrendas se cuentan reemplazando métodos de sus clases.
+
+Los métodos de las clases se reemplazan una sola vez, al instalar las
+primeras Estadisticas, y al desinstalar las últimas vuelven los originales,
+en cualquier orden que se instalen y desinstalen. Cuentan sólo para las
+Estadisticas instaladas en el hilo que ejecuta: el intérprete las instala en
+el hilo de run(), así que los intérpretes de otros hilos no se mezclan en sus
+contadores. Varios intérpretes que se ejecutan en el mismo hilo mientras
+están instaladas sí cuentan juntos.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .environment import Environment
+from .types import Lista, Valor
+
+_FALTA = object()
+
+# Métodos originales de las clases que se cuentan
+_INICIAR_VALOR = Valor.__init__
+_INICIAR_ENTORNO = Environment.__init__
+_OBTENER_VARIABLE = Environment.obtener_variable
+_ASIGNAR_VARIABLE = Environment.asignar_variable
+_AGREGAR = Lista.agregar
+_PREPARAR_ESCRITURA = Lista._preparar_escritura
+
+_cerrojo = threading.Lock()
+_instaladas = 0  # Estadisticas instaladas en cualquier hilo; con cero se restauran los originales
+
+
+class _EstadoHilo(threading.local):
+    def __init__(self):
+        self.activas: List['Estadisticas'] = []  # Instaladas en este hilo, las que cuentan
+        self.nivel_busqueda = 0  # Entornos recorridos por la búsqueda de variable en curso
+
+
+_hilo = _EstadoHilo()
+
+
+def _iniciar_valor_contado(valor: Valor, *args: Any, **kwargs: Any) -> None:
+    for estadisticas in _hilo.activas:
+        estadisticas.valores += 1
+    _INICIAR_VALOR(valor, *args, **kwargs)
+
+
+def _iniciar_entorno_contado(entorno: Environment, *args: Any, **kwargs: Any) -> None:
+    for estadisticas in _hilo.activas:
+        estadisticas.entornos += 1
+    _INICIAR_ENTORNO(entorno, *args, **kwargs)
+
+
+def _buscar_contado(busqueda: Any, entorno: Environment, *args: Any) -> Any:
+    """
+    Cuenta una búsqueda de variable. Environment busca en su padre llamando
+    al mismo método, así que cada nivel de anidamiento es un entorno más.
+    """
+    estado = _hilo
+    nivel = estado.nivel_busqueda
+    for estadisticas in estado.activas:
+        if nivel == 0:
+            estadisticas.busquedas += 1
+        else:
+            estadisticas.saltos_entorno += 1
+            if nivel > estadisticas.saltos_maximos:
+                estadisticas.saltos_maximos = nivel
+    estado.nivel_busqueda = nivel + 1
+    try:
+        return busqueda(entorno, *args)
+    finally:
+        estado.nivel_busqueda = nivel
+
+
+def _obtener_variable_contada(entorno: Environment, nombre: str) -> Valor:
+    return _buscar_contado(_OBTENER_VARIABLE, entorno, nombre)
+
+
+def _asignar_variable_contada(entorno: Environment, nombre: str, valor: Valor) -> None:
+    _buscar_contado(_ASIGNAR_VARIABLE, entorno, nombre, valor)
+
+
+def _agregar_contado(lista: Lista, valor: Valor) -> None:
+    for estadisticas in _hilo.activas:
+        estadisticas.crecimientos_ofrenda += 1
+    _AGREGAR(lista, valor)
+
+
+def _preparar_escritura_contada(lista: Lista) -> Any:
+    almacen = lista._almacen
+    datos = _PREPARAR_ESCRITURA(lista)
+    if lista._almacen is not almacen:
+        for estadisticas in _hilo.activas:
+            estadisticas.copias_ofrenda += 1
+    return datos
+
+
+_CONTADOS = [
+    (Valor, '__init__', _iniciar_valor_contado, _INICIAR_VALOR),
+    (Environment, '__init__', _iniciar_entorno_contado, _INICIAR_ENTORNO),
+    (Environment, 'obtener_variable', _obtener_variable_contada, _OBTENER_VARIABLE),
+    (Environment, 'asignar_variable', _asignar_variable_contada, _ASIGNAR_VARIABLE),
+    (Lista, 'agregar', _agregar_contado, _AGREGAR),
+    (Lista, '_preparar_escritura', _preparar_escritura_contada, _PREPARAR_ESCRITURA),
+]
+
+
+def _activar(estadisticas: 'Estadisticas') -> None:
+    global _instaladas
+    with _cerrojo:
+        if _instaladas == 0:
+            for clase, nombre, contado, _ in _CONTADOS:
+                setattr(clase, nombre, contado)
+        _instaladas += 1
+        estadisticas._activas = _hilo.activas
+        estadisticas._activas.append(estadisticas)
+
+
+def _desactivar(estadisticas: 'Estadisticas') -> None:
+    global _instaladas
+    with _cerrojo:
+        if estadisticas._activas is None:
+            return
+        # La lista es la del hilo que las instaló, aunque se desinstalen desde otro
+        estadisticas._activas.remove(estadisticas)
+        estadisticas._activas = None
+        _instaladas -= 1
+        if _instaladas == 0:
+            for clase, nombre, _, original in _CONTADOS:
+                setattr(clase, nombre, original)
+
+
+@dataclass
+class Estadisticas:
+    nodos: Counter = field(default_factory=Counter)  # Nodos evaluados por tipo
+    llamadas: Counter = field(default_factory=Counter)  # Llamadas por sabiduría o nativa
+    valores: int = 0  # Valores creados
+    entornos: int = 0  # Entornos creados (uno por llamada a una sabiduría)
+    busquedas: int = 0  # Lecturas y asignaciones de variables
+    saltos_entorno: int = 0  # Entornos recorridos hacia arriba en esas búsquedas
+    saltos_maximos: int = 0
+    crecimientos_ofrenda: int = 0  # Elementos agregados a ofrendas
+    copias_ofrenda: int = 0  # Copias de almacenamiento compartido al escribir
+
+    def __post_init__(self):
+        self._restaurar: List[Tuple[Any, str, Any]] = []
+        self._activas: Optional[List['Estadisticas']] = None
+
+    def instalar(self, interprete: Any) -> 'Estadisticas':
+        """
+        Empieza a contar en el hilo que llama. Se puede instalar sobre un
+        perfilador ya instalado.
+        """
+        ejecutar = interprete.ejecutar
+        llamar_funcion = interprete.llamar_funcion
+        nodos, llamadas = self.nodos, self.llamadas
+
+        def ejecutar_contado(nodo: Any) -> Any:
+            if type(nodo) is tuple:
+                nodos[nodo[0]] += 1
+            return ejecutar(nodo)
+
+        def llamar_funcion_contada(nombre: str, argumentos: List[Any], *resto: Any) -> Any:
+            llamadas[nombre] += 1
+            return llamar_funcion(nombre, argumentos, *resto)
+
+        self._reemplazar(interprete, 'ejecutar', ejecutar_contado)
+        self._reemplazar(interprete, 'llamar_funcion', llamar_funcion_contada)
+        _activar(self)
+        return self
+
+    def _reemplazar(self, objeto: Any, nombre: str, reemplazo: Any) -> None:
+        self._restaurar.append((objeto, nombre, vars(objeto).get(nombre, _FALTA)))
+        setattr(objeto, nombre, reemplazo)
+
+    def desinstalar(self) -> None:
+        """Deja de contar y restaura los métodos que había antes de instalar()."""
+        _desactivar(self)
+        while self._restaurar:
+            objeto, nombre, anterior = self._restaurar.pop()
+            if anterior is _FALTA:
+                delattr(objeto, nombre)
+            else:
+                setattr(objeto, nombre, anterior)
+
+    def como_diccionario(self) -> Dict[str, Any]:
+        return {
+            'nodos': dict(self.nodos.most_common()),
+            'llamadas': dict(self.llamadas.most_common()),
+            'valores': self.valores,
+            'entornos': self.entornos,
+            'busquedas': self.busquedas,
+            'saltos_entorno': self.saltos_entorno,
+            'saltos_maximos': self.saltos_maximos,
+            'crecimientos_ofrenda': self.crecimientos_ofrenda,
+            'copias_ofrenda': self.copias_ofrenda,
+        }
+
+    def informe(self, limite: int = 10) -> str:
+        """Resumen legible de los contadores."""
+        promedio = self.saltos_entorno / self.busquedas if self.busquedas else 0.0
+        renglones = [
+            "📊 Estadísticas del intérprete",
+            f"  nodos evaluados:      {sum(self.nodos.values())}",
+            *(f"    {cuenta:>10}  {tipo}" for tipo, cuenta in self.nodos.most_common(limite)),
+            f"  llamadas:             {sum(self.llamadas.values())}",
+            *(f"    {cuenta:>10}  {nombre}" for nombre, cuenta in self.llamadas.most_common(limite)),
+            f"  valores creados:      {self.valores}",
+            f"  entornos creados:     {self.entornos}",
+            f"  búsquedas de variables: {self.busquedas} "
+            f"({promedio:.2f} entornos recorridos en promedio, {self.saltos_maximos} como máximo)",
+            f"  elementos agregados a ofrendas: {self.crecimientos_ofrenda}",
+            f"  copias de ofrendas al escribir: {self.copias_ofrenda}",
+        ]
+        return "\n".join(renglones)
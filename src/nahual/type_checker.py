@@ -1,7 +1,9 @@
 # src/nahual/type_checker.py
 
-from typing import Optional
-from .types import TipoNahual, Valor, TipoError
+from itertools import product
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from .types import TipoNahual, Valor, TipoError, Mapa
+from .operators import ARITMETICOS, COMPARACIONES, LOGICOS, buscar_operacion
 from .error_handler import ErrorTipos, Ubicacion
 
 
@@ -22,66 +24,83 @@ class VerificadorTipos:
     @staticmethod
     def verificar_operacion(operador: str, izq: Valor, der: Valor, ubicacion: Optional[Ubicacion] = None) -> TipoNahual:
         """Verifica y retorna el tipo resultante de una operación binaria."""
-        # Operaciones aritméticas
-        if operador in {'unir', 'separar', 'multiplicar', 'dividir', 'residuo'}:
-            if not izq.tipo in {TipoNahual.ESPIRITU, TipoNahual.ENERGIA}:
-                raise ErrorTipos(
-                    f"Operador {operador} requiere operandos numéricos",
-                    tipo_esperado="espiritu/energia",
-                    tipo_recibido=izq.tipo.value,
-                    ubicacion=ubicacion
-                )
-            if not der.tipo in {TipoNahual.ESPIRITU, TipoNahual.ENERGIA}:
-                raise ErrorTipos(
-                    f"Operador {operador} requiere operandos numéricos",
-                    tipo_esperado="espiritu/energia",
-                    tipo_recibido=der.tipo.value,
-                    ubicacion=ubicacion
-                )
-            # Si alguno es energia, el resultado es energia
-            return TipoNahual.ENERGIA if TipoNahual.ENERGIA in {izq.tipo, der.tipo} else TipoNahual.ESPIRITU
+        operacion = buscar_operacion(operador, izq.tipo, der.tipo)
+        if operacion is None:
+            raise VerificadorTipos.error_operacion(operador, izq, der, ubicacion)
+        return operacion.resultado
 
-        # Concatenación de mantras
-        elif operador == 'unir' and izq.tipo == TipoNahual.MANTRA:
-            if not der.tipo == TipoNahual.MANTRA:
-                raise ErrorTipos(
-                    f"No se puede unir mantra con {der.tipo.value}",
-                    tipo_esperado="mantra",
-                    tipo_recibido=der.tipo.value,
-                    ubicacion=ubicacion
-                )
-            return TipoNahual.MANTRA
+    @staticmethod
+    def error_operacion(operador: str, izq: Valor, der: Valor, ubicacion: Optional[Ubicacion] = None) -> ErrorTipos:
+        """Error de una operación binaria que no está definida para los tipos de sus operandos."""
+        # Concatenación de mantras: el otro operando se convierte a texto
+        if operador == 'unir' and TipoNahual.MANTRA in {izq.tipo, der.tipo}:
+            otro = der if izq.tipo == TipoNahual.MANTRA else izq
+            return ErrorTipos(
+                f"No se puede unir mantra con {otro.tipo.value}",
+                tipo_esperado="mantra",
+                tipo_recibido=otro.tipo.value,
+                ubicacion=ubicacion
+            )
+
+        # Operaciones aritméticas
+        elif operador in ARITMETICOS:
+            invalido = der if izq.tipo in NUMERICOS else izq
+            return ErrorTipos(
+                f"Operador {operador} requiere operandos numéricos",
+                tipo_esperado="espiritu/energia",
+                tipo_recibido=invalido.tipo.value,
+                ubicacion=ubicacion
+            )
 
         # Operaciones lógicas
-        elif operador in {'y', 'o'}:
-            if not izq.tipo == TipoNahual.VERDAD:
-                raise ErrorTipos(
-                    f"Operador {operador} requiere operandos de tipo verdad",
-                    tipo_esperado="verdad",
+        elif operador in LOGICOS:
+            invalido = der if izq.tipo == TipoNahual.VERDAD else izq
+            return ErrorTipos(
+                f"Operador {operador} requiere operandos de tipo verdad",
+                tipo_esperado="verdad",
+                tipo_recibido=invalido.tipo.value,
+                ubicacion=ubicacion
+            )
+
+        # Comparaciones
+        elif operador in COMPARACIONES:
+            if izq.es_compatible_con(der):
+                return ErrorTipos(
+                    f"No se pueden ordenar valores de tipo {izq.tipo.value}",
+                    tipo_esperado="espiritu/energia/mantra/verdad",
                     tipo_recibido=izq.tipo.value,
                     ubicacion=ubicacion
                 )
-            if not der.tipo == TipoNahual.VERDAD:
+            return ErrorTipos(
+                f"No se pueden comparar tipos diferentes",
+                tipo_esperado=izq.tipo.value,
+                tipo_recibido=der.tipo.value,
+                ubicacion=ubicacion
+            )
+
+        raise ValueError(f"Operador desconocido: {operador}")
+
+    @staticmethod
+    def verificar_mapa(mapa: Mapa, tipo_claves: TipoNahual, tipo_valores: TipoNahual,
+                       ubicacion: Optional[Ubicacion] = None) -> None:
+        """Verifica que todas las entradas de un mapa respeten los tipos declarados."""
+        if mapa.tipo_claves == tipo_claves and mapa.tipo_valores == tipo_valores:
+            return
+        for clave, valor in mapa.pares():
+            if clave.tipo != tipo_claves:
                 raise ErrorTipos(
-                    f"Operador {operador} requiere operandos de tipo verdad",
-                    tipo_esperado="verdad",
-                    tipo_recibido=der.tipo.value,
+                    f"Clave {clave} inválida para el mapa",
+                    tipo_esperado=tipo_claves.value,
+                    tipo_recibido=clave.tipo.value,
                     ubicacion=ubicacion
                 )
-            return TipoNahual.VERDAD
-
-        # Comparaciones
-        elif operador in {'igual', 'mayor', 'menor', 'mayor_igual', 'menor_igual'}:
-            if not izq.es_compatible_con(der):
+            if valor.tipo != tipo_valores:
                 raise ErrorTipos(
-                    f"No se pueden comparar tipos diferentes",
-                    tipo_esperado=izq.tipo.value,
-                    tipo_recibido=der.tipo.value,
+                    f"Valor inválido para la clave {clave}",
+                    tipo_esperado=tipo_valores.value,
+                    tipo_recibido=valor.tipo.value,
                     ubicacion=ubicacion
                 )
-            return TipoNahual.VERDAD
-
-        raise ValueError(f"Operador desconocido: {operador}")
 
     @staticmethod
     def verificar_condicion(valor: Valor, ubicacion: Optional[Ubicacion] = None) -> None:
@@ -107,9 +126,366 @@ class VerificadorTipos:
             return TipoNahual.MANTRA
         elif isinstance(valor, list):
             return TipoNahual.LISTA
+        elif isinstance(valor, dict):
+            return TipoNahual.MAPA
         raise ValueError(f"No se puede inferir tipo para: {type(valor)}")
 
     @staticmethod
     def es_numerico(tipo: TipoNahual) -> bool:
         """Verifica si un tipo es numérico."""
-        return tipo in {TipoNahual.ESPIRITU, TipoNahual.ENERGIA}
\ No newline at end of file
+        return tipo in NUMERICOS
+
+
+# Tipo estático de una expresión: los tipos que puede tener su valor, o None si se desconoce
+TiposPosibles = Optional[FrozenSet[TipoNahual]]
+
+NUMERICOS = frozenset({TipoNahual.ESPIRITU, TipoNahual.ENERGIA})
+VERDAD = frozenset({TipoNahual.VERDAD})
+
+
+def _tipo_declarado(tipo: Any) -> Optional[TipoNahual]:
+    """Tipo base de una declaración: 'espiritu' o ('mapa', claves, valores)."""
+    try:
+        return TipoNahual(tipo[0] if isinstance(tipo, tuple) else tipo)
+    except ValueError:
+        return None
+
+
+def _clase(tipo: Optional[TipoNahual]) -> TiposPosibles:
+    """
+    Tipos que puede tener una variable declarada con `tipo`. Las declaraciones
+    y reasignaciones aceptan espiritu y energia indistintamente, así que de una
+    variable numérica sólo se sabe que es numérica.
+    """
+    if tipo is None:
+        return None
+    return NUMERICOS if tipo in NUMERICOS else frozenset({tipo})
+
+
+def _nombre(tipos: FrozenSet[TipoNahual]) -> str:
+    return "/".join(sorted(tipo.value for tipo in tipos))
+
+
+def _ubicacion(nodo_ubicacion: Any) -> Optional[Ubicacion]:
+    if isinstance(nodo_ubicacion, dict) and 'linea' in nodo_ubicacion:
+        return Ubicacion(nodo_ubicacion['linea'], nodo_ubicacion['columna'])
+    return None
+
+
+class _Ambito:
+    """Variables de un entorno (el global o el de una sabiduría) durante el análisis."""
+
+    def __init__(self, tipos: Dict[str, TiposPosibles]):
+        # Tipos de cada variable si todas sus ligaduras en el entorno coinciden
+        self.tipos = tipos
+        # Variables ligadas con seguridad en el punto que se analiza
+        self.definidas: Set[str] = set()
+
+    def tipo(self, nombre: str) -> TiposPosibles:
+        return self.tipos.get(nombre) if nombre in self.definidas else None
+
+
+class AnalizadorTipos:
+    """
+    Verificación estática de un programa completo con las reglas de VerificadorTipos.
+
+    Infiere los tipos de las expresiones y reporta todos los errores de tipos
+    que ocurrirían con seguridad al ejecutarlo. Retorna además un árbol nuevo
+    en el que los nodos con tipos ya probados se reemplazan por variantes
+    `*_verificada(o)` que el intérprete ejecuta sin repetir esas verificaciones.
+
+    Es conservador: una variable sólo tiene tipo conocido si está ligada con
+    seguridad en su entorno y todas sus ligaduras ahí son del mismo tipo. Las
+    variables libres de una sabiduría y los resultados de las llamadas son de
+    tipo desconocido, y lo desconocido nunca produce errores ni anotaciones.
+    """
+
+    def __init__(self):
+        self.errores: List[ErrorTipos] = []
+        self.firmas: Dict[str, list] = {}
+        self.ambito = _Ambito({})
+
+    def analizar(self, programa: Any) -> Tuple[Any, List[ErrorTipos]]:
+        """Retorna ('programa_verificado', ...) y la lista de errores encontrados."""
+        declaraciones = programa[1]
+        self._registrar_firmas(declaraciones)
+        self.ambito = _Ambito(self._ligaduras(declaraciones, {}))
+        nuevas = [self._declaracion(declaracion) for declaracion in declaraciones]
+        return ('programa_verificado', nuevas) + tuple(programa[2:]), self.errores
+
+    # --- Recolección previa ---
+
+    def _registrar_firmas(self, declaraciones: list) -> None:
+        """Guarda los parámetros de las sabidurías del nivel superior de nombre único."""
+        cantidades: Dict[str, int] = {}
+        for nodo in self._funciones(declaraciones):
+            cantidades[nodo[1]] = cantidades.get(nodo[1], 0) + 1
+        for nodo in declaraciones:
+            if isinstance(nodo, tuple) and nodo[0] == 'funcion_declaracion' and cantidades[nodo[1]] == 1:
+                self.firmas[nodo[1]] = nodo[2]
+
+    def _funciones(self, nodo: Any):
+        """Todas las declaraciones de sabidurías, a cualquier profundidad."""
+        if isinstance(nodo, list):
+            for hijo in nodo:
+                yield from self._funciones(hijo)
+        elif isinstance(nodo, tuple) and nodo and isinstance(nodo[0], str):
+            if nodo[0] == 'funcion_declaracion':
+                yield nodo
+            for hijo in nodo[1:]:
+                yield from self._funciones(hijo)
+
+    def _ligaduras(self, declaraciones: list, tipos: Dict[str, TiposPosibles]) -> Dict[str, TiposPosibles]:
+        """Reúne las ligaduras de variables de un entorno, sin entrar a sabidurías anidadas."""
+        def ligar(nombre: str, tipo: TiposPosibles) -> None:
+            tipos[nombre] = tipo if tipos.get(nombre, tipo) == tipo else None
+
+        for nodo in declaraciones:
+            if not isinstance(nodo, tuple):
+                continue
+            tipo_nodo = nodo[0]
+            if tipo_nodo == 'var_declaracion':
+                ligar(nodo[2], _clase(_tipo_declarado(nodo[1])))
+            elif tipo_nodo == 'para_rango':
+                ligar(nodo[1], NUMERICOS)
+                self._ligaduras(nodo[4][1], tipos)
+            elif tipo_nodo == 'para_cada':
+                ligar(nodo[1], None)
+                self._ligaduras(nodo[3][1], tipos)
+            elif tipo_nodo == 'ritual':
+                self._ligaduras(nodo[2][1], tipos)
+            elif tipo_nodo == 'vision':
+                for rama in (nodo[2], nodo[3]):
+                    if rama:
+                        self._ligaduras(rama[1], tipos)
+            elif tipo_nodo == 'bloque':
+                self._ligaduras(nodo[1], tipos)
+        return tipos
+
+    # --- Declaraciones ---
+
+    def _error(self, mensaje: str, esperado: str, recibido: str, ubicacion: Any) -> None:
+        self.errores.append(ErrorTipos(mensaje, tipo_esperado=esperado, tipo_recibido=recibido,
+                                       ubicacion=_ubicacion(ubicacion)))
+
+    def _bloque(self, bloque: Any, definidas: Optional[Set[str]] = None) -> Any:
+        """Analiza un bloque; lo que declara no queda ligado con seguridad al salir."""
+        if not bloque:
+            return bloque
+        anteriores = set(self.ambito.definidas)
+        self.ambito.definidas |= definidas or set()
+        nuevas = [self._declaracion(declaracion) for declaracion in bloque[1]]
+        self.ambito.definidas = anteriores
+        return ('bloque', nuevas) + tuple(bloque[2:])
+
+    def _declaracion(self, nodo: Any) -> Any:
+        if not isinstance(nodo, tuple):
+            return nodo
+        metodo = getattr(self, f'_declaracion_{nodo[0]}', None)
+        if metodo is None:
+            return self._expresion(nodo)[1]
+        return metodo(*nodo[1:])
+
+    def _declaracion_var_declaracion(self, tipo: Any, nombre: str, valor: Any, ubicacion: Any) -> tuple:
+        tipos, valor = self._expresion(valor)
+        self.ambito.definidas.add(nombre)
+        destino = _tipo_declarado(tipo)
+        if tipos is None or destino is None:
+            return ('var_declaracion', tipo, nombre, valor, ubicacion)
+        if not tipos & _clase(destino):
+            self._error(f"Tipo incompatible en asignación a '{nombre}'",
+                        destino.value, _nombre(tipos), ubicacion)
+        elif tipos <= _clase(destino) and not isinstance(tipo, tuple):
+            # Los mapas tipados se verifican al ejecutarse: sus entradas no se conocen aquí
+            return ('var_declaracion_verificada', tipo, nombre, valor, ubicacion)
+        return ('var_declaracion', tipo, nombre, valor, ubicacion)
+
+    def _declaracion_asignacion(self, nombre: str, valor: Any, ubicacion: Any) -> tuple:
+        tipos, valor = self._expresion(valor)
+        destino = self.ambito.tipo(nombre)
+        if tipos is None or destino is None:
+            return ('asignacion', nombre, valor, ubicacion)
+        if tipos <= destino:
+            return ('asignacion_verificada', nombre, valor, ubicacion)
+        if not tipos & destino:
+            self._error(f"Tipo incompatible en asignación a '{nombre}'",
+                        _nombre(destino), _nombre(tipos), ubicacion)
+        return ('asignacion', nombre, valor, ubicacion)
+
+    def _declaracion_asignacion_indice(self, coleccion: Any, indice: Any, valor: Any, ubicacion: Any) -> tuple:
+        tipos, coleccion = self._expresion(coleccion)
+        indice = self._expresion(indice)[1]
+        valor = self._expresion(valor)[1]
+        if tipos is not None and not tipos & {TipoNahual.LISTA, TipoNahual.MAPA}:
+            self._error("No se puede asignar por índice", "ofrenda/mapa", _nombre(tipos), ubicacion)
+        return ('asignacion_indice', coleccion, indice, valor, ubicacion)
+
+    def _declaracion_funcion_declaracion(self, nombre: str, parametros: list, cuerpo: Any,
+                                         ubicacion: Any) -> tuple:
+        tipos = {param_nombre: _clase(_tipo_declarado(tipo)) for tipo, param_nombre in parametros}
+        ambito_anterior = self.ambito
+        self.ambito = _Ambito(self._ligaduras(cuerpo[1], tipos))
+        self.ambito.definidas.update(param_nombre for _, param_nombre in parametros)
+        cuerpo = self._bloque(cuerpo)
+        self.ambito = ambito_anterior
+        return ('funcion_declaracion', nombre, parametros, cuerpo, ubicacion)
+
+    def _condicion(self, condicion: Any, ubicacion: Any) -> Tuple[bool, Any]:
+        """Analiza una condición; retorna si se probó que es una verdad."""
+        tipos, condicion = self._expresion(condicion)
+        if tipos is not None and TipoNahual.VERDAD not in tipos:
+            self._error("La condición debe ser de tipo verdad", "verdad", _nombre(tipos), ubicacion)
+        return tipos == VERDAD, condicion
+
+    def _declaracion_ritual(self, condicion: Any, cuerpo: Any, ubicacion: Any) -> tuple:
+        probada, condicion = self._condicion(condicion, ubicacion)
+        cuerpo = self._bloque(cuerpo)
+        return ('ritual_verificado' if probada else 'ritual', condicion, cuerpo, ubicacion)
+
+    def _declaracion_vision(self, condicion: Any, verdadero: Any, falso: Any, ubicacion: Any) -> tuple:
+        probada, condicion = self._condicion(condicion, ubicacion)
+        verdadero, falso = self._bloque(verdadero), self._bloque(falso)
+        return ('vision_verificada' if probada else 'vision', condicion, verdadero, falso, ubicacion)
+
+    def _declaracion_para_rango(self, nombre: str, inicio: Any, fin: Any, cuerpo: Any, ubicacion: Any) -> tuple:
+        (tipos_inicio, inicio), (tipos_fin, fin) = self._expresion(inicio), self._expresion(fin)
+        for tipos in (tipos_inicio, tipos_fin):
+            if tipos is not None and TipoNahual.ESPIRITU not in tipos:
+                self._error("Los límites de un ciclo para deben ser espiritus (enteros)",
+                            "espiritu", _nombre(tipos), ubicacion)
+        cuerpo = self._bloque(cuerpo, {nombre})
+        return ('para_rango', nombre, inicio, fin, cuerpo, ubicacion)
+
+    def _declaracion_para_cada(self, nombre: str, iterable: Any, cuerpo: Any, ubicacion: Any) -> tuple:
+        tipos, iterable = self._expresion(iterable)
+        if tipos is not None and tipos <= {TipoNahual.ESPIRITU, TipoNahual.ENERGIA, TipoNahual.VERDAD}:
+            self._error("No se puede recorrer el valor", "ofrenda/mapa/mantra/pergamino",
+                        _nombre(tipos), ubicacion)
+        cuerpo = self._bloque(cuerpo, {nombre})
+        return ('para_cada', nombre, iterable, cuerpo, ubicacion)
+
+    def _declaracion_bloque(self, declaraciones: list, *resto: Any) -> tuple:
+        return self._bloque(('bloque', declaraciones) + resto)
+
+    def _declaracion_expresion_stmt(self, expresion: Any, *resto: Any) -> tuple:
+        return ('expresion_stmt', self._expresion(expresion)[1]) + resto
+
+    def _declaracion_retorno(self, expresion: Any, *resto: Any) -> tuple:
+        return ('retorno', self._expresion(expresion)[1]) + resto
+
+    # --- Expresiones ---
+
+    def _expresion(self, nodo: Any) -> Tuple[TiposPosibles, Any]:
+        """Retorna los tipos posibles de la expresión y su nodo, quizá reemplazado."""
+        if not isinstance(nodo, tuple) or not nodo:
+            return None, nodo
+        metodo = getattr(self, f'_expresion_{nodo[0]}', None)
+        if metodo is None:
+            return None, nodo
+        return metodo(*nodo[1:])
+
+    def _expresion_literal(self, valor: Any, *resto: Any) -> Tuple[TiposPosibles, Any]:
+        nodo = ('literal', valor) + resto
+        try:
+            return frozenset({VerificadorTipos.inferir_tipo_literal(valor)}), nodo
+        except ValueError:
+            return None, nodo
+
+    def _expresion_variable(self, nombre: str, *resto: Any) -> Tuple[TiposPosibles, Any]:
+        return self.ambito.tipo(nombre), ('variable', nombre) + resto
+
+    def _expresion_lista(self, elementos: list, *resto: Any) -> Tuple[TiposPosibles, Any]:
+        elementos = [self._expresion(elemento)[1] for elemento in elementos]
+        return frozenset({TipoNahual.LISTA}), ('lista', elementos) + resto
+
+    def _expresion_mapa(self, entradas: list, *resto: Any) -> Tuple[TiposPosibles, Any]:
+        entradas = [(self._expresion(clave)[1], self._expresion(valor)[1]) for clave, valor in entradas]
+        return frozenset({TipoNahual.MAPA}), ('mapa', entradas) + resto
+
+    def _expresion_acceso_lista(self, coleccion: Any, indice: Any, ubicacion: Any) -> Tuple[TiposPosibles, Any]:
+        (tipos, coleccion), (tipos_indice, indice) = self._expresion(coleccion), self._expresion(indice)
+        if tipos is not None and not tipos & {TipoNahual.LISTA, TipoNahual.MAPA}:
+            self._error("No se puede acceder por índice", "ofrenda/mapa", _nombre(tipos), ubicacion)
+        elif tipos == frozenset({TipoNahual.LISTA}) and tipos_indice is not None \
+                and TipoNahual.ESPIRITU not in tipos_indice:
+            self._error("El índice debe ser un espiritu (entero)", "espiritu", _nombre(tipos_indice), ubicacion)
+        return None, ('acceso_lista', coleccion, indice, ubicacion)
+
+    def _expresion_rebanada(self, lista: Any, inicio: Any, fin: Any, ubicacion: Any) -> Tuple[TiposPosibles, Any]:
+        tipos, lista = self._expresion(lista)
+        inicio = self._expresion(inicio)[1] if inicio is not None else None
+        fin = self._expresion(fin)[1] if fin is not None else None
+        if tipos is not None and TipoNahual.LISTA not in tipos:
+            self._error("No se puede rebanar el valor", "ofrenda", _nombre(tipos), ubicacion)
+        return frozenset({TipoNahual.LISTA}), ('rebanada', lista, inicio, fin, ubicacion)
+
+    def _expresion_operacion_unaria(self, op: str, expresion: Any, *resto: Any) -> Tuple[TiposPosibles, Any]:
+        tipos, expresion = self._expresion(expresion)
+        if op == 'no':
+            resultado = VERDAD
+        else:
+            resultado = tipos if tipos is not None and tipos <= NUMERICOS else None
+        return resultado, ('operacion_unaria', op, expresion) + resto
+
+    def _expresion_operacion(self, op: str, izq: Any, der: Any, ubicacion: Any) -> Tuple[TiposPosibles, Any]:
+        (tipos_izq, izq), (tipos_der, der) = self._expresion(izq), self._expresion(der)
+        nodo = ('operacion', op, izq, der, ubicacion)
+        if tipos_izq is None or tipos_der is None:
+            return None, nodo
+        # Con una ofrenda la operación es elemento a elemento y se verifica al ejecutarse
+        if TipoNahual.LISTA in tipos_izq | tipos_der:
+            lista = frozenset({TipoNahual.LISTA})
+            return (lista if lista in (tipos_izq, tipos_der) else None), nodo
+
+        resultados: Set[TipoNahual] = set()
+        errores: List[ErrorTipos] = []
+        for tipo_izq, tipo_der in product(tipos_izq, tipos_der):
+            try:
+                resultado = VerificadorTipos.verificar_operacion(
+                    op, Valor(tipo_izq, None), Valor(tipo_der, None), _ubicacion(ubicacion))
+            except ErrorTipos as e:
+                errores.append(e)
+            except ValueError:
+                return None, nodo
+            else:
+                resultados.add(resultado)
+        if errores and not resultados:
+            self.errores.append(errores[0])
+        return (frozenset(resultados) if not errores else None), nodo
+
+    def _expresion_llamada_sistema(self, tipo: str, argumentos: list, *resto: Any) -> Tuple[TiposPosibles, Any]:
+        argumentos = [self._expresion(argumento)[1] for argumento in argumentos]
+        tipos = {'invocar': VERDAD, 'percibir': frozenset({TipoNahual.MANTRA})}.get(tipo)
+        return tipos, ('llamada_sistema', tipo, argumentos) + resto
+
+    def _expresion_llamada_funcion(self, nombre: str, argumentos: list, ubicacion: Any = None) \
+            -> Tuple[TiposPosibles, Any]:
+        analizados = [self._expresion(argumento) for argumento in argumentos]
+        argumentos = [nodo for _, nodo in analizados]
+        parametros = self.firmas.get(nombre)
+        if parametros is None or len(parametros) != len(argumentos):
+            return None, ('llamada_funcion', nombre, argumentos, ubicacion)
+
+        probados = True
+        for (tipo, param_nombre), (tipos, _) in zip(parametros, analizados):
+            destino = _clase(_tipo_declarado(tipo))
+            if tipos is None or destino is None or isinstance(tipo, tuple):
+                probados = False
+            elif not tipos <= destino:
+                probados = False
+                if not tipos & destino:
+                    self._error(f"Argumento inválido para parámetro '{param_nombre}' de '{nombre}'",
+                                _tipo_declarado(tipo).value, _nombre(tipos), ubicacion)
+        if probados:
+            # El intérprete omite las verificaciones sólo si la sabiduría llamada es ésta
+            return None, ('llamada_funcion_verificada', nombre, argumentos, parametros, ubicacion)
+        return None, ('llamada_funcion', nombre, argumentos, ubicacion)
+
+
+def verificar_programa(programa: Any) -> Tuple[Any, List[ErrorTipos]]:
+    """
+    Verifica estáticamente los tipos de un programa ya parseado. Retorna el
+    árbol anotado para el intérprete y la lista de errores de tipos; un
+    programa con errores no debe ejecutarse con el árbol anotado.
+    """
+    return AnalizadorTipos().analizar(programa)
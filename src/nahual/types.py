@@ -1,6 +1,9 @@
+import operator
+from array import array
 from enum import Enum
-from dataclasses import dataclass
-from typing import Any, Dict, List, Union, Optional
+from functools import partial
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Tuple, Union, Optional
 
 
 class TipoNahual(Enum):
@@ -10,25 +13,278 @@ class TipoNahual(Enum):
     VERDAD = 'verdad'  # Booleanos
     LISTA = 'lista'  # Lista de valores
     MAPA = 'mapa'  # Diccionario/Mapa
+    PERGAMINO = 'pergamino'  # Archivo abierto
+
+    @classmethod
+    def _missing_(cls, valor):
+        # En el código fuente las listas se declaran como 'ofrenda'
+        if valor == 'ofrenda':
+            return cls.LISTA
+        return None
+
+
+# Códigos de array.array para ofrendas compactas de valores numéricos crudos
+CODIGOS_CRUDOS = {TipoNahual.ESPIRITU: 'q', TipoNahual.ENERGIA: 'd'}
+
+
+class _Almacen:
+    """
+    Almacenamiento compartido entre una ofrenda y sus vistas.
+
+    `referencias` se actualiza sin cerrojo: se asume que una ofrenda y sus
+    vistas se usan desde un solo hilo, como ocurre con las de un intérprete
+    (mapear_paralelo envía copias a otros procesos). Si dos hilos las
+    compartieran, un conteo perdido podría dejar escribir en un almacén que
+    otra vista aún ve.
+    """
+    __slots__ = ('datos', 'referencias', 'crudo')
+
+    def __init__(self, datos: Any, crudo: Optional[TipoNahual] = None):
+        self.datos = datos
+        self.referencias = 1
+        self.crudo = crudo  # Tipo de los números crudos, o None si guarda Valores
 
 
-@dataclass
 class Lista:
-    elementos: List['Valor']
-    tipo_elementos: Optional[TipoNahual] = None  # Para listas tipadas
+    """
+    Ofrenda de valores.
 
-    def agregar(self, valor: 'Valor') -> None:
+    Las rebanadas son vistas O(1) sobre el almacenamiento de la ofrenda
+    original. Mientras el almacenamiento esté compartido, la primera
+    modificación (agregar o asignar por índice) copia la porción visible,
+    de modo que ni la original ni la vista observan cambios de la otra.
+
+    Las ofrendas de espiritus o energias creadas con `desde_crudos` guardan
+    los números en un array.array y sólo los envuelven en Valor al leerlos.
+    Si un espiritu no cabe en 64 bits la ofrenda vuelve a guardar Valores.
+    """
+    __slots__ = ('_almacen', '_inicio', '_fin', 'tipo_elementos')
+
+    def __init__(self, elementos: Optional[List['Valor']] = None,
+                 tipo_elementos: Optional[TipoNahual] = None):
+        self._almacen = _Almacen(elementos if elementos is not None else [])
+        self._inicio = 0
+        self._fin = len(self._almacen.datos)
+        self.tipo_elementos = tipo_elementos  # Para listas tipadas
+
+    @classmethod
+    def desde_crudos(cls, valores: Any, tipo: TipoNahual) -> 'Lista':
+        """Crea una ofrenda tipada compacta a partir de números de Python."""
+        codigo = CODIGOS_CRUDOS[tipo]
+        if not (isinstance(valores, array) and valores.typecode == codigo):
+            try:
+                valores = array(codigo, valores)
+            except OverflowError:
+                return cls([Valor(tipo, x) for x in valores], tipo)
+        lista = cls.__new__(cls)
+        lista._almacen = _Almacen(valores, tipo)
+        lista._inicio = 0
+        lista._fin = len(valores)
+        lista.tipo_elementos = tipo
+        return lista
+
+    def __del__(self):
+        almacen = getattr(self, '_almacen', None)
+        if almacen is not None:
+            almacen.referencias -= 1
+
+    @property
+    def compacta(self) -> bool:
+        return self._almacen.crudo is not None
+
+    @property
+    def elementos(self) -> Tuple['Valor', ...]:
+        """
+        Copia inmutable de los elementos visibles. No expone el almacenamiento,
+        que puede estar compartido con otras vistas; para recorrerlos sin
+        copiar basta iterar la ofrenda.
+        """
+        if self._almacen.crudo is not None:
+            return tuple(self)
+        return tuple(self._almacen.datos[self._inicio:self._fin])
+
+    def _preparar_escritura(self) -> Any:
+        almacen = self._almacen
+        if almacen.referencias > 1 or self._inicio != 0 or self._fin != len(almacen.datos):
+            almacen.referencias -= 1
+            self._almacen = _Almacen(almacen.datos[self._inicio:self._fin], almacen.crudo)
+            self._inicio = 0
+            self._fin = len(self._almacen.datos)
+        return self._almacen.datos
+
+    def _descompactar(self) -> List['Valor']:
+        """Pasa de números crudos a Valores (por ejemplo, ante un desbordamiento)."""
+        elementos = list(self)
+        self._almacen.referencias -= 1
+        self._almacen = _Almacen(elementos)
+        self._inicio = 0
+        self._fin = len(elementos)
+        return elementos
+
+    def _verificar_tipo(self, valor: 'Valor') -> None:
         if self.tipo_elementos and valor.tipo != self.tipo_elementos:
             raise TipoError(f"No se puede agregar {valor.tipo} a lista de {self.tipo_elementos}")
-        self.elementos.append(valor)
+
+    def agregar(self, valor: 'Valor') -> None:
+        self._verificar_tipo(valor)
+        datos = self._preparar_escritura()
+        if self._almacen.crudo is not None:
+            try:
+                datos.append(valor.valor)
+                self._fin += 1
+                return
+            except OverflowError:
+                datos = self._descompactar()
+        datos.append(valor)
+        self._fin += 1
 
     def obtener(self, indice: int) -> 'Valor':
-        if not (0 <= indice < len(self.elementos)):
+        if not (0 <= indice < self._fin - self._inicio):
             raise IndexError(f"Índice {indice} fuera de rango")
-        return self.elementos[indice]
+        dato = self._almacen.datos[self._inicio + indice]
+        crudo = self._almacen.crudo
+        return dato if crudo is None else Valor(crudo, dato)
+
+    def asignar(self, indice: int, valor: 'Valor') -> None:
+        if not (0 <= indice < self._fin - self._inicio):
+            raise IndexError(f"Índice {indice} fuera de rango")
+        self._verificar_tipo(valor)
+        datos = self._preparar_escritura()
+        if self._almacen.crudo is not None:
+            try:
+                datos[indice] = valor.valor
+                return
+            except OverflowError:
+                datos = self._descompactar()
+        datos[indice] = valor
+
+    def rebanar(self, inicio: Optional[int] = None, fin: Optional[int] = None) -> 'Lista':
+        """Retorna una vista de los elementos [inicio, fin) sin copiarlos."""
+        inicio, fin, _ = slice(inicio, fin).indices(self._fin - self._inicio)
+        vista = Lista.__new__(Lista)
+        vista._almacen = self._almacen
+        vista._inicio = self._inicio + inicio
+        vista._fin = self._inicio + max(inicio, fin)
+        vista.tipo_elementos = self.tipo_elementos
+        self._almacen.referencias += 1
+        return vista
+
+    def longitud(self) -> int:
+        return self._fin - self._inicio
+
+    def valores_crudos(self) -> List[Any]:
+        """Retorna los valores de Python de los elementos, sin envolver."""
+        if self._almacen.crudo is not None:
+            return self.datos_crudos().tolist()
+        return [elemento.valor for elemento in self]
+
+    def datos_crudos(self) -> Any:
+        """
+        Como valores_crudos, pero sin copiar en una ofrenda compacta completa:
+        retorna el propio array.array, que no debe modificarse.
+        """
+        almacen = self._almacen
+        if almacen.crudo is None:
+            return self.valores_crudos()
+        if self._inicio == 0 and self._fin == len(almacen.datos):
+            return almacen.datos
+        return almacen.datos[self._inicio:self._fin]
+
+    def __len__(self) -> int:
+        return self._fin - self._inicio
+
+    def __iter__(self) -> Iterator['Valor']:
+        almacen = self._almacen
+        elementos = map(almacen.datos.__getitem__, range(self._inicio, self._fin))
+        if almacen.crudo is not None:
+            return map(partial(Valor, almacen.crudo), elementos)
+        return elementos
+
+    def __eq__(self, otra: Any) -> bool:
+        if not isinstance(otra, Lista):
+            return NotImplemented
+        return (self.tipo_elementos == otra.tipo_elementos and len(self) == len(otra)
+                and all(map(operator.eq, self, otra)))
+
+    def __repr__(self) -> str:
+        return f"Lista(elementos={self.elementos!r}, tipo_elementos={self.tipo_elementos!r})"
+
+    def __getstate__(self):
+        if self._almacen.crudo is not None:
+            return self.datos_crudos(), self.tipo_elementos, True
+        return self.elementos, self.tipo_elementos, False
+
+    def __setstate__(self, estado):
+        elementos, tipo_elementos, compacta = estado
+        self._almacen = _Almacen(elementos if compacta else list(elementos),
+                                 tipo_elementos if compacta else None)
+        self._inicio = 0
+        self._fin = len(elementos)
+        self.tipo_elementos = tipo_elementos
+
+
+@dataclass
+class Mapa:
+    """
+    Mapa hash con operaciones O(1).
+
+    Las claves mantra y espiritu se guardan directamente como str/int de Python;
+    el resto se guarda como tupla (tipo, valor) para no confundir, por ejemplo,
+    el espiritu 1 con la energia 1.0 o la verdad cierto.
+    """
+    entradas: Dict[Any, 'Valor'] = field(default_factory=dict)
+    tipo_claves: Optional[TipoNahual] = None  # Para mapas tipados
+    tipo_valores: Optional[TipoNahual] = None
+
+    @staticmethod
+    def _clave(clave: 'Valor') -> Any:
+        if clave.tipo == TipoNahual.MANTRA:
+            return str(clave.valor)
+        if clave.tipo == TipoNahual.ESPIRITU:
+            return clave.valor
+        if clave.tipo in {TipoNahual.LISTA, TipoNahual.MAPA}:
+            raise TipoError(f"Una {clave.tipo.value} no puede usarse como clave de mapa")
+        return clave.tipo, clave.valor
+
+    @staticmethod
+    def _valor_clave(clave: Any) -> 'Valor':
+        if isinstance(clave, str):
+            return Valor(TipoNahual.MANTRA, clave)
+        if isinstance(clave, int):
+            return Valor(TipoNahual.ESPIRITU, clave)
+        return Valor(*clave)
+
+    def poner(self, clave: 'Valor', valor: 'Valor') -> None:
+        if self.tipo_claves and clave.tipo != self.tipo_claves:
+            raise TipoError(f"No se puede usar clave {clave.tipo} en mapa de claves {self.tipo_claves}")
+        if self.tipo_valores and valor.tipo != self.tipo_valores:
+            raise TipoError(f"No se puede guardar {valor.tipo} en mapa de valores {self.tipo_valores}")
+        self.entradas[self._clave(clave)] = valor
+
+    def obtener(self, clave: 'Valor') -> 'Valor':
+        try:
+            return self.entradas[self._clave(clave)]
+        except KeyError:
+            raise KeyError(f"Clave {clave} no existe en el mapa")
+
+    def contiene(self, clave: 'Valor') -> bool:
+        return self._clave(clave) in self.entradas
+
+    def quitar(self, clave: 'Valor') -> 'Valor':
+        try:
+            return self.entradas.pop(self._clave(clave))
+        except KeyError:
+            raise KeyError(f"Clave {clave} no existe en el mapa")
 
     def longitud(self) -> int:
-        return len(self.elementos)
+        return len(self.entradas)
+
+    def claves(self) -> Iterator['Valor']:
+        return map(self._valor_clave, self.entradas)
+
+    def pares(self) -> Iterator[Tuple['Valor', 'Valor']]:
+        for clave, valor in self.entradas.items():
+            yield self._valor_clave(clave), valor
 
 
 @dataclass
@@ -40,6 +296,8 @@ class Valor:
     def __str__(self):
         if self.tipo == TipoNahual.LISTA:
             return f"[{', '.join(str(x) for x in self.valor.elementos)}]"
+        if self.tipo == TipoNahual.MAPA:
+            return f"{{{', '.join(f'{k}: {v}' for k, v in self.valor.pares())}}}"
         return str(self.valor)
 
     def es_compatible_con(self, otro: 'Valor') -> bool:
@@ -70,24 +328,26 @@ class Valor:
         if self.tipo == tipo_destino:
             return self
 
-        conversiones = {
-            (TipoNahual.ESPIRITU, TipoNahual.ENERGIA): lambda x: float(x),
-            (TipoNahual.ENERGIA, TipoNahual.ESPIRITU): lambda x: int(x),
-            (TipoNahual.ESPIRITU, TipoNahual.MANTRA): lambda x: str(x),
-            (TipoNahual.ENERGIA, TipoNahual.MANTRA): lambda x: str(x),
-            (TipoNahual.MANTRA, TipoNahual.ESPIRITU): lambda x: int(x),
-            (TipoNahual.MANTRA, TipoNahual.ENERGIA): lambda x: float(x),
-        }
-
-        try:
-            conversion = conversiones.get((self.tipo, tipo_destino))
-            if conversion:
-                return Valor(tipo_destino, conversion(self.valor))
+        conversion = CONVERSIONES.get((self.tipo, tipo_destino))
+        if conversion is None:
             raise TipoError(f"No se puede convertir de {self.tipo} a {tipo_destino}")
+        try:
+            return Valor(tipo_destino, conversion(self.valor))
         except (ValueError, TypeError) as e:
             raise TipoError(f"Error al convertir valor: {e}")
 
 
+# Conversiones explícitas por (tipo de origen, tipo de destino)
+CONVERSIONES: Dict[Tuple[TipoNahual, TipoNahual], Any] = {
+    (TipoNahual.ESPIRITU, TipoNahual.ENERGIA): float,
+    (TipoNahual.ENERGIA, TipoNahual.ESPIRITU): int,
+    (TipoNahual.ESPIRITU, TipoNahual.MANTRA): str,
+    (TipoNahual.ENERGIA, TipoNahual.MANTRA): str,
+    (TipoNahual.MANTRA, TipoNahual.ESPIRITU): int,
+    (TipoNahual.MANTRA, TipoNahual.ENERGIA): float,
+}
+
+
 class TipoError(Exception):
     def __init__(self, mensaje: str, valor: Optional[Valor] = None):
         self.mensaje = mensaje
@@ -0,0 +1,178 @@
+# src/nahual/vector_ops.py
+
+import operator
+from array import array
+from itertools import repeat
+from typing import Any, Callable, Dict, List
+
+from .types import CODIGOS_CRUDOS, TipoNahual, Valor, Lista, TipoError
+from .error_handler import ErrorEjecucion
+from .operators import TABLA_OPERACIONES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional; se usa la ruta en Python puro
+    np = None
+
+
+# Por debajo de este tamaño crear arreglos de NumPy cuesta más de lo que ahorra
+UMBRAL_NUMPY = 64
+
+# Los espiritus se operan en int64 sólo si no hay riesgo de desbordamiento
+LIMITE_ENTERO_SEGURO = 2 ** 31
+
+TIPOS_NUMERICOS = frozenset({TipoNahual.ESPIRITU, TipoNahual.ENERGIA})
+
+OPERACIONES_ARITMETICAS: Dict[str, Callable[[Any, Any], Any]] = {
+    'unir': operator.add,
+    'separar': operator.sub,
+    'multiplicar': operator.mul,
+    'dividir': operator.truediv,
+    'residuo': operator.mod,
+}
+
+OPERACIONES_COMPARACION: Dict[str, Callable[[Any, Any], Any]] = {
+    'mayor': operator.gt,
+    'menor': operator.lt,
+    'igual': operator.eq,
+}
+
+
+def tipo_elementos_numericos(lista: Lista) -> TipoNahual:
+    """Determina el tipo numérico de una ofrenda o lanza TipoError si no lo es."""
+    if lista.tipo_elementos in TIPOS_NUMERICOS:
+        return lista.tipo_elementos
+    tipos = {elemento.tipo for elemento in lista}
+    if not tipos or not tipos <= TIPOS_NUMERICOS:
+        raise TipoError("Las operaciones sobre ofrendas requieren elementos espiritu o energia")
+    return TipoNahual.ENERGIA if TipoNahual.ENERGIA in tipos else TipoNahual.ESPIRITU
+
+
+def _tipo_resultado(op: str, tipo_izq: TipoNahual, tipo_der: TipoNahual) -> TipoNahual:
+    return TABLA_OPERACIONES[op, tipo_izq, tipo_der].resultado
+
+
+def _operando(valor: Valor):
+    """Extrae los datos crudos y el tipo numérico de un operando."""
+    if valor.tipo == TipoNahual.LISTA:
+        return valor.valor.datos_crudos(), tipo_elementos_numericos(valor.valor), True
+    if valor.tipo not in TIPOS_NUMERICOS:
+        raise TipoError(f"No se puede operar una ofrenda con un valor de tipo {valor.tipo.value}")
+    return valor.valor, valor.tipo, False
+
+
+def _usar_numpy(datos: Any, tipo: TipoNahual) -> bool:
+    if np is None or len(datos) < UMBRAL_NUMPY:
+        return False
+    if tipo == TipoNahual.ESPIRITU:
+        if isinstance(datos, array):
+            # Un array 'q' ya cabe en int64; basta con revisar su rango sin iterar en Python
+            arreglo = np.frombuffer(datos, dtype=np.int64)
+            return max(-int(arreglo.min()), int(arreglo.max())) < LIMITE_ENTERO_SEGURO
+        return max(abs(min(datos)), abs(max(datos))) < LIMITE_ENTERO_SEGURO
+    return True
+
+
+def _vectorizable(datos: Any, tipo: TipoNahual, es_lista: bool) -> bool:
+    if es_lista:
+        return _usar_numpy(datos, tipo)
+    return tipo == TipoNahual.ENERGIA or abs(datos) < LIMITE_ENTERO_SEGURO
+
+
+def _a_arreglo(datos: Any, tipo: TipoNahual, es_lista: bool):
+    if not es_lista:
+        return datos
+    return np.asarray(datos, dtype=np.int64 if tipo == TipoNahual.ESPIRITU else np.float64)
+
+
+def _lista_resultado(resultado: Any, tipo: TipoNahual) -> Lista:
+    """Envuelve el resultado; los numéricos quedan como ofrenda compacta."""
+    if tipo not in TIPOS_NUMERICOS:
+        if np is not None and isinstance(resultado, np.ndarray):
+            resultado = resultado.tolist()
+        return Lista([Valor(tipo, x) for x in resultado], tipo)
+    if np is not None and isinstance(resultado, np.ndarray):
+        crudos = array(CODIGOS_CRUDOS[tipo])
+        dtype = np.int64 if tipo == TipoNahual.ESPIRITU else np.float64
+        crudos.frombytes(resultado.astype(dtype, copy=False).tobytes())
+        return Lista.desde_crudos(crudos, tipo)
+    return Lista.desde_crudos(resultado, tipo)
+
+
+def operar_elemento_a_elemento(op: str, izq: Valor, der: Valor) -> Valor:
+    """
+    Aplica un operador aritmético o de comparación elemento a elemento.
+
+    Admite ofrenda con ofrenda (de igual longitud) y ofrenda con escalar en
+    cualquier orden. Usa NumPy para ofrendas grandes cuando está disponible.
+    """
+    funcion = OPERACIONES_ARITMETICAS.get(op) or OPERACIONES_COMPARACION.get(op)
+    if funcion is None:
+        raise TipoError(f"Operador {op} no admite ofrendas")
+
+    datos_izq, tipo_izq, lista_izq = _operando(izq)
+    datos_der, tipo_der, lista_der = _operando(der)
+    if lista_izq and lista_der and len(datos_izq) != len(datos_der):
+        raise ErrorEjecucion(
+            f"Las ofrendas tienen longitudes distintas ({len(datos_izq)} y {len(datos_der)})"
+        )
+
+    if op in {'dividir', 'residuo'}:
+        if (0 in datos_der) if lista_der else datos_der == 0:
+            raise ErrorEjecucion("División por cero")
+
+    tipo_resultado = _tipo_resultado(op, tipo_izq, tipo_der)
+
+    if (np is not None and _vectorizable(datos_izq, tipo_izq, lista_izq)
+            and _vectorizable(datos_der, tipo_der, lista_der)):
+        resultado = funcion(_a_arreglo(datos_izq, tipo_izq, lista_izq),
+                            _a_arreglo(datos_der, tipo_der, lista_der))
+    elif lista_izq and lista_der:
+        resultado = list(map(funcion, datos_izq, datos_der))
+    elif lista_izq:
+        resultado = list(map(funcion, datos_izq, repeat(datos_der)))
+    else:
+        resultado = list(map(funcion, repeat(datos_izq), datos_der))
+
+    return Valor(TipoNahual.LISTA, _lista_resultado(resultado, tipo_resultado))
+
+
+def _datos_reduccion(coleccion: Valor, nombre: str):
+    if coleccion.tipo != TipoNahual.LISTA:
+        raise TipoError(f"{nombre} requiere una ofrenda, se recibió {coleccion.tipo.value}")
+    datos = coleccion.valor.datos_crudos()
+    if not datos:
+        raise ErrorEjecucion(f"No se puede calcular {nombre} de una ofrenda vacía")
+    tipo = tipo_elementos_numericos(coleccion.valor)
+    if _usar_numpy(datos, tipo):
+        return _a_arreglo(datos, tipo, True), tipo, True
+    return datos, tipo, False
+
+
+def _como_tipo(dato: Any, tipo: TipoNahual) -> Valor:
+    return Valor(tipo, float(dato) if tipo == TipoNahual.ENERGIA else dato)
+
+
+def sumar(coleccion: Valor) -> Valor:
+    """Suma todos los elementos de una ofrenda numérica."""
+    datos, tipo, vectorial = _datos_reduccion(coleccion, "sumar")
+    return _como_tipo(datos.sum().item() if vectorial else sum(datos), tipo)
+
+
+def minimo(coleccion: Valor) -> Valor:
+    """Retorna el menor elemento de una ofrenda numérica."""
+    datos, tipo, vectorial = _datos_reduccion(coleccion, "minimo")
+    return _como_tipo(datos.min().item() if vectorial else min(datos), tipo)
+
+
+def maximo(coleccion: Valor) -> Valor:
+    """Retorna el mayor elemento de una ofrenda numérica."""
+    datos, tipo, vectorial = _datos_reduccion(coleccion, "maximo")
+    return _como_tipo(datos.max().item() if vectorial else max(datos), tipo)
+
+
+def promedio(coleccion: Valor) -> Valor:
+    """Calcula la media aritmética de una ofrenda numérica."""
+    datos, _, vectorial = _datos_reduccion(coleccion, "promedio")
+    resultado = datos.mean().item() if vectorial else sum(datos) / len(datos)
+    return Valor(TipoNahual.ENERGIA, float(resultado))
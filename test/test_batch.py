@@ -0,0 +1,50 @@
+# test/test_batch.py
+
+import json
+import pytest
+from nahual.batch import ejecutar_grimorio, ejecutar_lote, escribir_resumen, recolectar_grimorios
+from nahual.error_handler import ErrorEjecucion
+from nahual.parser import NahualParser
+
+
+@pytest.fixture
+def lote(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for i in range(3):
+        (tmp_path / f"g{i}.nhl").write_text(f'invocar "hola {i}";\n')
+    (tmp_path / "sub" / "malo.nhl").write_text('espiritu x := 1 unir "a" separar 2;\n')
+    (tmp_path / "notas.txt").write_text("# manifiesto\ng2.nhl\ng0.nhl  # comentario\n\n")
+    return tmp_path
+
+
+def test_recolectar_directorio_patron_y_manifiesto(lote):
+    assert [p.split('/')[-1] for p in recolectar_grimorios(str(lote))] == \
+        ["g0.nhl", "g1.nhl", "g2.nhl", "malo.nhl"]
+    assert len(recolectar_grimorios(str(lote / "g*.nhl"))) == 3
+    assert recolectar_grimorios(str(lote / "notas.txt")) == [str(lote / "g2.nhl"), str(lote / "g0.nhl")]
+    with pytest.raises(ErrorEjecucion):
+        recolectar_grimorios(str(lote / "*.nada"))
+
+
+def test_captura_salida_y_estado_por_grimorio(lote):
+    parser = NahualParser()
+    bueno = ejecutar_grimorio(str(lote / "g1.nhl"), parser=parser)
+    assert (bueno.estado, bueno.salida, bueno.errores) == (0, "hola 1\n", [])
+    malo = ejecutar_grimorio(str(lote / "sub" / "malo.nhl"), parser=parser)
+    assert malo.estado == 1 and malo.errores
+    faltante = ejecutar_grimorio(str(lote / "no_existe.nhl"), parser=parser)
+    assert faltante.estado == 2
+
+
+def test_lote_en_procesos_y_resumen(lote, tmp_path):
+    rutas = recolectar_grimorios(str(lote))
+    resultados = list(ejecutar_lote(rutas, procesos=2))
+    assert [r.ruta for r in resultados] == rutas
+    assert [r.estado for r in resultados] == [0, 0, 0, 1]
+
+    destino = tmp_path / "resumen.json"
+    escribir_resumen(resultados, 1.0, str(destino), str(tmp_path / "salidas"))
+    resumen = json.loads(destino.read_text())
+    assert (resumen['total'], resumen['fallidos']) == (4, 1)
+    with open(resumen['grimorios'][2]['salida']) as salida:
+        assert salida.read() == "hola 2\n"
@@ -0,0 +1,73 @@
+# test/test_call_stack.py
+
+import io
+from nahual.error_handler import LARGO_VARIABLE, PilaLlamadas
+from nahual.interpreter import NahualInterpreter
+
+CODIGO = """sabiduria interna(espiritu n) {
+    mantra largo := "abcdefghij" unir "abcdefghij" unir "abcdefghij" unir "abcdefghij" unir "abcdefghij";
+    retornar n dividir 0;
+}
+sabiduria externa(espiritu n) {
+    retornar interna(n unir 1);
+}
+invocar externa(1);
+"""
+
+
+def ejecutar(codigo):
+    interprete = NahualInterpreter(salida=io.StringIO())
+    interprete.run(codigo)
+    return interprete
+
+
+def test_el_error_lleva_las_llamadas_anidadas():
+    interprete = ejecutar(CODIGO)
+    error = interprete.manejador_errores.errores[0]
+    assert "División por cero" in error.mensaje
+    assert [(marco.nombre, marco.ubicacion.linea) for marco in error.pila] == [('externa', 8), ('interna', 6)]
+    assert str(error.pila[1].variables['n']) == "2"
+    assert len(interprete.manejador_errores.pila) == 0
+
+
+def test_el_rastro_se_muestra_con_el_error():
+    interprete = ejecutar(CODIGO)
+    mostrado = interprete.salida.sumidero.getvalue()
+    assert "Rastro del ritual (llamada más reciente primero)" in mostrado
+    assert mostrado.index("en interna, llamada en línea 6") < mostrado.index("en externa, llamada en línea 8")
+    # Las variables largas se recortan
+    largo = next(parte for parte in mostrado.split(", ") if parte.startswith("largo="))
+    assert len(largo.splitlines()[0]) == len("largo=") + LARGO_VARIABLE and "…" in largo
+
+
+def test_la_pila_crece_en_recursion_profunda():
+    interprete = ejecutar("""
+    sabiduria bajar(espiritu n) {
+        vision (n igual 0) {
+            retornar 1 dividir 0;
+        }
+        retornar bajar(n separar 1);
+    }
+    invocar bajar(70);
+    """)
+    error = interprete.manejador_errores.errores[0]
+    assert len(error.pila) == 71 > PilaLlamadas.CAPACIDAD_INICIAL
+    assert str(error.pila[-1].variables['n']) == "0"
+    assert len(interprete.manejador_errores.pila) == 0
+
+    # Después del error se puede seguir llamando desde la cima
+    interprete.run('sabiduria uno() { retornar 1; } invocar uno();')
+    assert interprete.salida.sumidero.getvalue().endswith("1\n")
+
+
+def test_los_marcos_se_reutilizan():
+    pila = PilaLlamadas()
+    marcos = list(pila._marcos)
+    pila.entrar('a', {'linea': 3, 'columna': 7}, None)
+    pila.entrar('b', None, None)
+    a, b = pila.capturar()
+    assert (a.nombre, a.ubicacion.linea, a.ubicacion.columna) == ('a', 3, 7)
+    assert (b.nombre, b.ubicacion) == ('b', None)
+    pila.salir()
+    pila.salir()
+    assert len(pila) == 0 and list(pila) == [] and pila._marcos == marcos
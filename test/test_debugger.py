@@ -0,0 +1,148 @@
+# test/test_debugger.py
+
+import io
+import pytest
+from nahual.debugger import ConsolaDepuracion, Depurador, DepuracionTerminada
+from nahual.interpreter import NahualInterpreter
+
+CODIGO = """sabiduria doble(espiritu n) {
+    espiritu r := n unir n;
+    retornar r;
+}
+espiritu total := 0;
+para i desde 0 hasta 3 {
+    total := total unir doble(i);
+}
+invocar total;
+"""
+
+
+def depurador_con(acciones):
+    """Depurador que en cada pausa anota (línea, variables locales) y sigue según `acciones`."""
+    interprete = NahualInterpreter(salida=io.StringIO())
+    pausas = []
+
+    def al_detenerse(depurador, pausa):
+        pausas.append((pausa.linea, {k: v.valor for k, v in depurador.variables(solo_locales=True).items()}))
+        if acciones:
+            getattr(depurador, acciones.pop(0))()
+
+    depurador = Depurador(interprete, al_detenerse)
+    assert depurador.cargar(CODIGO) == []
+    return interprete, depurador, pausas
+
+
+def test_punto_de_ruptura_en_una_sabiduria():
+    interprete, depurador, pausas = depurador_con([])
+    depurador.poner_punto(2)
+    depurador.ejecutar()
+    assert pausas == [(2, {'n': 0}), (2, {'n': 1}), (2, {'n': 2})]
+    assert interprete.salida.sumidero.getvalue() == "6\n"
+
+    depurador.quitar_punto(2)
+    pausas.clear()
+    depurador.ejecutar()
+    assert pausas == []
+
+
+def test_paso_y_siguiente():
+    _, depurador, pausas = depurador_con(['paso', 'siguiente', 'paso', 'paso', 'paso', 'siguiente'])
+    depurador.poner_punto(7)
+    depurador.ejecutar()
+    lineas = [linea for linea, _ in pausas]
+    # paso entra a doble(0); siguiente avanza dentro de ella y, al retornar,
+    # se detiene en la línea 7 de la siguiente vuelta
+    assert lineas[:4] == [7, 2, 3, 7]
+    assert lineas[4:7] == [2, 3, 7]
+    assert pausas[-1] == (7, {'i': 2, 'total': 2})
+
+
+def test_detenerse_al_inicio_y_pila():
+    interprete, depurador, pausas = depurador_con(['paso'] * 4)
+    vistas = []
+    anotar = depurador.al_detenerse
+
+    def al_detenerse(depurador, pausa):
+        vistas.append(depurador.pila())
+        anotar(depurador, pausa)
+
+    depurador.al_detenerse = al_detenerse
+    depurador.ejecutar(detenerse_al_inicio=True)
+    assert [linea for linea, _ in pausas][:5] == [1, 5, 6, 7, 2]
+    assert vistas[4] == [('doble', 7)]
+    assert 'ejecutar' not in vars(interprete)
+
+
+def test_sin_puntos_no_cambia_el_interprete():
+    interprete, depurador, _ = depurador_con([])
+    arbol = repr(depurador.arbol)
+    depurador.poner_punto(7)
+    depurador.quitar_todos()
+    assert repr(depurador.arbol) == arbol
+    with pytest.raises(ValueError):
+        depurador.poner_punto(4)
+    depurador.desinstalar()
+    assert 'ejecutar' not in vars(interprete) and 'ejecutar_punto_ruptura' not in vars(interprete)
+
+
+def test_consola_interactiva():
+    interprete = NahualInterpreter(salida=io.StringIO())
+    entrada = io.StringIO("romper 3\ncontinuar\np r\nv\npila\nborrar 3\nq\n")
+    salida = io.StringIO()
+    depurador = Depurador(interprete, ConsolaDepuracion(entrada, salida))
+    depurador.cargar(CODIGO)
+    with pytest.raises(DepuracionTerminada):
+        depurador.ejecutar(detenerse_al_inicio=True)
+    texto = salida.getvalue()
+    assert "línea 1: sabiduria doble(espiritu n) {" in texto
+    assert "Puntos de ruptura: 3" in texto
+    assert "línea 3: retornar r;" in texto
+    assert "r = 0 (espiritu)" in texto and "  total = 0" in texto
+    assert "doble, llamada en línea 7" in texto
+    assert interprete.salida.sumidero.getvalue() == ""
+
+
+def test_paso_dentro_de_un_ciclo():
+    interprete = NahualInterpreter(salida=io.StringIO())
+    pausas = []
+
+    def al_detenerse(depurador, pausa):
+        pausas.append(pausa.linea)
+        depurador.paso()
+
+    depurador = Depurador(interprete, al_detenerse)
+    assert depurador.cargar("""espiritu total := 0;
+para i desde 0 hasta 2 {
+    total := total unir i;
+    total := total multiplicar 2;
+}
+invocar total;
+""") == []
+    depurador.poner_punto(3)
+    depurador.ejecutar()
+    assert pausas == [3, 4, 3, 4, 6]
+    assert interprete.salida.sumidero.getvalue() == "2\n"
+
+    # Al continuar, sólo queda el punto de ruptura
+    pausas.clear()
+    depurador.al_detenerse = lambda depurador, pausa: pausas.append(pausa.linea)
+    depurador.ejecutar()
+    assert pausas == [3, 3]
+
+
+def test_terminar_dentro_de_una_vision():
+    interprete = NahualInterpreter(salida=io.StringIO())
+    depurador = Depurador(interprete, lambda depurador, pausa: depurador.terminar())
+    assert depurador.cargar("""sabiduria f(espiritu n) {
+    vision (n mayor 0) {
+        invocar n;
+    }
+    retornar n;
+}
+espiritu r := f(1);
+invocar "siguió";
+""") == []
+    depurador.poner_punto(3)
+    with pytest.raises(DepuracionTerminada):
+        depurador.ejecutar()
+    assert interprete.salida.sumidero.getvalue() == ""
@@ -0,0 +1,104 @@
+# test/test_files.py
+
+import io
+import os
+import pytest
+from nahual import files
+from nahual.files import ErrorPergamino, GestorPergaminos
+from nahual.interpreter import NahualInterpreter
+
+
+def test_copia_lineas_de_un_pergamino_a_otro(tmp_path):
+    origen = tmp_path / "origen.txt"
+    origen.write_text("".join(f"linea {i}\n" for i in range(1000)))
+    destino = tmp_path / "destino.txt"
+    interprete = NahualInterpreter()
+    interprete.run(f"""
+    pergamino entrada := abrir_pergamino("{origen}");
+    pergamino salida := abrir_pergamino("{destino}", "escribir");
+    espiritu cuenta := 0;
+    para cada linea en entrada {{
+        escribir_linea(salida, linea);
+        cuenta := cuenta unir 1;
+    }}
+    cerrar_pergamino(entrada);
+    cerrar_pergamino(salida);
+    """)
+    assert interprete.entorno_global.obtener_variable('cuenta').valor == 1000
+    assert destino.read_text() == origen.read_text()
+
+
+def test_abrir_ruta_inexistente():
+    gestor = GestorPergaminos()
+    with pytest.raises(ErrorPergamino):
+        gestor.abrir("/ruta/que/no/existe.txt")
+
+
+def test_leer_linea_y_fin(tmp_path):
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text("uno\r\ndos")
+    pergamino = GestorPergaminos().abrir(str(ruta))
+    assert not pergamino.al_final()
+    assert pergamino.leer_linea() == "uno"
+    assert [v.valor for v in pergamino.lineas()] == ["dos"]
+    assert pergamino.al_final()
+    with pytest.raises(ErrorPergamino):
+        pergamino.leer_linea()
+    pergamino.cerrar()
+
+
+def test_escritura_en_bloques_y_cierre_al_terminar(tmp_path):
+    ruta = tmp_path / "salida.txt"
+    interprete = NahualInterpreter()
+    interprete.run(f"""
+    pergamino p := abrir_pergamino("{ruta}", "escribir");
+    escribir(p, "a", 1);
+    escribir_linea(p, "b", 2);
+    """)
+    assert ruta.read_text() == "a1b 2\n"
+    assert not interprete.pergaminos.abiertos
+
+
+def test_aislamiento(tmp_path):
+    permitido = tmp_path / "permitido"
+    permitido.mkdir()
+    (permitido / "datos.txt").write_text("1 2 3\n")
+    (tmp_path / "secreto.txt").write_text("4\n")
+
+    solo_lectura = GestorPergaminos(solo_lectura=True)
+    with pytest.raises(ErrorPergamino):
+        solo_lectura.abrir(str(permitido / "nuevo.txt"), "escribir")
+
+    gestor = GestorPergaminos(directorio_permitido=str(permitido))
+    gestor.abrir(str(permitido / "datos.txt")).cerrar()
+    with pytest.raises(ErrorPergamino):
+        gestor.abrir(str(permitido / ".." / "secreto.txt"))
+
+    sumidero = io.StringIO()
+    interprete = NahualInterpreter(salida=sumidero, pergaminos=gestor)
+    interprete.run(f"""
+    ofrenda xs := cargar_espiritus("{tmp_path / 'secreto.txt'}");
+    ofrenda ys := cargar_espiritus("{permitido / 'datos.txt'}");
+    """)
+    assert "fuera de" in sumidero.getvalue()
+    assert interprete.entorno_global.obtener_variable('ys').valor.valores_crudos() == [1, 2, 3]
+
+
+def test_aislamiento_no_sigue_enlaces_cambiados(tmp_path, monkeypatch):
+    permitido = tmp_path / "permitido"
+    permitido.mkdir()
+    secreto = tmp_path / "secreto.txt"
+    secreto.write_text("4\n")
+    (permitido / "enlace.txt").symlink_to(secreto)
+    (permitido / "sub").symlink_to(tmp_path)
+    gestor = GestorPergaminos(directorio_permitido=str(permitido))
+
+    # Simula que los enlaces aparecen después de revisar la ruta
+    monkeypatch.setattr(files.os.path, 'realpath', os.path.abspath)
+    for ruta in (permitido / "enlace.txt", permitido / "sub" / "secreto.txt"):
+        for modo in ("leer", "escribir"):
+            with pytest.raises(ErrorPergamino):
+                gestor.abrir(str(ruta), modo)
+        with pytest.raises(ErrorPergamino):
+            gestor.abrir_descriptor(str(ruta))
+    assert secreto.read_text() == "4\n"
@@ -0,0 +1,59 @@
+# test/test_generator.py
+
+import io
+import pytest
+from nahual.generator import Forma, generar_programa
+from nahual.interpreter import NahualInterpreter
+from nahual.parser import NahualParser
+from nahual.type_checker import verificar_programa
+
+PEQUENA = Forma(sabidurias=4, declaraciones=3, combustible=2)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return NahualParser()
+
+
+def profundidad(nodo, actual=0):
+    """Anidamiento máximo de vision y ritual en un subárbol."""
+    if isinstance(nodo, list):
+        return max((profundidad(hijo, actual) for hijo in nodo), default=actual)
+    if not isinstance(nodo, tuple) or not nodo or not isinstance(nodo[0], str):
+        return actual
+    if nodo[0] in ('vision', 'ritual'):
+        actual += 1
+    return max((profundidad(hijo, actual) for hijo in nodo[1:]), default=actual)
+
+
+def test_la_semilla_determina_el_programa():
+    assert generar_programa(3, PEQUENA) == generar_programa(3, PEQUENA)
+    assert generar_programa(3, PEQUENA) != generar_programa(4, PEQUENA)
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_los_programas_son_validos_y_terminan(parser, semilla):
+    arbol = parser.parse(generar_programa(semilla, PEQUENA))
+    _, errores = verificar_programa(arbol)
+    assert errores == []
+
+    interprete = NahualInterpreter(salida=io.StringIO(), parser=parser)
+    interprete.run_arbol(arbol)
+    assert interprete.manejador_errores.errores == []
+    assert 0 <= int(interprete.salida.sumidero.getvalue()) < 9973
+
+
+def test_la_forma_controla_el_tamano(parser):
+    forma = Forma(sabidurias=6, profundidad=3, elementos_ofrenda=30, abanico=3)
+    arbol = parser.parse(generar_programa(1, forma))
+    funciones = [nodo for nodo in arbol[1] if nodo[0] == 'funcion_declaracion']
+    assert len(funciones) == 6
+    assert all(profundidad(nodo[3]) >= 3 for nodo in funciones)
+    codigo = generar_programa(1, forma)
+    assert all(len(linea.split(", ")) == 30 for linea in codigo.splitlines() if ":= [" in linea)
+    # Cada sabiduría salvo la primera llama `abanico` veces a las anteriores
+    assert codigo.count("n separar 1,") == 3 * 5
+
+    grande = PEQUENA.escalada(10)
+    assert (grande.sabidurias, grande.elementos_ofrenda) == (40, 80)
+    assert len(generar_programa(1, grande)) > 5 * len(generar_programa(1, PEQUENA))
@@ -0,0 +1,81 @@
+# test/test_input.py
+
+import io
+import os
+import threading
+import pytest
+from nahual.input import EntradaNahual
+from nahual.interpreter import NahualInterpreter
+from nahual.output import SalidaNahual
+from nahual.types import TipoNahual, Valor
+
+
+class FuenteContada(io.StringIO):
+    """StringIO que cuenta las lecturas recibidas."""
+
+    def __init__(self, texto):
+        super().__init__(texto)
+        self.lecturas = 0
+
+    def read(self, *args):
+        self.lecturas += 1
+        return super().read(*args)
+
+
+def test_lee_en_bloques():
+    fuente = FuenteContada("".join(f"{i}\n" for i in range(1000)))
+    entrada = EntradaNahual(fuente, tamano_bloque=1024, interactiva=False)
+    assert [entrada.leer_espiritu() for _ in range(1000)] == list(range(1000))
+    assert fuente.lecturas < 10
+    with pytest.raises(EOFError):
+        entrada.leer_linea()
+
+
+def test_lineas_partidas_entre_bloques_y_sin_salto_final():
+    entrada = EntradaNahual(io.StringIO("abcdef\r\nghi\njkl"), tamano_bloque=4, interactiva=False)
+    assert [entrada.leer_linea() for _ in range(3)] == ["abcdef", "ghi", "jkl"]
+
+
+def test_tuberia_entrega_lo_disponible():
+    lectura, escritura = os.pipe()
+    with open(lectura, encoding='utf-8') as fuente, open(escritura, 'wb', buffering=0) as escritor:
+        entrada = EntradaNahual(fuente, interactiva=False)
+        escritor.write("hola\nañ".encode('utf-8')[:-1])  # La ñ queda partida
+        lineas = []
+        hilo = threading.Thread(target=lambda: lineas.append(entrada.leer_linea()), daemon=True)
+        hilo.start()
+        hilo.join(5)
+        assert lineas == ["hola"]
+        escritor.write("ñ".encode('utf-8')[1:] + b"\nadios")
+        escritor.close()
+        assert entrada.leer_linea() == "añ"
+        assert entrada.leer_resto() == "adios"
+
+
+def test_sin_terminal_no_muestra_mensaje():
+    sumidero = io.StringIO()
+    entrada = EntradaNahual(io.StringIO("3.5\n"), interactiva=False, salida=SalidaNahual(sumidero))
+    assert entrada.leer_valor(TipoNahual.ENERGIA, "Ingrese: ") == Valor(TipoNahual.ENERGIA, 3.5)
+    assert sumidero.getvalue() == ""
+
+
+def test_terminal_muestra_mensaje():
+    sumidero = io.StringIO()
+    entrada = EntradaNahual(io.StringIO("hola\n"), interactiva=True, salida=SalidaNahual(sumidero))
+    assert entrada.leer_linea("Nombre: ") == "hola"
+    assert sumidero.getvalue() == "Nombre: "
+
+
+def test_percibir_desde_tuberia():
+    numeros = "".join(f"{i}\n" for i in range(500))
+    interprete = NahualInterpreter(salida=io.StringIO(), entrada=io.StringIO(numeros + "fin\n"))
+    interprete.run("""
+    espiritu total := 0;
+    para i desde 0 hasta 500 {
+        espiritu n := percibir("Número: ");
+        total := total unir n;
+    }
+    mantra ultimo := percibir("");
+    """)
+    assert interprete.entorno_global.obtener_variable('total').valor == sum(range(500))
+    assert interprete.entorno_global.obtener_variable('ultimo').valor == "fin"
@@ -0,0 +1,96 @@
+# test/test_limits.py
+
+import io
+import pytest
+from nahual.error_handler import ErrorEjecucion
+from nahual.interpreter import NahualInterpreter
+from nahual.limits import ErrorLimiteExcedido, Limites
+
+CICLO_INFINITO = """
+espiritu i := 0;
+ritual (cierto) {
+    i := i unir 1;
+}
+"""
+
+
+def ejecutar(codigo, **limites):
+    interprete = NahualInterpreter(salida=io.StringIO(), limites=Limites(**limites))
+    with pytest.raises(ErrorLimiteExcedido) as excinfo:
+        interprete.run(codigo)
+    return interprete, excinfo.value
+
+
+def test_instrucciones_detienen_ritual_infinito():
+    interprete, error = ejecutar(CICLO_INFINITO, instrucciones=1000)
+    assert isinstance(error, ErrorEjecucion)
+    assert error.limite == 'instrucciones'
+    assert 1000 < error.consumo['instrucciones'] <= 1002
+    assert "Consumo hasta ahora" in str(error)
+    assert interprete.entorno_global.obtener_variable('i').valor == 501
+
+
+def test_tiempo_detiene_ritual_infinito():
+    _, error = ejecutar(CICLO_INFINITO, tiempo=0.05)
+    assert error.limite == 'tiempo'
+    assert error.consumo['tiempo'] >= 0.05
+
+
+def test_profundidad_de_recursion():
+    _, error = ejecutar("""
+    sabiduria bajar(espiritu n) {
+        retornar bajar(n unir 1);
+    }
+    invocar bajar(0);
+    """, profundidad=50)
+    assert error.limite == 'profundidad'
+    assert error.consumo['profundidad_maxima'] == 50
+
+
+def test_tamano_de_ofrendas():
+    _, error = ejecutar("""
+    ofrenda xs := [];
+    para i desde 0 hasta 100 {
+        agregar(xs, i);
+    }
+    """, elementos_ofrenda=10)
+    assert error.limite == 'elementos de ofrenda'
+    ejecutar("ofrenda xs := [1, 2, 3];", elementos_ofrenda=2)
+
+
+def test_longitud_de_mantras():
+    _, error = ejecutar("""
+    mantra texto := "";
+    ritual (cierto) {
+        texto := texto unir "abcd";
+    }
+    """, longitud_mantra=100)
+    assert error.limite == 'longitud de mantra'
+
+
+def test_dentro_de_los_limites_no_cambia_el_resultado():
+    interprete = NahualInterpreter(salida=io.StringIO(),
+                                   limites=Limites(instrucciones=10_000, profundidad=20, tiempo=5))
+    interprete.run("""
+    sabiduria factorial(espiritu n) {
+        vision (n menor 2) {
+            retornar 1;
+        }
+        retornar n multiplicar factorial(n separar 1);
+    }
+    espiritu total := 0;
+    para i desde 0 hasta 100 {
+        total := total unir factorial(5);
+    }
+    """)
+    assert interprete.entorno_global.obtener_variable('total').valor == 12000
+    # El consumo se reinicia en cada run()
+    interprete.run("espiritu x := 1;")
+    assert interprete.medidor.instrucciones == 0
+
+
+def test_limites_desde_texto():
+    limites = Limites.desde_texto("instrucciones=1000, tiempo=2.5")
+    assert limites == Limites(instrucciones=1000, tiempo=2.5)
+    with pytest.raises(ValueError):
+        Limites.desde_texto("memoria=10")
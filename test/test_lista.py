@@ -0,0 +1,84 @@
+# test/test_lista.py
+
+import pytest
+from nahual.interpreter import NahualInterpreter
+from nahual.types import TipoNahual, Valor, Lista, TipoError
+
+
+def espiritus(*numeros):
+    return Lista([Valor(TipoNahual.ESPIRITU, n) for n in numeros], TipoNahual.ESPIRITU)
+
+
+class TestVistas:
+
+    def test_rebanar_no_copia(self):
+        lista = espiritus(1, 2, 3, 4)
+        vista = lista.rebanar(1, 3)
+        assert vista._almacen is lista._almacen
+        assert vista.valores_crudos() == [2, 3]
+        assert vista.longitud() == 2
+
+    def test_limites_como_python(self):
+        lista = espiritus(1, 2, 3, 4)
+        assert lista.rebanar(-2).valores_crudos() == [3, 4]
+        assert lista.rebanar(3, 1).valores_crudos() == []
+        assert lista.rebanar(None, 10).valores_crudos() == [1, 2, 3, 4]
+
+    def test_copia_al_escribir_en_la_vista(self):
+        lista = espiritus(1, 2, 3, 4)
+        vista = lista.rebanar(1, 3)
+        vista.asignar(0, Valor(TipoNahual.ESPIRITU, 20))
+        vista.agregar(Valor(TipoNahual.ESPIRITU, 30))
+        assert vista.valores_crudos() == [20, 3, 30]
+        assert lista.valores_crudos() == [1, 2, 3, 4]
+
+    def test_copia_al_escribir_en_la_original(self):
+        lista = espiritus(1, 2, 3, 4)
+        vista = lista.rebanar(0, 2)
+        lista.asignar(0, Valor(TipoNahual.ESPIRITU, 10))
+        assert lista.valores_crudos() == [10, 2, 3, 4]
+        assert vista.valores_crudos() == [1, 2]
+
+    def test_sin_vistas_se_escribe_en_sitio(self):
+        lista = espiritus(1, 2)
+        datos = lista._almacen.datos
+        vista = lista.rebanar(0, 1)
+        del vista
+        lista.agregar(Valor(TipoNahual.ESPIRITU, 3))
+        assert lista._almacen.datos is datos
+
+    def test_elementos_no_expone_el_almacen_compartido(self):
+        lista = espiritus(1, 2, 3)
+        vista = lista.rebanar(0)
+        elementos = vista.elementos
+        assert elementos == tuple(lista.elementos)
+        with pytest.raises(AttributeError):
+            elementos.append(Valor(TipoNahual.ESPIRITU, 4))
+        assert lista == vista and lista.longitud() == 3
+
+    def test_vista_conserva_tipo(self):
+        vista = espiritus(1, 2, 3).rebanar(1)
+        with pytest.raises(TipoError):
+            vista.agregar(Valor(TipoNahual.MANTRA, "x"))
+
+
+def test_rebanadas_desde_nahualscript():
+    interprete = NahualInterpreter()
+    interprete.run("""
+    ofrenda numeros := [1, 2, 3, 4, 5];
+    ofrenda medio := numeros[1:4];
+    ofrenda cabeza := numeros[:2];
+    ofrenda cola := rebanar(numeros, 3);
+
+    sabiduria anular(ofrenda valores) {
+        valores[0] := 0;
+    }
+    anular(medio);
+    agregar(cabeza, 9);
+    """)
+
+    entorno = interprete.entorno_global
+    assert entorno.obtener_variable('numeros').valor.valores_crudos() == [1, 2, 3, 4, 5]
+    assert entorno.obtener_variable('medio').valor.valores_crudos() == [0, 3, 4]
+    assert entorno.obtener_variable('cabeza').valor.valores_crudos() == [1, 2, 9]
+    assert entorno.obtener_variable('cola').valor.valores_crudos() == [4, 5]
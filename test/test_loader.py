@@ -0,0 +1,110 @@
+# test/test_loader.py
+
+import io
+import pickle
+import pytest
+from nahual import loader
+from nahual.error_handler import ErrorEjecucion
+from nahual.input import EntradaNahual
+from nahual.interpreter import NahualInterpreter
+from nahual.types import Lista, TipoNahual, Valor
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def motor(request, monkeypatch):
+    """Ejecuta cada prueba con y sin NumPy."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(loader, 'np', None)
+    return request.param
+
+
+def escribir(tmp_path, texto, nombre='datos.txt'):
+    ruta = tmp_path / nombre
+    ruta.write_text(texto)
+    return str(ruta)
+
+
+def test_carga_espiritus_separados_por_blancos(tmp_path, motor):
+    ruta = escribir(tmp_path, "1 2 3\n4\t5\n\n6\n")
+    lista = loader.cargar_numeros(ruta, TipoNahual.ESPIRITU)
+    assert lista.compacta
+    assert lista.tipo_elementos == TipoNahual.ESPIRITU
+    assert lista.valores_crudos() == [1, 2, 3, 4, 5, 6]
+    assert lista.obtener(2) == Valor(TipoNahual.ESPIRITU, 3)
+
+
+def test_columna_con_separador(tmp_path, motor):
+    ruta = escribir(tmp_path, "1.5,10\n2.5,20\n3.5,30\n")
+    lista = loader.cargar_numeros(ruta, TipoNahual.ENERGIA, separador=",", columna=1)
+    assert lista.valores_crudos() == [10.0, 20.0, 30.0]
+    with pytest.raises(ErrorEjecucion):
+        loader.cargar_numeros(ruta, TipoNahual.ENERGIA, separador=",", columna=2)
+
+
+def test_datos_invalidos(tmp_path, motor):
+    with pytest.raises(ErrorEjecucion):
+        loader.cargar_numeros(escribir(tmp_path, "1 2 tres\n"), TipoNahual.ESPIRITU)
+    with pytest.raises(ErrorEjecucion):
+        loader.cargar_numeros(escribir(tmp_path, "1.5 2\n"), TipoNahual.ESPIRITU)
+    with pytest.raises(ErrorEjecucion):
+        loader.cargar_numeros(str(tmp_path / "no_existe.txt"), TipoNahual.ESPIRITU)
+    # Un dato inválido a mitad del archivo no corta la carga en silencio
+    with pytest.raises(ErrorEjecucion):
+        loader.cargar_numeros(escribir(tmp_path, "1 2\n3 x 5\n6\n"), TipoNahual.ENERGIA)
+
+
+def test_columnas_desparejas(tmp_path, motor):
+    # Mismo total de campos que 3 líneas de 2, pero repartidos de otra forma
+    ruta = escribir(tmp_path, "1 2\n3\n4 5 6\n")
+    with pytest.raises(ErrorEjecucion, match="columnas"):
+        loader.cargar_numeros(ruta, TipoNahual.ESPIRITU, columna=1)
+    ruta = escribir(tmp_path, "1 2\n\n3 4\n5\n")
+    with pytest.raises(ErrorEjecucion, match="línea 4"):
+        loader.cargar_numeros(ruta, TipoNahual.ESPIRITU, columna=0)
+
+
+def test_archivo_vacio_y_espiritus_enormes(tmp_path, motor):
+    assert loader.cargar_numeros(escribir(tmp_path, ""), TipoNahual.ENERGIA).valores_crudos() == []
+    enorme = 2 ** 70
+    lista = loader.cargar_numeros(escribir(tmp_path, f"1 {enorme}\n"), TipoNahual.ESPIRITU)
+    assert lista.valores_crudos() == [1, enorme]
+    maximo = 2 ** 63 - 1
+    lista = loader.cargar_numeros(escribir(tmp_path, f"{-maximo - 1} {maximo}\n"), TipoNahual.ESPIRITU)
+    assert lista.compacta and lista.valores_crudos() == [-maximo - 1, maximo]
+
+
+def test_desde_entrada_estandar(motor):
+    entrada = EntradaNahual(io.StringIO("cabecera\n1 2\n3 4\n"), interactiva=False)
+    assert entrada.leer_linea() == "cabecera"
+    lista = loader.cargar_numeros('-', TipoNahual.ESPIRITU, columna=0, entrada=entrada)
+    assert lista.valores_crudos() == [1, 3]
+
+
+def test_ofrenda_compacta_se_comporta_como_lista():
+    lista = Lista.desde_crudos([1, 2, 3], TipoNahual.ESPIRITU)
+    vista = lista.rebanar(1)
+    vista.asignar(0, Valor(TipoNahual.ESPIRITU, 20))
+    assert lista.valores_crudos() == [1, 2, 3]
+    assert vista.valores_crudos() == [20, 3]
+
+    lista.agregar(Valor(TipoNahual.ESPIRITU, 2 ** 64))
+    assert not lista.compacta
+    assert lista.valores_crudos() == [1, 2, 3, 2 ** 64]
+
+    copia = pickle.loads(pickle.dumps(vista))
+    assert copia.compacta and copia == vista
+
+
+def test_cargar_desde_nahualscript(tmp_path):
+    ruta = escribir(tmp_path, "".join(f"{i};{i / 2}\n" for i in range(1000)))
+    interprete = NahualInterpreter()
+    interprete.run(f"""
+    ofrenda mitades := cargar_energias("{ruta}", ";", 1);
+    ofrenda todos := cargar_espiritus("{ruta}", ";", 0);
+    energia total := sumar(mitades);
+    espiritu n := longitud(todos);
+    """)
+    assert interprete.entorno_global.obtener_variable('total').valor == sum(i / 2 for i in range(1000))
+    assert interprete.entorno_global.obtener_variable('n').valor == 1000
@@ -0,0 +1,71 @@
+# test/test_logger.py
+
+import json
+import logging
+import pytest
+from nahual.batch import ejecutar_grimorio
+from nahual.lexer import NahualLexer
+from nahual.logger import NOMBRE, NahualLogger, configurar_registro
+
+
+@pytest.fixture(autouse=True)
+def registro_limpio():
+    registro = logging.getLogger(NOMBRE)
+    anteriores, nivel = registro.handlers[:], registro.level
+    registro.handlers.clear()
+    yield registro
+    for manejador in registro.handlers:
+        manejador.close()
+    registro.handlers[:] = anteriores
+    registro.setLevel(nivel)
+
+
+class Costoso:
+    """Cuenta cuántas veces se convierte a texto."""
+    conversiones = 0
+
+    def __str__(self):
+        Costoso.conversiones += 1
+        return "costoso"
+
+
+def test_un_solo_manejador_por_proceso(registro_limpio):
+    for _ in range(5):
+        NahualLexer()
+        NahualLogger(debug=True)
+        configurar_registro()
+    assert len(registro_limpio.handlers) == 1
+
+
+def test_sin_debug_no_construye_mensajes(capsys):
+    logger = NahualLogger()
+    Costoso.conversiones = 0
+    logger.lexer_debug("ID", Costoso())
+    logger.interpreter_debug("unir", Costoso())
+    assert Costoso.conversiones == 0
+    assert capsys.readouterr().err == ""
+
+    configurar_registro(debug=True)
+    logger.lexer_debug("ID", Costoso())
+    assert Costoso.conversiones >= 1
+    assert "Token encontrado: ID = costoso" in capsys.readouterr().err
+
+
+def test_sumidero_de_lineas_json(tmp_path, registro_limpio):
+    ruta = tmp_path / "registro.jsonl"
+    configurar_registro(json_ruta=str(ruta))
+    configurar_registro(json_ruta=str(ruta))
+    assert len(registro_limpio.handlers) == 2
+
+    logger = NahualLogger()
+    logger.info("hola %s", "mundo")
+    logger.debug("no se escribe")
+    grimorio = tmp_path / "g.nhl"
+    grimorio.write_text('invocar "x";\n')
+    ejecutar_grimorio(str(grimorio))
+
+    lineas = [json.loads(linea) for linea in ruta.read_text(encoding='utf-8').splitlines()]
+    assert [linea['nivel'] for linea in lineas] == ['INFO', 'INFO']
+    assert lineas[0]['mensaje'] == "hola mundo"
+    assert (lineas[1]['ruta'], lineas[1]['estado'], lineas[1]['errores']) == (str(grimorio), 0, [])
+    assert lineas[1]['tiempo'] >= 0
@@ -0,0 +1,121 @@
+# test/test_mapa.py
+
+import pytest
+from nahual.interpreter import NahualInterpreter
+from nahual.type_checker import VerificadorTipos
+from nahual.types import TipoNahual, Valor, Mapa, TipoError
+from nahual.error_handler import ErrorTipos
+
+
+def mantra(texto):
+    return Valor(TipoNahual.MANTRA, texto)
+
+
+def espiritu(numero):
+    return Valor(TipoNahual.ESPIRITU, numero)
+
+
+class TestMapa:
+
+    def test_operaciones_basicas(self):
+        mapa = Mapa()
+        mapa.poner(mantra("a"), espiritu(1))
+        mapa.poner(mantra("b"), espiritu(2))
+        assert mapa.obtener(mantra("a")) == espiritu(1)
+        assert mapa.contiene(mantra("b"))
+        assert mapa.quitar(mantra("b")) == espiritu(2)
+        assert not mapa.contiene(mantra("b"))
+        assert mapa.longitud() == 1
+
+    def test_claves_compactas(self):
+        """Las claves mantra y espiritu se guardan como str/int de Python."""
+        mapa = Mapa()
+        mapa.poner(mantra("a"), espiritu(1))
+        mapa.poner(espiritu(7), espiritu(2))
+        assert list(mapa.entradas) == ["a", 7]
+        assert list(mapa.claves()) == [mantra("a"), espiritu(7)]
+
+    def test_claves_de_tipos_distintos_no_colisionan(self):
+        mapa = Mapa()
+        mapa.poner(espiritu(1), mantra("espiritu"))
+        mapa.poner(Valor(TipoNahual.ENERGIA, 1.0), mantra("energia"))
+        mapa.poner(Valor(TipoNahual.VERDAD, True), mantra("verdad"))
+        assert mapa.longitud() == 3
+        assert mapa.obtener(Valor(TipoNahual.VERDAD, True)) == mantra("verdad")
+
+    def test_mapa_tipado(self):
+        mapa = Mapa(tipo_claves=TipoNahual.MANTRA, tipo_valores=TipoNahual.ESPIRITU)
+        with pytest.raises(TipoError):
+            mapa.poner(mantra("a"), mantra("no es espiritu"))
+
+    def test_verificador_tipos(self):
+        mapa = Mapa()
+        mapa.poner(mantra("a"), mantra("x"))
+        with pytest.raises(ErrorTipos):
+            VerificadorTipos.verificar_mapa(mapa, TipoNahual.MANTRA, TipoNahual.ESPIRITU)
+
+
+def test_mapa_desde_nahualscript():
+    interprete = NahualInterpreter()
+    interprete.run("""
+    mapa[mantra, espiritu] edades := {"ana": 30, "luis": 25};
+    poner(edades, "eva", 41);
+    espiritu edad_eva := edades["eva"];
+    verdad hay_luis := contiene(edades, "luis");
+    quitar(edades, "luis");
+    espiritu cantidad := longitud(edades);
+    ofrenda nombres := claves(edades);
+    """)
+
+    entorno = interprete.entorno_global
+    edades = entorno.obtener_variable('edades').valor
+    assert edades.tipo_claves == TipoNahual.MANTRA
+    assert edades.tipo_valores == TipoNahual.ESPIRITU
+    assert entorno.obtener_variable('edad_eva').valor == 41
+    assert entorno.obtener_variable('hay_luis').valor is True
+    assert entorno.obtener_variable('cantidad').valor == 2
+    assert entorno.obtener_variable('nombres').valor.valores_crudos() == ["ana", "eva"]
+
+
+def test_mapa_tipado_rechaza_entradas_invalidas():
+    interprete = NahualInterpreter()
+    interprete.run('mapa[mantra, espiritu] m := {"a": "texto"};')
+    with pytest.raises(NameError):
+        interprete.entorno_global.obtener_variable('m')
+
+
+def test_mapa_tipado_no_cambia_los_tipos_de_otro_alias():
+    interprete = NahualInterpreter()
+    interprete.run("""
+    mapa[mantra, espiritu] a := {};
+    mapa[mantra, energia] b := a;
+    """)
+    error, = interprete.manejador_errores.errores
+    assert isinstance(error, ErrorTipos)
+    a = interprete.entorno_global.obtener_variable('a').valor
+    assert a.tipo_valores == TipoNahual.ESPIRITU
+
+
+def test_parametro_tipado_no_recorre_un_mapa_ya_tipado(monkeypatch):
+    recorridos = []
+    verificar = VerificadorTipos.verificar_mapa
+    monkeypatch.setattr(VerificadorTipos, 'verificar_mapa',
+                        staticmethod(lambda mapa, *args, **kwargs: recorridos.append(mapa) or verificar(mapa, *args, **kwargs)))
+    interprete = NahualInterpreter()
+    interprete.run("""
+    sabiduria edad(mapa[mantra, espiritu] m, mantra nombre) {
+        retornar m[nombre];
+    }
+    mapa[mantra, espiritu] edades := {"ana": 30};
+    mapa sueltas := {};
+    poner(sueltas, "eva", 41);
+    espiritu total := 0;
+    para i desde 0 hasta 10 {
+        total := total unir edad(edades, "ana");
+    }
+    total := total unir edad(sueltas, "eva");
+    """)
+    assert interprete.manejador_errores.errores == []
+    assert interprete.entorno_global.obtener_variable('total').valor == 341
+    # Sólo la declaración tipada y el mapa sin tipos pasan por el verificador
+    assert len(recorridos) == 2
@@ -0,0 +1,102 @@
+# test/test_operators.py
+
+import io
+from itertools import product
+import pytest
+from nahual.error_handler import ErrorEjecucion, ErrorTipos
+from nahual.interpreter import NahualInterpreter
+from nahual.operators import OPERADORES, TABLA_OPERACIONES
+from nahual.type_checker import VerificadorTipos
+from nahual.types import CONVERSIONES, Mapa, TipoError, TipoNahual, Valor
+
+E, N, M, V = TipoNahual.ESPIRITU, TipoNahual.ENERGIA, TipoNahual.MANTRA, TipoNahual.VERDAD
+
+MUESTRAS = {
+    E: Valor(E, 7),
+    N: Valor(N, 2.5),
+    M: Valor(M, "a"),
+    V: Valor(V, True),
+    TipoNahual.MAPA: Valor(TipoNahual.MAPA, Mapa()),
+}
+
+
+@pytest.fixture(scope='module')
+def interprete():
+    return NahualInterpreter(salida=io.StringIO())
+
+
+@pytest.mark.parametrize('op, izq, der, esperado', [
+    ('unir', Valor(E, 2), Valor(E, 3), Valor(E, 5)),
+    ('unir', Valor(E, 2), Valor(N, 0.5), Valor(N, 2.5)),
+    ('unir', Valor(M, "n="), Valor(E, 3), Valor(M, "n=3")),
+    ('unir', Valor(N, 1.5), Valor(M, "!"), Valor(M, "1.5!")),
+    ('separar', Valor(E, 2), Valor(E, 5), Valor(E, -3)),
+    ('multiplicar', Valor(N, 1.5), Valor(E, 2), Valor(N, 3.0)),
+    ('dividir', Valor(E, 7), Valor(E, 2), Valor(N, 3.5)),
+    ('residuo', Valor(E, 7), Valor(E, 2), Valor(E, 1)),
+    ('residuo', Valor(N, 7.5), Valor(E, 2), Valor(N, 1.5)),
+    ('y', Valor(V, True), Valor(V, False), Valor(V, False)),
+    ('o', Valor(V, True), Valor(V, False), Valor(V, True)),
+    ('menor', Valor(E, 1), Valor(N, 1.5), Valor(V, True)),
+    ('mayor', Valor(M, "b"), Valor(M, "a"), Valor(V, True)),
+    ('igual', Valor(V, True), Valor(V, True), Valor(V, True)),
+])
+def test_resultados(interprete, op, izq, der, esperado):
+    assert interprete._aplicar_operacion(op, izq, der) == esperado
+
+
+@pytest.mark.parametrize('op, tipo_izq, tipo_der', list(product(
+    sorted(OPERADORES), MUESTRAS, MUESTRAS)))
+def test_verificador_e_interprete_coinciden(interprete, op, tipo_izq, tipo_der):
+    izq, der = MUESTRAS[tipo_izq], MUESTRAS[tipo_der]
+    operacion = TABLA_OPERACIONES.get((op, tipo_izq, tipo_der))
+    if operacion is None:
+        with pytest.raises(ErrorTipos):
+            VerificadorTipos.verificar_operacion(op, izq, der)
+        with pytest.raises(ErrorTipos):
+            interprete._aplicar_operacion(op, izq, der)
+    else:
+        assert VerificadorTipos.verificar_operacion(op, izq, der) == operacion.resultado
+        assert interprete._aplicar_operacion(op, izq, der).tipo == operacion.resultado
+
+
+@pytest.mark.parametrize('op', ['dividir', 'residuo'])
+def test_division_por_cero(interprete, op):
+    with pytest.raises(ErrorEjecucion, match="División por cero"):
+        interprete._aplicar_operacion(op, Valor(E, 1), Valor(E, 0))
+
+
+@pytest.mark.parametrize('origen, destino, valor, esperado', [
+    (E, N, 3, 3.0),
+    (N, E, 3.9, 3),
+    (E, M, 3, "3"),
+    (N, M, 2.5, "2.5"),
+    (M, E, "42", 42),
+    (M, N, "0.5", 0.5),
+])
+def test_conversiones(origen, destino, valor, esperado):
+    assert (origen, destino) in CONVERSIONES
+    assert Valor(origen, valor).convertir_a(destino) == Valor(destino, esperado)
+
+
+@pytest.mark.parametrize('valor, destino', [
+    (Valor(V, True), E),
+    (Valor(M, "no es número"), E),
+    (Valor(TipoNahual.MAPA, Mapa()), M),
+])
+def test_conversiones_invalidas(valor, destino):
+    with pytest.raises(TipoError):
+        valor.convertir_a(destino)
+
+
+def test_operadores_logicos_en_el_lenguaje():
+    interprete = NahualInterpreter(salida=io.StringIO())
+    interprete.run("""
+    verdad a := (1 menor 2) y (3 mayor 4);
+    verdad b := (1 menor 2) o (3 mayor 4);
+    energia r := 7.5 residuo 2;
+    """)
+    global_ = interprete.entorno_global
+    assert global_.obtener_variable('a') == Valor(V, False)
+    assert global_.obtener_variable('b') == Valor(V, True)
+    assert global_.obtener_variable('r') == Valor(N, 1.5)
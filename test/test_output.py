@@ -0,0 +1,73 @@
+# test/test_output.py
+
+import io
+from nahual.interpreter import NahualInterpreter
+from nahual.input import EntradaNahual
+from nahual.output import SalidaNahual
+
+
+class SumideroContado(io.StringIO):
+    """StringIO que cuenta las escrituras recibidas."""
+
+    def __init__(self, terminal=False):
+        super().__init__()
+        self.escrituras = 0
+        self.terminal = terminal
+
+    def write(self, texto):
+        self.escrituras += 1
+        return super().write(texto)
+
+    def isatty(self):
+        return self.terminal
+
+
+def test_acumula_hasta_llenar_el_bufer():
+    sumidero = SumideroContado()
+    salida = SalidaNahual(sumidero, tamano_bufer=10)
+    salida.escribir_linea("abc")
+    salida.escribir_linea("def")
+    assert sumidero.escrituras == 0
+    salida.escribir_linea("ghi")
+    assert sumidero.escrituras == 1
+    assert sumidero.getvalue() == "abc\ndef\nghi\n"
+
+
+def test_terminal_vacia_por_lineas():
+    sumidero = SumideroContado(terminal=True)
+    salida = SalidaNahual(sumidero)
+    assert salida.por_lineas
+    salida.escribir("sin salto")
+    assert sumidero.escrituras == 0
+    salida.escribir_linea("linea")
+    assert sumidero.getvalue() == "sin saltolinea\n"
+
+
+def test_captura_en_memoria(capsys):
+    sumidero = SumideroContado()
+    interprete = NahualInterpreter(salida=sumidero)
+    interprete.run("""
+    para i desde 0 hasta 100 {
+        invocar "linea" unir i;
+    }
+    """)
+    assert sumidero.getvalue() == "".join(f"linea{i}\n" for i in range(100))
+    assert sumidero.escrituras == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_vacia_antes_de_percibir():
+    sumidero = SumideroContado()
+    vistos = []
+
+    class Teclado(io.StringIO):
+        def readline(self):
+            vistos.append(sumidero.getvalue())
+            return "x\n"
+
+    interprete = NahualInterpreter(salida=sumidero, entrada=EntradaNahual(Teclado(), interactiva=True))
+    interprete.run("""
+    invocar "Ingrese un valor:";
+    mantra valor := percibir("");
+    """)
+    assert vistos == ["Ingrese un valor:\n"]
@@ -0,0 +1,62 @@
+# test/test_para.py
+
+import pytest
+from nahual.interpreter import NahualInterpreter
+
+
+@pytest.fixture
+def interprete():
+    return NahualInterpreter()
+
+
+def test_para_cada_ofrenda(interprete):
+    interprete.run("""
+    ofrenda numeros := [1, 2, 3, 4];
+    espiritu total := 0;
+    para cada n en numeros {
+        total := total unir n;
+    }
+    """)
+    assert interprete.entorno_global.obtener_variable('total').valor == 10
+
+
+def test_para_cada_rebanada_y_mapa(interprete):
+    interprete.run("""
+    ofrenda numeros := [1, 2, 3, 4];
+    espiritu parcial := 0;
+    para cada n en numeros[2:] {
+        parcial := parcial unir n;
+    }
+
+    mapa edades := {"ana": 30, "eva": 41};
+    mantra nombres := "";
+    para cada nombre en edades {
+        nombres := nombres unir nombre;
+    }
+    """)
+    assert interprete.entorno_global.obtener_variable('parcial').valor == 7
+    assert interprete.entorno_global.obtener_variable('nombres').valor == "anaeva"
+
+
+def test_para_rango_excluye_el_fin(interprete):
+    interprete.run("""
+    espiritu suma := 0;
+    espiritu vueltas := 0;
+    para i desde 0 hasta 10 {
+        suma := suma unir i;
+        vueltas := vueltas unir 1;
+    }
+    """)
+    assert interprete.entorno_global.obtener_variable('suma').valor == 45
+    assert interprete.entorno_global.obtener_variable('vueltas').valor == 10
+
+
+def test_variable_del_ciclo_vive_en_el_marco_actual(interprete):
+    interprete.run("""
+    espiritu ultimo := 0;
+    para i desde 3 hasta 6 {
+        ultimo := i;
+    }
+    """)
+    assert interprete.entorno_global.obtener_variable('i').valor == 5
+    assert interprete.entorno_global.obtener_variable('ultimo').valor == 5
@@ -0,0 +1,175 @@
+# test/test_parallel.py
+
+import io
+import pickle
+import time
+import pytest
+from nahual import parallel
+from nahual.interpreter import NahualInterpreter
+from nahual.limits import ErrorLimiteExcedido, Limites
+
+PROGRAMA = """
+sabiduria cuadrado(espiritu x) {
+    retornar x multiplicar x;
+}
+
+sabiduria saludo(mantra nombre) {
+    retornar "hola " unir nombre;
+}
+
+invocar "sólo en el proceso principal";
+"""
+
+
+@pytest.fixture
+def interprete():
+    return NahualInterpreter(salida=io.StringIO(), procesos=2)
+
+
+def test_mapea_en_orden_con_memoria_compartida(interprete, tmp_path):
+    ruta = tmp_path / "numeros.txt"
+    ruta.write_text(" ".join(map(str, range(500))))
+    interprete.run(PROGRAMA + f"""
+    ofrenda xs := cargar_espiritus("{ruta}");
+    ofrenda cuadrados := mapear_paralelo("cuadrado", xs);
+    """)
+    cuadrados = interprete.entorno_global.obtener_variable('cuadrados').valor
+    assert cuadrados.compacta
+    assert cuadrados.valores_crudos() == [x * x for x in range(500)]
+    assert interprete.salida.sumidero.getvalue() == "sólo en el proceso principal\n"
+
+
+def test_mapea_valores_serializados(interprete):
+    nombres = ", ".join(f'"n{i}"' for i in range(100))
+    interprete.run(PROGRAMA + f"""
+    ofrenda nombres := [{nombres}];
+    ofrenda saludos := mapear_paralelo("saludo", nombres);
+    """)
+    saludos = interprete.entorno_global.obtener_variable('saludos').valor
+    assert saludos.valores_crudos() == [f"hola n{i}" for i in range(100)]
+
+
+def test_ofrendas_pequenas_no_usan_procesos(interprete, monkeypatch):
+    monkeypatch.setattr(parallel, 'ProcessPoolExecutor', None)
+    interprete.run(PROGRAMA + """
+    ofrenda cuadrados := mapear_paralelo("cuadrado", [1, 2, 3]);
+    """)
+    assert interprete.entorno_global.obtener_variable('cuadrados').valor.valores_crudos() == [1, 4, 9]
+
+
+def test_fragmentos():
+    repartidor = parallel.RepartidorParalelo(procesos=4)
+    assert repartidor._tamano_fragmento(1000) == 63
+    assert repartidor._tamano_fragmento(3) == 1
+
+
+def test_los_trabajadores_leen_las_variables_globales(interprete):
+    interprete.run("""
+    espiritu factor := 3;
+    sabiduria escalar(espiritu x) {
+        retornar x multiplicar factor;
+    }
+    ofrenda xs := [];
+    para i desde 0 hasta 100 {
+        agregar(xs, i);
+    }
+    ofrenda escalados := mapear_paralelo("escalar", xs);
+    factor := 5;
+    ofrenda otra := mapear_paralelo("escalar", xs);
+    """)
+    assert interprete.manejador_errores.errores == []
+    obtener = interprete.entorno_global.obtener_variable
+    assert obtener('escalados').valor.valores_crudos() == [3 * i for i in range(100)]
+    assert obtener('otra').valor.valores_crudos() == [5 * i for i in range(100)]
+
+
+def test_las_tareas_no_copian_las_globales(interprete, monkeypatch, tmp_path):
+    tamanos = []
+    obtener_grupo = parallel.RepartidorParalelo._obtener_grupo
+
+    def espiar(repartidor, programa):
+        grupo = obtener_grupo(repartidor, programa)
+        enviar = grupo.submit
+
+        def submit(funcion, *argumentos):
+            tamanos.append(len(pickle.dumps(argumentos)))
+            return enviar(funcion, *argumentos)
+        monkeypatch.setattr(grupo, 'submit', submit)
+        return grupo
+    monkeypatch.setattr(parallel.RepartidorParalelo, '_obtener_grupo', espiar)
+
+    (tmp_path / "grande.txt").write_text(" ".join(map(str, range(50000))))
+    (tmp_path / "xs.txt").write_text(" ".join(map(str, range(100))))
+    interprete.run(f"""
+    ofrenda grande := cargar_espiritus("{tmp_path / 'grande.txt'}");
+    ofrenda xs := cargar_espiritus("{tmp_path / 'xs.txt'}");
+    sabiduria medir(espiritu x) {{
+        retornar x unir longitud(grande);
+    }}
+    ofrenda r := mapear_paralelo("medir", xs);
+    ofrenda s := mapear_paralelo("medir", grande);
+    """)
+    assert interprete.manejador_errores.errores == []
+    obtener = interprete.entorno_global.obtener_variable
+    assert obtener('r').valor.valores_crudos() == [x + 50000 for x in range(100)]
+    # La ofrenda mapeada no viaja en las globales, pero las sabidurías la leen
+    assert obtener('s').valor.valores_crudos()[-1] == 49999 + 50000
+    assert tamanos and max(tamanos) < 1000
+
+
+def test_un_error_en_un_trabajador_vuelve_con_su_ubicacion(interprete):
+    interprete.run("""
+    sabiduria partir(espiritu x) {
+        vision (x igual 70) {
+            retornar x dividir 0;
+        }
+        retornar x;
+    }
+    ofrenda xs := [];
+    para i desde 0 hasta 100 {
+        agregar(xs, i);
+    }
+    ofrenda r := mapear_paralelo("partir", xs);
+    invocar "sigue";
+    """)
+    error, = interprete.manejador_errores.errores
+    assert "División por cero" in str(error) and error.ubicacion
+    assert [marco.nombre for marco in error.pila] == ['partir']
+    assert error.pila[0].variables == {'x': '70'}
+    mostrado = interprete.salida.sumidero.getvalue()
+    assert "en partir\n" in mostrado and "llamada en None" not in mostrado
+    assert mostrado.endswith("sigue\n")
+
+
+def test_los_trabajadores_respetan_los_limites():
+    interprete = NahualInterpreter(salida=io.StringIO(), procesos=2, limites=Limites(tiempo=0.3))
+    inicio = time.monotonic()
+    with pytest.raises(ErrorLimiteExcedido) as excinfo:
+        interprete.run("""
+        sabiduria eterna(espiritu x) {
+            ritual (cierto) {
+                x := x unir 1;
+            }
+            retornar x;
+        }
+        ofrenda xs := [];
+        para i desde 0 hasta 100 {
+            agregar(xs, i);
+        }
+        ofrenda r := mapear_paralelo("eterna", xs);
+        """)
+    assert excinfo.value.limite == 'tiempo'
+    assert time.monotonic() - inicio < 5
+
+
+def test_las_instrucciones_de_los_trabajadores_cuentan():
+    interprete = NahualInterpreter(salida=io.StringIO(), procesos=2, limites=Limites(instrucciones=10 ** 6))
+    interprete.run(PROGRAMA + """
+    ofrenda xs := [];
+    para i desde 0 hasta 100 {
+        agregar(xs, i);
+    }
+    ofrenda cuadrados := mapear_paralelo("cuadrado", xs);
+    """)
+    # Las 100 llamadas de los trabajadores, además de las vueltas del para
+    assert interprete.medidor.instrucciones >= 100 + 200
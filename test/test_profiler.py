@@ -0,0 +1,114 @@
+# test/test_profiler.py
+
+import io
+import json
+from nahual.interpreter import NahualInterpreter
+from nahual.profiler import Muestreador, Perfilador
+
+CODIGO = """sabiduria fib(espiritu n) {
+    vision (n menor 2) {
+        retornar n;
+    }
+    retornar fib(n separar 1) unir fib(n separar 2);
+}
+espiritu total := 0;
+para i desde 0 hasta 30 {
+    total := total unir i;
+}
+invocar fib(10);
+invocar longitud("abc");
+"""
+
+
+class RelojFalso:
+    """Avanza un segundo en cada lectura: los tiempos cuentan lecturas."""
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        self.ahora += 1.0
+        return self.ahora
+
+
+def perfilar(codigo, reloj=None):
+    interprete = NahualInterpreter(salida=io.StringIO())
+    perfilador = Perfilador(reloj) if reloj else Perfilador()
+    perfilador.instalar(interprete)
+    interprete.run(codigo)
+    perfilador.desinstalar()
+    return interprete, perfilador
+
+
+def test_cuenta_llamadas_y_lineas():
+    interprete, perfilador = perfilar(CODIGO)
+    assert interprete.salida.sumidero.getvalue() == "55\n3\n"
+    fib = perfilador.sabidurias['fib']
+    assert (fib.llamadas, fib.nativa) == (177, False)
+    assert perfilador.sabidurias['longitud'].nativa
+    ejecuciones = {numero: linea.ejecuciones for numero, linea in perfilador.lineas.items()}
+    assert ejecuciones[2] == 177  # la vision al inicio de cada llamada
+    assert ejecuciones[3] == 89 and ejecuciones[5] == 88
+    assert ejecuciones[9] == 30
+    assert 0 not in ejecuciones
+
+
+def test_tiempos_inclusivos_y_propios():
+    _, perfilador = perfilar(CODIGO, RelojFalso())
+    fib = perfilador.sabidurias['fib']
+    # En la recursión el tiempo inclusivo sólo se cuenta una vez
+    assert 0 < fib.propio <= fib.inclusivo < perfilador.total
+    assert sum(linea.propio for linea in perfilador.lineas.values()) <= perfilador.total
+
+    _, perfilador = perfilar("""
+    sabiduria hoja() { retornar 1; }
+    sabiduria raiz() { retornar hoja() unir hoja(); }
+    invocar raiz();
+    """, RelojFalso())
+    raiz, hoja = perfilador.sabidurias['raiz'], perfilador.sabidurias['hoja']
+    assert raiz.propio == raiz.inclusivo - hoja.inclusivo
+
+
+def test_desinstalar_restaura_el_interprete(tmp_path):
+    interprete, perfilador = perfilar(CODIGO)
+    assert 'ejecutar' not in vars(interprete) and 'llamar_funcion' not in vars(interprete)
+
+    ruta = tmp_path / "perfil.json"
+    perfilador.guardar(str(ruta))
+    datos = json.loads(ruta.read_text(encoding='utf-8'))
+    assert datos['sabidurias'][0]['nombre'] == 'fib'
+    assert [linea['linea'] for linea in datos['lineas']] == sorted(perfilador.lineas)
+    assert "fib" in perfilador.informe() and "longitud (nativa)" in perfilador.informe()
+
+
+def test_muestreo_de_pilas_colapsadas(tmp_path):
+    interprete = NahualInterpreter(salida=io.StringIO())
+    muestreador = Muestreador(frecuencia=2000).instalar(interprete)
+    interprete.run(CODIGO.replace("fib(10)", "fib(17)"))
+    muestreador.desinstalar()
+
+    assert muestreador.total > 0
+    assert len(interprete.manejador_errores.pila) == 0
+    assert 'ejecutar' not in vars(interprete) and 'llamar_funcion' not in vars(interprete)
+    pilas = [pila for pila in muestreador.muestras if len(pila) > 2]
+    assert pilas and all(pila[0] == ('<programa>', 11) for pila in pilas)
+    assert all(nombre == 'fib' and linea in (0, 2, 3, 5) for pila in pilas for nombre, linea in pila[1:])
+
+    ruta = tmp_path / "perfil.folded"
+    muestreador.guardar(str(ruta))
+    for linea in ruta.read_text(encoding='utf-8').splitlines():
+        marcos, cuenta = linea.rsplit(' ', 1)
+        assert marcos.startswith('<programa>:') and int(cuenta) > 0
+
+
+def test_perfilador_y_muestreador_juntos():
+    # Como `--profile --muestreo`: el muestreo se reporta primero
+    interprete = NahualInterpreter(salida=io.StringIO())
+    perfilador = Perfilador().instalar(interprete)
+    muestreador = Muestreador(frecuencia=2000).instalar(interprete)
+    interprete.run(CODIGO)
+    muestreador.desinstalar()
+    assert vars(interprete)['ejecutar'] is not None
+    perfilador.desinstalar()
+    assert 'ejecutar' not in vars(interprete) and 'llamar_funcion' not in vars(interprete)
+    assert perfilador.sabidurias['fib'].llamadas == 177
@@ -0,0 +1,67 @@
+# test/test_program.py
+
+import io
+import threading
+import pytest
+from nahual.error_handler import ErrorSintaxis
+from nahual.program import Programa, compilar
+from nahual.types import TipoNahual, Valor
+
+CODIGO = """
+sabiduria doble(espiritu x) {
+    retornar x multiplicar 2;
+}
+espiritu total := 0;
+para i desde 0 hasta n {
+    total := total unir doble(i);
+}
+invocar "total: " unir total;
+"""
+
+
+def espiritu(numero):
+    return Valor(TipoNahual.ESPIRITU, numero)
+
+
+def test_compila_una_vez_y_ejecuta_con_globales_nuevas():
+    programa = compilar(CODIGO)
+    assert isinstance(programa, Programa)
+    for n in (3, 10):
+        salida = io.StringIO()
+        interprete = programa.ejecutar(globales={'n': espiritu(n)}, salida=salida)
+        assert interprete.entorno_global.obtener_variable('total').valor == n * (n - 1)
+        assert salida.getvalue() == f"total: {n * (n - 1)}\n"
+        assert not interprete.manejador_errores.obtener_errores()
+    with pytest.raises(AttributeError):
+        programa.arbol = None
+
+
+def test_reutiliza_un_entorno_entre_ejecuciones():
+    interprete = compilar("espiritu contador := 0;").ejecutar(salida=io.StringIO())
+    incrementar = compilar("contador := contador unir 1;")
+    for _ in range(3):
+        incrementar.ejecutar(globales=interprete.entorno_global, salida=io.StringIO())
+    assert interprete.entorno_global.obtener_variable('contador').valor == 3
+
+
+def test_errores_de_sintaxis_al_compilar():
+    with pytest.raises(ErrorSintaxis):
+        compilar("espiritu x := ;")
+
+
+def test_ejecuciones_concurrentes_desde_varios_hilos():
+    programa = compilar(CODIGO)
+    resultados = {}
+
+    def trabajar(n):
+        salida = io.StringIO()
+        for _ in range(5):
+            programa.ejecutar(globales={'n': espiritu(n)}, salida=salida)
+        resultados[n] = salida.getvalue()
+
+    hilos = [threading.Thread(target=trabajar, args=(n,)) for n in range(20, 28)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert resultados == {n: f"total: {n * (n - 1)}\n" * 5 for n in range(20, 28)}
@@ -0,0 +1,63 @@
+# test/test_rope.py
+
+from nahual.interpreter import NahualInterpreter
+from nahual.rope import Cuerda, UMBRAL_CUERDA
+from nahual.types import TipoNahual, Valor
+
+
+def construir(partes):
+    texto = ""
+    for parte in partes:
+        texto = Cuerda.concatenar(texto, parte)
+    return texto
+
+
+def test_concatenaciones_cortas_son_str():
+    assert Cuerda.concatenar("hola ", "mundo") == "hola mundo"
+    assert isinstance(Cuerda.concatenar("a", 1), str)
+
+
+def test_cuerda_se_aplana_al_leer():
+    partes = ["x" * 100] * 50
+    cuerda = construir(partes)
+    assert isinstance(cuerda, Cuerda)
+    assert len(cuerda) == 5000
+    assert str(cuerda) == "".join(partes)
+    assert cuerda == "".join(partes)
+
+
+def test_ramas_independientes():
+    """Extender una cuerda intermedia no altera las demás."""
+    base = Cuerda.concatenar("a" * UMBRAL_CUERDA, "b")
+    rama_1 = Cuerda.concatenar(base, "1")
+    rama_2 = Cuerda.concatenar(base, "2")
+    assert str(rama_1).endswith("b1")
+    assert str(rama_2).endswith("b2")
+    assert str(base).endswith("b")
+    assert str(Cuerda.concatenar(base, "3")).endswith("b3")
+
+
+def test_comparaciones_y_conversiones():
+    cuerda = Cuerda.concatenar("1" * UMBRAL_CUERDA, "2")
+    assert cuerda > "1"
+    assert "1" < cuerda
+    assert hash(cuerda) == hash(str(cuerda))
+    assert Valor(TipoNahual.MANTRA, cuerda).convertir_a(TipoNahual.ESPIRITU).valor == int(str(cuerda))
+
+
+def test_unir_mantras_en_ritual():
+    interprete = NahualInterpreter()
+    interprete.run("""
+    mantra texto := "";
+    espiritu i := 0;
+    ritual (i menor 300) {
+        texto := texto unir "ab";
+        i := i unir 1;
+    }
+    mantra reporte := "Total: " unir i;
+    """)
+
+    texto = interprete.entorno_global.obtener_variable('texto')
+    assert texto.tipo == TipoNahual.MANTRA
+    assert str(texto.valor) == "ab" * 300
+    assert interprete.entorno_global.obtener_variable('reporte').valor == "Total: 300"
@@ -0,0 +1,114 @@
+# test/test_server.py
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import pytest
+from nahual import server
+from nahual.server import ParserEnCache, ServidorNahual
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ParserContado:
+    def __init__(self):
+        self.llamadas = 0
+
+    def parse(self, texto):
+        self.llamadas += 1
+        return ('programa', [texto], None)
+
+
+def test_parser_en_cache():
+    interno = ParserContado()
+    parser = ParserEnCache(interno, capacidad=2)
+    assert parser.parse("a") is parser.parse("a")
+    parser.parse("b")
+    parser.parse("c")
+    parser.parse("a")
+    assert interno.llamadas == 4
+
+
+@pytest.fixture
+def servidor():
+    # Las rutas de sockets Unix tienen un límite de ~100 caracteres
+    directorio = tempfile.mkdtemp(prefix='nahual-')
+    servidor = ServidorNahual(os.path.join(directorio, 's.sock'))
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+    os.rmdir(directorio)
+
+
+def ejecutar(modulo, argumentos, entrada, socket_servidor, cwd):
+    entorno = dict(os.environ, PYTHONPATH=os.path.join(RAIZ, 'src'), NAHUAL_SOCKET=socket_servidor)
+    return subprocess.run([sys.executable, '-m', modulo] + argumentos, input=entrada.encode(),
+                          capture_output=True, cwd=cwd, env=entorno, timeout=60)
+
+
+def test_cliente_igual_que_la_linea_de_comandos(servidor, tmp_path):
+    (tmp_path / "saludo.nhl").write_text('mantra n := percibir("Nombre: ");\ninvocar "hola " unir n;\n')
+    codigos = []
+    for argumentos, entrada in ((["saludo.nhl"], "Ana\n"), (["falta.nhl"], "")):
+        remoto = ejecutar('nahual.client', argumentos, entrada, servidor.ruta_socket, tmp_path)
+        directo = ejecutar('nahual', argumentos, entrada, servidor.ruta_socket, tmp_path)
+        assert remoto.returncode == directo.returncode
+        assert remoto.stdout == directo.stdout
+        codigos.append(remoto.returncode)
+        if remoto.returncode == 0:
+            assert b"hola Ana" in remoto.stdout
+    assert codigos == [0, 1]
+
+
+def test_cliente_sin_servidor_ejecuta_directamente(tmp_path):
+    (tmp_path / "uno.nhl").write_text('invocar 1;\n')
+    resultado = ejecutar('nahual.client', ["uno.nhl"], "", str(tmp_path / "no.sock"), tmp_path)
+    assert resultado.returncode == 0
+    assert b"1\n" in resultado.stdout
+
+
+def test_un_cliente_lento_no_detiene_a_los_demas(servidor, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'TIEMPO_PETICION', 5)
+    (tmp_path / "uno.nhl").write_text('invocar 1;\n')
+    antes = set(servidor.active_children or ())
+    lento = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        lento.connect(servidor.ruta_socket)
+        lento.sendall(b'{"argumentos": [')  # Nunca termina su petición
+        # Se espera a que el hijo lento exista antes de lanzar al cliente, para
+        # que no herede las tuberías del subproceso
+        limite = time.monotonic() + 10
+        while set(servidor.active_children or ()) <= antes and time.monotonic() < limite:
+            time.sleep(0.01)
+        resultado = ejecutar('nahual.client', ["uno.nhl"], "", servidor.ruta_socket, tmp_path)
+    finally:
+        lento.close()
+    assert resultado.returncode == 0 and b"1\n" in resultado.stdout
+
+    # El proceso principal parsea el grimorio que le avisó el hijo
+    limite = time.monotonic() + 10
+    while 'invocar 1;\n' not in servidor.parser._arboles and time.monotonic() < limite:
+        time.sleep(0.05)
+    assert 'invocar 1;\n' in servidor.parser._arboles
+
+
+def test_socket_solo_del_usuario(tmp_path):
+    compartido = tmp_path / "compartido"
+    compartido.mkdir()
+    compartido.chmod(0o777)
+    with pytest.raises(OSError):
+        ServidorNahual(str(compartido / "s.sock"))
+
+    directorio = tempfile.mkdtemp(prefix='nahual-')
+    servidor = ServidorNahual(os.path.join(directorio, 's.sock'))
+    try:
+        assert os.stat(servidor.ruta_socket).st_mode & 0o777 == 0o600
+    finally:
+        servidor.server_close()
+        os.rmdir(directorio)
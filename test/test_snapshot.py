@@ -0,0 +1,104 @@
+# test/test_snapshot.py
+
+import io
+import os
+import pickle
+import zlib
+import pytest
+from nahual import snapshot
+from nahual.interpreter import NahualInterpreter
+from nahual.snapshot import ErrorInstantanea
+from nahual.types import TipoNahual
+
+PREPARACION = """
+ofrenda cuadrados := [];
+para i desde 0 hasta 1000 {
+    agregar(cuadrados, i multiplicar i);
+}
+ofrenda dobles := cuadrados multiplicar 2;
+mapa nombres := {"a": 1, "b": 2};
+mantra largo := "";
+para i desde 0 hasta 200 {
+    largo := largo unir "ab";
+}
+
+sabiduria buscar(espiritu i) {
+    retornar cuadrados[i];
+}
+
+sabiduria saludar(mantra nombre) {
+    invocar "hola " unir nombre;
+    retornar longitud(nombre);
+}
+"""
+
+
+def nuevo_interprete():
+    return NahualInterpreter(salida=io.StringIO())
+
+
+@pytest.fixture
+def instantanea(tmp_path):
+    interprete = nuevo_interprete()
+    interprete.run(PREPARACION)
+    ruta = str(tmp_path / "preparacion.nhli")
+    interprete.guardar_instantanea(ruta)
+    return ruta
+
+
+def test_restaura_variables_y_sabidurias(instantanea):
+    interprete = nuevo_interprete()
+    interprete.restaurar_instantanea(instantanea)
+    interprete.run("""
+    espiritu x := buscar(30);
+    espiritu n := saludar("mundo");
+    espiritu b := nombres["b"];
+    """)
+    global_ = interprete.entorno_global
+    assert global_.obtener_variable('x').valor == 900
+    assert global_.obtener_variable('n').valor == 5
+    assert global_.obtener_variable('b').valor == 2
+    assert str(global_.obtener_variable('largo').valor) == "ab" * 200
+    dobles = global_.obtener_variable('dobles').valor
+    assert dobles.compacta and dobles.tipo_elementos == TipoNahual.ESPIRITU
+    assert dobles.valores_crudos() == [2 * i * i for i in range(1000)]
+    # Las sabidurías quedan enlazadas al entorno y a la salida del intérprete nuevo
+    assert global_.obtener_funcion('buscar')['entorno'] is global_
+    assert interprete.salida.sumidero.getvalue() == "hola mundo\n"
+
+
+def test_rechaza_otra_version_del_interprete(instantanea, monkeypatch):
+    monkeypatch.setattr(snapshot, '_huella', b'\0' * 32)
+    with pytest.raises(ErrorInstantanea, match="otra versión"):
+        nuevo_interprete().restaurar_instantanea(instantanea)
+
+
+def test_rechaza_archivos_invalidos(tmp_path):
+    ruta = tmp_path / "falsa.nhli"
+    ruta.write_bytes(b"no es una instantanea")
+    with pytest.raises(ErrorInstantanea):
+        nuevo_interprete().restaurar_instantanea(str(ruta))
+    with pytest.raises(ErrorInstantanea):
+        nuevo_interprete().restaurar_instantanea(str(tmp_path / "no_existe.nhli"))
+
+
+class Intrusa:
+    def __reduce__(self):
+        return os.system, ("echo intrusa",)
+
+
+def test_rechaza_objetos_ajenos_al_interprete(tmp_path):
+    ruta = tmp_path / "manipulada.nhli"
+    encabezado = snapshot._ENCABEZADO.pack(snapshot.FIRMA, snapshot.FORMATO, snapshot.huella_interprete())
+    ruta.write_bytes(encabezado + zlib.compress(pickle.dumps({'variables': Intrusa()})))
+    with pytest.raises(ErrorInstantanea, match="no permitido: (posix|os|nt).system"):
+        nuevo_interprete().restaurar_instantanea(str(ruta))
+
+
+def test_no_guarda_pergaminos_abiertos(tmp_path):
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text("1\n")
+    interprete = nuevo_interprete()
+    interprete.run(f'pergamino p := abrir_pergamino("{ruta}");')
+    with pytest.raises(ErrorInstantanea, match="pergamino"):
+        interprete.guardar_instantanea(str(tmp_path / "x.nhli"))
@@ -0,0 +1,96 @@
+# test/test_stats.py
+
+import io
+import threading
+from nahual.environment import Environment
+from nahual.interpreter import NahualInterpreter
+from nahual.stats import Estadisticas
+from nahual.types import Lista, TipoNahual, Valor
+
+_ORIGINAL_OBTENER = Environment.obtener_variable
+
+CODIGO = """
+espiritu base := 10;
+sabiduria sumar_base(espiritu n) {
+    retornar n unir base;
+}
+ofrenda xs := [];
+para i desde 0 hasta 5 {
+    agregar(xs, sumar_base(i));
+}
+ofrenda copia := xs[1:3];
+agregar(copia, 0);
+"""
+
+
+def test_cuenta_internos_del_interprete():
+    interprete = NahualInterpreter(salida=io.StringIO(), estadisticas=True)
+    interprete.run(CODIGO)
+    estadisticas = interprete.estadisticas
+    assert estadisticas.llamadas['sumar_base'] == 5
+    assert estadisticas.llamadas['agregar'] == 6
+    assert estadisticas.entornos == 5
+    assert estadisticas.nodos['llamada_funcion_verificada'] + estadisticas.nodos['llamada_funcion'] == 11
+    assert estadisticas.crecimientos_ofrenda == 6
+    assert estadisticas.copias_ofrenda == 1
+    assert estadisticas.valores > 0
+    # `base` se busca un entorno más arriba desde cada llamada
+    assert estadisticas.saltos_maximos == 1 and estadisticas.saltos_entorno >= 5
+    assert "sumar_base" in estadisticas.informe()
+
+    # Los contadores se acumulan entre ejecuciones
+    interprete.run("invocar sumar_base(1);")
+    assert estadisticas.llamadas['sumar_base'] == 6
+
+
+def test_sin_estadisticas_no_quedan_contadores():
+    originales = (Valor.__init__, Environment.__init__, Environment.obtener_variable,
+                  Environment.asignar_variable, Lista.agregar, Lista._preparar_escritura)
+    interprete = NahualInterpreter(salida=io.StringIO(), estadisticas=True)
+    interprete.run(CODIGO)
+    assert (Valor.__init__, Environment.__init__, Environment.obtener_variable,
+            Environment.asignar_variable, Lista.agregar, Lista._preparar_escritura) == originales
+    assert 'ejecutar' not in vars(interprete) and 'llamar_funcion' not in vars(interprete)
+
+    normal = NahualInterpreter(salida=io.StringIO())
+    normal.run(CODIGO)
+    assert normal.estadisticas is None
+    assert normal.entorno_global.obtener_variable('xs').valor.valores_crudos() == [10, 11, 12, 13, 14]
+
+
+def test_instalaciones_intercaladas_restauran_los_originales():
+    originales = (Valor.__init__, Environment.obtener_variable, Lista.agregar)
+    a = Estadisticas().instalar(NahualInterpreter(salida=io.StringIO()))
+    b = Estadisticas().instalar(NahualInterpreter(salida=io.StringIO()))
+    Valor(TipoNahual.ESPIRITU, 1)
+    a.desinstalar()
+    Valor(TipoNahual.ESPIRITU, 2)
+    b.desinstalar()
+    assert (Valor.__init__, Environment.obtener_variable, Lista.agregar) == originales
+    assert (a.valores, b.valores) == (1, 2)
+
+
+def test_cada_hilo_cuenta_su_interprete():
+    solo = NahualInterpreter(salida=io.StringIO(), estadisticas=True)
+    solo.run(CODIGO)
+    esperadas = solo.estadisticas.como_diccionario()
+
+    interpretes = [NahualInterpreter(salida=io.StringIO(), estadisticas=True) for _ in range(4)]
+    barrera = threading.Barrier(len(interpretes))
+
+    def correr(interprete):
+        barrera.wait()
+        for _ in range(20):
+            interprete.run(CODIGO)
+
+    hilos = [threading.Thread(target=correr, args=(interprete,)) for interprete in interpretes]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    for interprete in interpretes:
+        contadores = interprete.estadisticas.como_diccionario()
+        assert contadores['valores'] == 20 * esperadas['valores']
+        assert contadores['busquedas'] == 20 * esperadas['busquedas']
+        assert contadores['saltos_maximos'] == esperadas['saltos_maximos']
+    assert Environment.obtener_variable is _ORIGINAL_OBTENER
@@ -0,0 +1,128 @@
+# test/test_type_checker.py
+
+import io
+import pytest
+from nahual.error_handler import ErrorTipos
+from nahual.interpreter import NahualInterpreter
+from nahual.parser import NahualParser
+from nahual.program import compilar
+from nahual.type_checker import verificar_programa
+from nahual.types import Valor
+
+
+@pytest.fixture(scope='module')
+def parser():
+    return NahualParser()
+
+
+def etiquetas(nodo):
+    """Todas las etiquetas de nodos del árbol."""
+    if isinstance(nodo, list):
+        for hijo in nodo:
+            yield from etiquetas(hijo)
+    elif isinstance(nodo, tuple) and nodo and isinstance(nodo[0], str):
+        yield nodo[0]
+        for hijo in nodo[1:]:
+            yield from etiquetas(hijo)
+
+
+def test_reporta_todos_los_errores_antes_de_ejecutar():
+    salida = io.StringIO()
+    interprete = NahualInterpreter(salida=salida)
+    interprete.run("""
+    invocar "no debe ejecutarse";
+    espiritu x := "texto";
+    verdad v := 1 menor 2;
+    ritual (v unir 1) {
+        v := falso;
+    }
+    vision (3) {
+        invocar "nada";
+    }
+    """)
+    errores = interprete.manejador_errores.errores
+    assert len(errores) == 3
+    assert all(isinstance(error, ErrorTipos) for error in errores)
+    assert "'x'" in str(errores[0])
+    assert [error.tipo_recibido for error in errores[1:]] == ["verdad", "espiritu"]
+    assert "no debe ejecutarse" not in salida.getvalue()
+
+
+def test_anota_nodos_con_tipos_probados(parser):
+    arbol, errores = verificar_programa(parser.parse("""
+    sabiduria doble(espiritu x) {
+        retornar x multiplicar 2;
+    }
+    espiritu i := 0;
+    mantra m := "a" unir i;
+    ritual (i menor 10) {
+        i := i unir 1;
+        invocar doble(i);
+    }
+    vision (i mayor 3) {
+        invocar m;
+    }
+    """))
+    assert errores == []
+    nodos = set(etiquetas(arbol))
+    assert {'programa_verificado', 'var_declaracion_verificada', 'asignacion_verificada',
+            'ritual_verificado', 'vision_verificada', 'llamada_funcion_verificada'} <= nodos
+    assert not {'var_declaracion', 'asignacion', 'ritual', 'vision'} & nodos
+
+
+def test_lo_desconocido_no_se_anota_ni_se_reporta(parser):
+    arbol, errores = verificar_programa(parser.parse("""
+    sabiduria usar_global() {
+        retornar total unir 1;
+    }
+    espiritu total := usar_global();
+    vision (cierto) {
+        mantra tal_vez := "declarada sólo en una rama";
+    }
+    tal_vez := 5;
+    para cada x en [1, 2] {
+        x := "cambia de tipo";
+    }
+    """))
+    assert errores == []
+    declaraciones = arbol[1]
+    assert declaraciones[1][0] == 'var_declaracion'
+    assert declaraciones[3][0] == 'asignacion'
+    assert declaraciones[4][3][1][0][0] == 'asignacion'
+
+
+def test_argumentos_de_sabidurias(parser):
+    _, errores = verificar_programa(parser.parse("""
+    sabiduria saludar(mantra nombre) {
+        invocar "hola " unir nombre;
+    }
+    saludar(42);
+    """))
+    assert len(errores) == 1 and "nombre" in str(errores[0])
+
+
+def test_omite_verificaciones_en_tiempo_de_ejecucion(monkeypatch):
+    llamadas = []
+    original = Valor.es_compatible_con
+
+    def contar(self, otro):
+        llamadas.append(otro)
+        return original(self, otro)
+
+    monkeypatch.setattr(Valor, 'es_compatible_con', contar)
+    programa = compilar("""
+    sabiduria siguiente(espiritu n) {
+        retornar n unir 1;
+    }
+    espiritu i := 0;
+    ritual (i menor 50) {
+        espiritu anterior := i;
+        i := i unir 1;
+        invocar siguiente(anterior);
+    }
+    """)
+    llamadas.clear()
+    interprete = programa.ejecutar(salida=io.StringIO())
+    assert interprete.entorno_global.obtener_variable('i').valor == 50
+    # Las declaraciones, asignaciones y argumentos probados no se vuelven a verificar
+    assert llamadas == []
@@ -0,0 +1,91 @@
+# test/test_vector_ops.py
+
+import pytest
+from nahual import vector_ops
+from nahual.interpreter import NahualInterpreter
+from nahual.types import TipoNahual, Valor, Lista
+from nahual.error_handler import ErrorEjecucion
+
+
+def ofrenda(*valores):
+    tipo = TipoNahual.ENERGIA if any(isinstance(v, float) for v in valores) else TipoNahual.ESPIRITU
+    return Valor(TipoNahual.LISTA, Lista([Valor(tipo, v) for v in valores], tipo))
+
+
+@pytest.fixture(params=["numpy", "python"])
+def motor(request, monkeypatch):
+    """Ejecuta cada prueba con NumPy (si está instalado) y con la ruta en Python puro."""
+    if request.param == "numpy":
+        if vector_ops.np is None:
+            pytest.skip("NumPy no está instalado")
+        monkeypatch.setattr(vector_ops, "UMBRAL_NUMPY", 0)
+    else:
+        monkeypatch.setattr(vector_ops, "np", None)
+    return request.param
+
+
+class TestOperacionesElementoAElemento:
+
+    def test_ofrenda_con_ofrenda(self, motor):
+        resultado = vector_ops.operar_elemento_a_elemento('unir', ofrenda(1, 2, 3), ofrenda(10, 20, 30))
+        assert resultado.valor.valores_crudos() == [11, 22, 33]
+        assert resultado.valor.tipo_elementos == TipoNahual.ESPIRITU
+
+    def test_promocion_a_energia(self, motor):
+        resultado = vector_ops.operar_elemento_a_elemento('multiplicar', ofrenda(1, 2), Valor(TipoNahual.ENERGIA, 0.5))
+        assert resultado.valor.valores_crudos() == [0.5, 1.0]
+        assert resultado.valor.tipo_elementos == TipoNahual.ENERGIA
+
+    def test_escalar_a_la_izquierda(self, motor):
+        resultado = vector_ops.operar_elemento_a_elemento('separar', Valor(TipoNahual.ESPIRITU, 10), ofrenda(1, 2))
+        assert resultado.valor.valores_crudos() == [9, 8]
+
+    def test_comparaciones(self, motor):
+        resultado = vector_ops.operar_elemento_a_elemento('mayor', ofrenda(1, 5, 3), Valor(TipoNahual.ESPIRITU, 2))
+        assert resultado.valor.valores_crudos() == [False, True, True]
+        assert resultado.valor.tipo_elementos == TipoNahual.VERDAD
+
+    def test_residuo_y_division(self, motor):
+        assert vector_ops.operar_elemento_a_elemento(
+            'residuo', ofrenda(7, 8, 9), Valor(TipoNahual.ESPIRITU, 3)).valor.valores_crudos() == [1, 2, 0]
+        assert vector_ops.operar_elemento_a_elemento(
+            'dividir', ofrenda(1, 2), Valor(TipoNahual.ESPIRITU, 2)).valor.valores_crudos() == [0.5, 1.0]
+
+    def test_division_por_cero(self, motor):
+        with pytest.raises(ErrorEjecucion):
+            vector_ops.operar_elemento_a_elemento('dividir', ofrenda(1, 2), ofrenda(1, 0))
+
+    def test_longitudes_distintas(self, motor):
+        with pytest.raises(ErrorEjecucion):
+            vector_ops.operar_elemento_a_elemento('unir', ofrenda(1, 2), ofrenda(1, 2, 3))
+
+
+class TestReducciones:
+
+    def test_reducciones_espiritu(self, motor):
+        numeros = ofrenda(4, 1, 7, 2)
+        assert vector_ops.sumar(numeros) == Valor(TipoNahual.ESPIRITU, 14)
+        assert vector_ops.minimo(numeros) == Valor(TipoNahual.ESPIRITU, 1)
+        assert vector_ops.maximo(numeros) == Valor(TipoNahual.ESPIRITU, 7)
+        assert vector_ops.promedio(numeros) == Valor(TipoNahual.ENERGIA, 3.5)
+
+    def test_ofrenda_vacia(self, motor):
+        with pytest.raises(ErrorEjecucion):
+            vector_ops.sumar(Valor(TipoNahual.LISTA, Lista([])))
+
+
+def test_operaciones_desde_nahualscript():
+    """Las ofrendas se operan directamente con los operadores del lenguaje."""
+    interprete = NahualInterpreter()
+    interprete.run("""
+    ofrenda precios := [10.0, 20.0, 30.0];
+    ofrenda cantidades := [1, 2, 3];
+    ofrenda totales := precios multiplicar cantidades;
+    energia total := sumar(totales);
+    espiritu mayor_cantidad := maximo(cantidades);
+    """)
+
+    totales = interprete.entorno_global.obtener_variable('totales')
+    assert totales.valor.valores_crudos() == [10.0, 40.0, 90.0]
+    assert interprete.entorno_global.obtener_variable('total').valor == 140.0
+    assert interprete.entorno_global.obtener_variable('mayor_cantidad').valor == 3